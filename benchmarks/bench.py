@@ -0,0 +1,346 @@
+"""Benchmark the hot paths of simplesecurity.
+
+Findings are generated synthetically (1k, 10k and 100k by default) and tool
+output is built by repeating the recorded output in tests/data, replayed through
+stub executables on the path, so no security tools need to be installed.
+
+Each benchmark is timed (best of --repeat runs) and run once more under
+tracemalloc for its peak memory. Results are printed as a table on stderr and
+written as json to stdout (or --output) so they can be compared between runs
+
+```sh
+python benchmarks/bench.py --sizes 1000 10000 --output results.json
+```
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import StringIO
+from pathlib import Path
+from typing import Any, Callable
+
+THISDIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(THISDIR.parent))
+
+# pylint: disable=wrong-import-position
+from simplesecurity import evidence, filter as secfilter, formatter, plugins, tools
+from simplesecurity.jsonstream import JsonStream
+from simplesecurity.level import Level
+from simplesecurity.types import Finding, compactFinding
+
+RECORDED = THISDIR.parent / "tests" / "data"
+SIZES = (1000, 10000, 100000)
+# Lines in each generated source file, and files to spread findings over
+FILE_LINES = 200
+FILE_COUNT = 100
+IDS = ["B101", "B102", "DUO105", "B602", "subprocess-shell-true", "DUO116", "B311", "secret"]
+WRITERS = {
+	"ansi": formatter.writeAnsi,
+	"json": formatter.writeJson,
+	"jsonl": formatter.writeJsonl,
+	"markdown": formatter.writeMarkdown,
+	"csv": formatter.writeCsv,
+	"sarif": formatter.writeSarif,
+}
+
+
+def sourceFiles(root: Path) -> list[str]:
+	"""Write the source files that findings point at.
+
+	Args:
+		root (Path): directory to write to
+
+	Returns:
+		list[str]: paths of the files, relative to root
+	"""
+	files = []
+	for index in range(FILE_COUNT):
+		file = f"package/module_{index}.py"
+		(root / file).parent.mkdir(parents=True, exist_ok=True)
+		code = [f"value_{line} = call(argument, {line})  # comment\n" for line in range(FILE_LINES)]
+		(root / file).write_text("".join(code), encoding="utf-8")
+		files.append(file)
+	return files
+
+
+def syntheticFindings(count: int, files: list[str], seed: int = 0) -> list[Finding]:
+	"""Generate findings spread over files, with some overlapping ids on the same
+	line so deduplicate has work to do.
+
+	Args:
+		count (int): number of findings
+		files (list[str]): files to report findings in
+		seed (int, optional): random seed. Defaults to 0.
+
+	Returns:
+		list[Finding]: findings, with evidence
+	"""
+	rand = random.Random(seed)
+	findings = []
+	for _ in range(count):
+		file = rand.choice(files)
+		line = rand.randint(1, FILE_LINES)
+		ruleId = rand.choice(IDS)
+		findings.append(
+			compactFinding(
+				{
+					"id": ruleId,
+					"title": f"{ruleId}: synthetic",
+					"description": f"Synthetic finding for {ruleId}.",
+					"file": "./" + file,
+					"evidence": evidence.extractEvidence(line, file),
+					"severity": Level(rand.randint(1, 4)),
+					"confidence": Level(rand.randint(1, 3)),
+					"line": line,
+					"_other": {},
+				}
+			)
+		)
+	return findings
+
+
+def _repeat(results: list[dict[str, Any]], count: int, files: list[str], move: Callable):
+	rand = random.Random(count)
+	out = []
+	for index in range(count):
+		result = json.loads(json.dumps(results[index % len(results)]))
+		move(result, rand.choice(files), rand.randint(1, FILE_LINES))
+		out.append(result)
+	return out
+
+
+def _moveBandit(result: dict[str, Any], file: str, line: int):
+	result["filename"], result["line_number"], result["line_range"] = file, line, [line]
+
+
+def _moveSemgrep(result: dict[str, Any], file: str, line: int):
+	result["path"] = file
+	result["start"]["line"] = result["end"]["line"] = line
+
+
+def _moveDlint(result: dict[str, Any], file: str, line: int):
+	result["location"]["path"] = file
+	result["location"]["positions"]["begin"]["line"] = line
+	result["location"]["positions"]["end"]["line"] = line
+
+
+def toolOutputs(count: int, files: list[str]) -> dict[str, str]:
+	"""Build tool output with count results by repeating the recorded output.
+
+	Args:
+		count (int): number of results
+		files (list[str]): files to report results in
+
+	Returns:
+		dict[str, str]: tool -> json output (dlint is flake8 codeclimate output)
+	"""
+	bandit = json.loads((RECORDED / "bandit.json").read_text("utf-8"))
+	bandit["results"] = _repeat(bandit["results"], count, files, _moveBandit)
+	semgrep = json.loads((RECORDED / "semgrep.json").read_text("utf-8"))
+	semgrep["results"] = _repeat(semgrep["results"], count, files, _moveSemgrep)
+	recordedDlint = json.loads((RECORDED / "dlint.json").read_text("utf-8"))
+	dlint: dict[str, list[dict[str, Any]]] = {}
+	for result in _repeat(sum(recordedDlint.values(), []), count, files, _moveDlint):
+		dlint.setdefault(result["location"]["path"], []).append(result)
+	return {
+		"bandit": json.dumps(bandit),
+		"flake8": json.dumps(dlint),
+		"semgrep": json.dumps(semgrep),
+	}
+
+
+def stubTools(binDir: Path, outputs: dict[str, str]):
+	"""Write stub executables that print the given output, and put them first on
+	the path.
+
+	Args:
+		binDir (Path): directory for the stubs
+		outputs (dict[str, str]): executable name -> output
+	"""
+	binDir.mkdir(parents=True, exist_ok=True)
+	for tool, output in outputs.items():
+		(binDir / f"{tool}.json").write_text(output, encoding="utf-8")
+		stub = binDir / tool
+		stub.write_text(
+			f"#!{sys.executable}\nimport sys\n"
+			f"sys.stdout.write(open({str(binDir / f'{tool}.json')!r}).read())\n",
+			encoding="utf-8",
+		)
+		stub.chmod(0o755)
+	os.environ["PATH"] = f"{binDir}{os.pathsep}{os.environ['PATH']}"
+	tools._tools.clear()  # pylint: disable=protected-access
+	# Replay the stub output rather than running bandit in process
+	plugins.BANDIT_IN_PROCESS = False
+
+
+def parse(output: str, stream: JsonStream, toFinding: Callable[[str, Any], Finding]) -> int:
+	"""Parse tool output in process (no subprocess or evidence).
+
+	Args:
+		output (str): json output of the tool
+		stream (JsonStream): parser selecting the results
+		toFinding (Callable[[str, Any], Finding]): convert (key, result) to a finding
+
+	Returns:
+		int: number of findings
+	"""
+	findings = []
+	for start in range(0, len(output), plugins.CHUNK_SIZE):
+		chunk = output[start : start + plugins.CHUNK_SIZE]
+		findings.extend(toFinding(*item) for item in stream.feed(chunk))
+	findings.extend(toFinding(*item) for item in stream.close())
+	return len(findings)
+
+
+def measure(func: Callable[[], Any], repeat: int) -> dict[str, float]:
+	"""Time a benchmark and measure its peak memory.
+
+	Args:
+		func (Callable[[], Any]): benchmark
+		repeat (int): number of timed runs
+
+	Returns:
+		dict[str, float]: {"seconds": best time, "peak_bytes": peak traced memory}
+	"""
+	times = []
+	for _ in range(repeat):
+		gc.collect()
+		start = time.perf_counter()
+		func()
+		times.append(time.perf_counter() - start)
+	gc.collect()
+	tracemalloc.start()
+	try:
+		func()
+		peak = tracemalloc.get_traced_memory()[1]
+	finally:
+		tracemalloc.stop()
+	return {"seconds": min(times), "peak_bytes": peak}
+
+
+def benchmarks(size: int, files: list[str], outputs: dict[str, str]) -> dict[str, Callable]:
+	"""Get the benchmarks for one size.
+
+	Args:
+		size (int): number of findings
+		files (list[str]): source files the findings are in
+		outputs (dict[str, str]): tool outputs from toolOutputs
+
+	Returns:
+		dict[str, Callable]: name -> benchmark
+	"""
+	findings = syntheticFindings(size, files)
+	lines = [(finding["line"], finding["file"]) for finding in findings]
+
+	def extract():
+		evidence.LINE_CACHE.clear()
+		for line, file in lines:
+			evidence.extractEvidence(line, file)
+
+	def write(writer: Callable) -> Callable:
+		return lambda: writer(StringIO(), findings)
+
+	return {
+		"deduplicate": lambda: secfilter.deduplicate(findings),
+		"iterDeduplicate": lambda: list(secfilter.iterDeduplicate(findings)),
+		"filterSeverityAndConfidence": lambda: secfilter.filterSeverityAndConfidence(
+			findings, 2, 2
+		),
+		"extractEvidence": extract,
+		"parse.bandit": lambda: parse(
+			outputs["bandit"], JsonStream({"results"}), plugins._banditFinding
+		),
+		"parse.dlint": lambda: parse(
+			outputs["flake8"], JsonStream(allowEmpty=True), plugins._dlintFinding
+		),
+		"parse.semgrep": lambda: parse(
+			outputs["semgrep"], JsonStream({"results"}), plugins._semgrepFinding
+		),
+		"plugin.bandit": lambda: plugins.bandit(shards=1),
+		"plugin.dlint": lambda: plugins.dlint(shards=1),
+		"plugin.semgrep": plugins.semgrep,
+		**{f"format.{name}": write(writer) for name, writer in WRITERS.items()},
+	}
+
+
+def run(sizes: list[int], repeat: int, only: str | None = None) -> dict[str, Any]:
+	"""Run the benchmarks.
+
+	Args:
+		sizes (list[int]): numbers of findings to benchmark with
+		repeat (int): number of timed runs of each benchmark
+		only (str | None, optional): only run benchmarks with this in their name.
+		Defaults to None (run all)
+
+	Returns:
+		dict[str, Any]: machine readable results
+	"""
+	results = []
+	cwd, environ, banditInProcess = os.getcwd(), os.environ.copy(), plugins.BANDIT_IN_PROCESS
+	with tempfile.TemporaryDirectory() as tmp:
+		os.environ["SIMPLESECURITY_CACHE_DIR"] = str(Path(tmp) / "cache")
+		os.chdir(tmp)
+		try:
+			files = sourceFiles(Path(tmp))
+			for size in sizes:
+				outputs = toolOutputs(size, files)
+				stubTools(Path(tmp) / f"bin{size}", outputs)
+				for name, func in benchmarks(size, files, outputs).items():
+					if only is None or only in name:
+						results.append({"name": name, "size": size, **measure(func, repeat)})
+						print(_row(results[-1]), file=sys.stderr)
+				os.environ["PATH"] = environ["PATH"]
+		finally:
+			os.environ.clear()
+			os.environ.update(environ)
+			os.chdir(cwd)
+			tools._tools.clear()  # pylint: disable=protected-access
+			plugins.BANDIT_IN_PROCESS = banditInProcess
+	return {
+		"python": platform.python_version(),
+		"platform": platform.platform(),
+		"repeat": repeat,
+		"results": results,
+	}
+
+
+def _row(result: dict[str, Any]) -> str:
+	return (
+		f"{result['name']:<30}{result['size']:>8}"
+		f"{result['seconds'] * 1000:>12.2f} ms{result['peak_bytes'] / (1 << 20):>10.2f} MiB"
+	)
+
+
+def main(argv: list[str] | None = None):
+	"""Run the benchmarks from the command line.
+
+	Args:
+		argv (list[str] | None, optional): arguments. Defaults to None (sys.argv)
+	"""
+	parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+	parser.add_argument(
+		"--sizes", type=int, nargs="+", default=list(SIZES), help="Numbers of findings"
+	)
+	parser.add_argument("--repeat", type=int, default=3, help="Timed runs of each benchmark")
+	parser.add_argument("--only", help="Only run benchmarks with this in their name")
+	parser.add_argument("--output", "-o", help="File to write json results to (omit for stdout)")
+	args = parser.parse_args(argv)
+	print(f"{'benchmark':<30}{'size':>8}{'time':>15}{'peak':>14}", file=sys.stderr)
+	results = json.dumps(run(args.sizes, args.repeat, args.only), indent="\t")
+	if args.output is None:
+		print(results)
+	else:
+		Path(args.output).write_text(results + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+	main()
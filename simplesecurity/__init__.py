@@ -8,6 +8,7 @@ requires bandit to be in the system path...)
 - bandit
 - safety
 - dodgy
+- secrets (built in, the same checks as dodgy without the executable)
 - dlint
 - semgrep
 
@@ -15,28 +16,53 @@ Formats
 
 - ansi (for terminal)
 - json
+- jsonl
 - markdown
 - csv
 - sarif
+- sarif-compact
 """
 from __future__ import annotations
 
 import argparse
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from json import dumps
+from queue import Full, Queue
+from sys import argv
 from sys import exit as sysexit
 from sys import stdout
-from typing import Any, Callable, TextIO
+from typing import Any, Callable, Iterable, Iterator, TextIO
 
 from simplesecurity import filter as secfilter
-from simplesecurity import formatter, plugins
+from simplesecurity import baseline, daemon, formatter, plugins, profiling, watch
+from simplesecurity.cache import fileHash
+from simplesecurity.changes import DEPENDENCY_FILES, changedFiles, matchFiles
+from simplesecurity.evidence import LINE_CACHE
+from simplesecurity.rules import RULES
+from simplesecurity.types import Finding
+from simplesecurity.walker import listFiles, normalisePath
 
 stdout.reconfigure(encoding="utf-8")  # type:ignore
-FORMAT_HELP = "Output format. One of ansi, json, markdown, csv. default=ansi"
-PLUGIN_HELP = "Plugin to use. One of bandit, safety, dodgy, dlint, semgrep, all, default=all"
+# Findings held between the plugins and the formatter with --stream
+STREAM_QUEUE_SIZE = 1024
+FORMAT_HELP = (
+	"Output format. One of ansi, json, jsonl, markdown, csv, sarif, sarif-compact. default=ansi"
+)
+PLUGIN_HELP = (
+	"Plugin to use. One of bandit, safety, dodgy, secrets, dlint, semgrep, all, default=all "
+	"(all runs secrets in place of dodgy)"
+)
 
 
-def _processFile(file: str | None) -> TextIO:
+def _processFile(file: str | None, output: TextIO = stdout) -> TextIO:
 	return (
-		stdout
+		output
 		if file is None
 		else open(file, "w", encoding="utf-8")  # pylint: disable=consider-using-with
 	)
@@ -51,16 +77,18 @@ def _processColour(noColour: bool, highContrast: bool) -> int:
 	return colourMode
 
 
-def _processFormat(formatin: str | None) -> Callable:
+def _processFormat(formatin: str | None, snippets: bool = True) -> Callable:
 	formatMap = {
-		"json": formatter.json,
-		"markdown": formatter.markdown,
-		"csv": formatter.csv,
-		"ansi": formatter.ansi,
-		"sarif": formatter.sarif,
+		"json": formatter.writeJson,
+		"jsonl": formatter.writeJsonl,
+		"markdown": formatter.writeMarkdown,
+		"csv": formatter.writeCsv,
+		"ansi": formatter.writeAnsi,
+		"sarif": partial(formatter.writeSarif, snippets=snippets),
+		"sarif-compact": partial(formatter.writeSarif, compact=True, snippets=snippets),
 	}
 	if formatin is None:
-		formatt = formatter.ansi
+		formatt = formatter.writeAnsi
 	elif formatin in formatMap:
 		formatt = formatMap[formatin]
 	else:
@@ -69,45 +97,88 @@ def _processFormat(formatin: str | None) -> Callable:
 	return formatt
 
 
-def _processPlugin(args) -> list[Callable]:
-	pluginMap = {
-		"bandit": {
-			"func": plugins.bandit,
-			"max_severity": 3,
-			"max_confidence": 3,
-			"fast": True,
-		},
-		"safety": {
-			"func": plugins.safety,
-			"max_severity": 4,
-			"max_confidence": 3,
-			"fast": True,
-		},
-		"dodgy": {
-			"func": plugins.dodgy,
-			"max_severity": 2,
-			"max_confidence": 2,
-			"fast": True,
-		},
-		"dlint": {
-			"func": plugins.dlint,
-			"max_severity": 4,
-			"max_confidence": 2,
-			"fast": True,
-		},
-		"semgrep": {
-			"func": plugins.semgrep,
-			"max_severity": 3,
-			"max_confidence": 3,
-			"fast": False,
-		},
-	}
+PLUGIN_MAP: dict[str, dict[str, Any]] = {
+	"bandit": {
+		"func": plugins.bandit,
+		"iter": plugins.iterBandit,
+		"max_severity": 3,
+		"max_confidence": 3,
+		"fast": True,
+		"patterns": ("*.py",),
+		"tool": "bandit",
+		"config": (".bandit",),
+		"shard": True,
+	},
+	"safety": {
+		"func": plugins.safety,
+		"iter": plugins.iterSafety,
+		"max_severity": 4,
+		"max_confidence": 3,
+		"fast": True,
+		"patterns": DEPENDENCY_FILES,
+		"tool": None,
+	},
+	"dodgy": {
+		"func": plugins.dodgy,
+		"iter": plugins.iterDodgy,
+		"max_severity": 2,
+		"max_confidence": 2,
+		"fast": True,
+		"patterns": None,
+		"tool": "dodgy",
+		"all": False,
+	},
+	"secrets": {
+		"func": plugins.secrets,
+		"iter": plugins.iterSecrets,
+		"max_severity": 3,
+		"max_confidence": 2,
+		"fast": True,
+		"patterns": None,
+		"tool": None,
+	},
+	"dlint": {
+		"func": plugins.dlint,
+		"iter": plugins.iterDlint,
+		"max_severity": 4,
+		"max_confidence": 2,
+		"fast": True,
+		"patterns": ("*.py",),
+		"tool": "flake8",
+		"config": (".flake8", "setup.cfg", "tox.ini"),
+		"shard": True,
+	},
+	"semgrep": {
+		"func": plugins.semgrep,
+		"iter": plugins.iterSemgrep,
+		"max_severity": 3,
+		"max_confidence": 3,
+		"fast": False,
+		"patterns": ("*.py",),
+		"tool": "semgrep",
+		"rules": plugins.SEMGREP_RULES,
+		"config": (".semgrepignore",),
+		"combine": True,
+	},
+}
+
+
+def _processPlugin(args) -> dict[str, Callable]:
+	def withCache(name: str, v: dict[str, Any]) -> Callable:
+		func = v["iter"] if args.stream else v["func"]
+		if v.get("shard"):
+			func = partial(func, shards=args.shards)
+		if not args.no_cache and v["tool"] is not None:
+			rules = fileHash(v["rules"]) if "rules" in v else ""
+			wrapper = plugins.iterCachedPlugin if args.stream else plugins.cachedPlugin
+			func = wrapper(func, name, v["tool"], v["patterns"], rules, v.get("config", ()))
+		return profiling.timedPlugin(name, func, args.stream)
 
 	plugin = args.plugin
 
 	filtered = {
-		k: v["func"]
-		for k, v in pluginMap.items()
+		k: withCache(k, v)
+		for k, v in PLUGIN_MAP.items()
 		if (
 			v["max_severity"] >= args.level
 			and v["max_confidence"] >= args.confidence
@@ -116,23 +187,198 @@ def _processPlugin(args) -> list[Callable]:
 	}
 
 	if plugin in (None, "all"):
-		return [v for _, v in filtered.items()]
+		return {k: v for k, v in filtered.items() if PLUGIN_MAP[k].get("all", True)}
 	if plugin in filtered:
-		return [filtered[plugin]]
+		return {plugin: filtered[plugin]}
 
 	print(PLUGIN_HELP)
 	sysexit(2)
 
 
-def cli():
-	"""Cli entry point."""
+def _limitToFiles(
+	filteredPlugins: dict[str, Callable], files: list[str], changedOnly: bool = True
+) -> list[Callable]:
+	"""Limit each plugin to the files it can scan, dropping plugins with nothing
+	to scan. safety scans the whole project so runs if any dependency file
+	changed (or always if not changedOnly).
+
+	Args:
+		filteredPlugins (dict[str, Callable]): plugins to run
+		files (list[str]): changed files, or every file in the scan directory
+		changedOnly (bool, optional): files are only the changed files. Defaults to True.
+
+	Returns:
+		list[Callable]: plugins to run
+	"""
+	return [plugin for _, plugin, _ in _selectPlugins(filteredPlugins, files, changedOnly)]
+
+
+def _selectPlugins(
+	filteredPlugins: dict[str, Callable], files: list[str], changedOnly: bool = True
+) -> list[tuple[str, Callable, list[str] | None]]:
+	"""Like _limitToFiles, but keep the name of each plugin and the files it will
+	scan (None for safety, which scans the whole project).
+	"""
+	selected = []
+	for name, plugin in filteredPlugins.items():
+		if name == "safety":
+			if not changedOnly or len(matchFiles(files, PLUGIN_MAP[name]["patterns"])) > 0:
+				selected.append((name, plugin, None))
+			continue
+		pluginFiles = matchFiles(files, PLUGIN_MAP[name]["patterns"])
+		if len(pluginFiles) > 0:
+			selected.append((name, partial(plugin, files=pluginFiles), pluginFiles))
+	return selected
+
+
+def _runPlugins(filteredPlugins: list[Callable], scanDir: str, jobs: int | None) -> list[Finding]:
+	"""Run the plugins concurrently and merge their findings.
+
+	Args:
+		filteredPlugins (list[Callable]): plugins to run
+		scanDir (str): directory to scan
+		jobs (int | None): maximum number of plugins to run at once. None to run
+			all of them at once
+
+	Returns:
+		list[Finding]: findings from each plugin, in the same order as filteredPlugins
+	"""
+	return [
+		finding
+		for findings in _runEach(filteredPlugins, scanDir, jobs)
+		for finding in findings or []
+	]
+
+
+def _runEach(
+	filteredPlugins: list[Callable], scanDir: str, jobs: int | None
+) -> list[list[Finding] | None]:
+	"""Run the plugins concurrently.
+
+	Args:
+		filteredPlugins (list[Callable]): plugins to run
+		scanDir (str): directory to scan
+		jobs (int | None): maximum number of plugins to run at once. None to run
+			all of them at once
+
+	Returns:
+		list[list[Finding] | None]: findings from each plugin, None if it failed
+	"""
+	if len(filteredPlugins) == 0:
+		return []
+
+	def run(plugin: Callable[..., Iterable[Finding]]) -> list[Finding]:
+		# Run generator plugins (--stream) here so their errors are caught below
+		return list(plugin(scanDir=scanDir))
+
+	workers = max(1, min(jobs or len(filteredPlugins), len(filteredPlugins)))
+	with ThreadPoolExecutor(max_workers=workers) as executor:
+		futures = [executor.submit(run, plugin) for plugin in filteredPlugins]
+	results = []
+	for future in futures:
+		try:
+			results.append(future.result())
+		except BaseException as e:
+			print(f"! SimpleSecurity encountered an error: {e}")
+			results.append(None)
+	return results
+
+
+def _iterPlugins(
+	filteredPlugins: list[Callable[..., Iterable[Finding]]], scanDir: str, jobs: int | None
+) -> Iterator[Finding]:
+	"""Run the plugins concurrently, yielding findings as soon as any plugin
+	produces them.
+
+	Args:
+		filteredPlugins (list[Callable[..., Iterable[Finding]]]): plugins to run,
+			these should be generators (eg. plugins.iterBandit)
+		scanDir (str): directory to scan
+		jobs (int | None): maximum number of plugins to run at once. None to run
+			all of them at once
+
+	Yields:
+		Finding: findings from every plugin, in the order they were found
+	"""
+	if len(filteredPlugins) == 0:
+		return
+	done = object()
+	# Plugins wait for the consumer when this is full, so a slow consumer does not
+	# hold every finding in memory
+	queue: Queue = Queue(maxsize=STREAM_QUEUE_SIZE)
+	stop = threading.Event()
+
+	def put(item: Any) -> bool:
+		while not stop.is_set():
+			try:
+				queue.put(item, timeout=0.1)
+				return True
+			except Full:
+				continue
+		return False
+
+	def drain(plugin: Callable[..., Iterable[Finding]]):
+		try:
+			for finding in plugin(scanDir=scanDir):
+				if not put(finding):
+					return
+		except BaseException as e:
+			put(e)
+		finally:
+			put(done)
+
+	workers = max(1, min(jobs or len(filteredPlugins), len(filteredPlugins)))
+	executor = ThreadPoolExecutor(max_workers=workers)
+	for plugin in filteredPlugins:
+		executor.submit(drain, plugin)
+	running = len(filteredPlugins)
+	try:
+		while running > 0:
+			item = queue.get()
+			if item is done:
+				running -= 1
+			elif isinstance(item, BaseException):
+				print(f"! SimpleSecurity encountered an error: {item}")
+			else:
+				yield item
+	finally:
+		# Unblock plugins waiting on a full queue if the consumer stopped early
+		stop.set()
+		executor.shutdown(wait=False)
+
+
+def _parser() -> argparse.ArgumentParser:
 	parser = argparse.ArgumentParser(
 		description=__doc__, formatter_class=argparse.RawTextHelpFormatter
 	)
+	parser.add_argument(
+		"command",
+		nargs="?",
+		choices=("scan", "serve", "stop"),
+		default="scan",
+		help="scan (default), or serve: run a daemon that later scans are sent to, "
+		"or stop: stop the daemon",
+	)
 	parser.add_argument(
 		"--scan-dir",
 		"-s",
-		help="Pass a path to the scan directory (optional)",
+		action="append",
+		help="Pass a path to the scan directory (optional). Repeat to scan several projects",
+	)
+	parser.add_argument(
+		"--manifest",
+		help="File listing directories to scan, one per line (# starts a comment). "
+		"Relative paths are relative to the manifest",
+	)
+	parser.add_argument(
+		"--report-dir",
+		help="When scanning several projects, also write a report for each to this directory",
+	)
+	parser.add_argument(
+		"--project-jobs",
+		type=int,
+		default=None,
+		help="Maximum number of projects to scan at once. default=number of cpus",
 	)
 	parser.add_argument(
 		"--format",
@@ -188,36 +434,464 @@ def cli():
 		action="store_true",
 		help="Return non zero exit code if any security vulnerabilities are found",
 	)
-	args = parser.parse_args()
+	parser.add_argument(
+		"--no-snippets",
+		action="store_true",
+		help="Leave the code for each finding out of sarif reports",
+	)
+	parser.add_argument(
+		"--no-cache",
+		action="store_true",
+		help="Rescan every file rather than reusing findings for unchanged files",
+	)
+	parser.add_argument(
+		"--since",
+		help="Only scan files changed since this git ref (eg. origin/master)",
+	)
+	parser.add_argument(
+		"--changed-only",
+		action="store_true",
+		help="Only scan files with uncommitted changes (or changed since --since)",
+	)
+	parser.add_argument(
+		"--evidence-cache-mb",
+		help="Memory budget (MiB) for source lines cached while grabbing evidence. default=64",
+		type=int,
+		default=64,
+	)
+	parser.add_argument(
+		"--stream",
+		action="store_true",
+		help="Write findings as the plugins find them rather than sorted by severity once "
+		"all have finished. Findings are still held for the cache until the scan ends, "
+		"add --no-cache to keep memory use bounded",
+	)
+	parser.add_argument(
+		"--jobs",
+		"-j",
+		help="Maximum number of plugins to run at once. default=all selected plugins",
+		type=int,
+	)
+	parser.add_argument(
+		"--shards",
+		help="Maximum number of bandit/ flake8 processes to split large scans between. "
+		"default=number of cpus",
+		type=int,
+	)
+	parser.add_argument(
+		"--baseline",
+		help="Baseline file from --write-baseline. Findings in it are not reported "
+		"(or counted by --zero)",
+	)
+	parser.add_argument(
+		"--write-baseline",
+		help="Write the fingerprint of every finding to this baseline file",
+	)
+	parser.add_argument(
+		"--watch",
+		action="store_true",
+		help="Keep running after the first scan, rescanning files as they change and "
+		"reporting findings that were added or resolved. Without watchdog installed this "
+		"re-walks the tree each poll, backing off to 16x --watch-interval while idle",
+	)
+	parser.add_argument(
+		"--watch-interval",
+		help="Seconds between checks for changed files with --watch. default=1",
+		type=float,
+		default=1.0,
+	)
+	parser.add_argument(
+		"--profile",
+		action="store_true",
+		help="Write the time spent in each phase of the scan (and other metrics) to stderr",
+	)
+	parser.add_argument(
+		"--profile-output",
+		help="Write the metrics collected by --profile to this file as json",
+	)
+	parser.add_argument(
+		"--cprofile",
+		help="Write cProfile stats for the scan (main thread only) to this file",
+	)
+	parser.add_argument(
+		"--socket",
+		help="Path of the daemon's unix socket. default=daemon.sock in the cache directory",
+	)
+	parser.add_argument(
+		"--no-daemon",
+		action="store_true",
+		help="Scan in this process even if a daemon is running",
+	)
+	return parser
 
-	scanDir = args.scan_dir or "."
-	filename = _processFile(args.file)
-	colourMode = _processColour(args.no_colour, args.high_contrast)
-	formatt = _processFormat(args.format)
 
-	filteredPlugins = _processPlugin(args)
+def _scan(args: argparse.Namespace, output: TextIO = stdout) -> int:
+	"""Run a scan.
 
-	findings = []
-	for plugin in filteredPlugins:
-		finding = []
+	Args:
+		args (argparse.Namespace): parsed cli arguments
+		output (TextIO, optional): file to write to if there is no --file.
+		Defaults to stdout.
+
+	Returns:
+		int: exit code
+	"""
+	# Only report the rules of this scan (the daemon runs many)
+	RULES.clear()
+	filename = _processFile(args.file, output)
+	profile = (
+		profiling.enable({"evidence": LINE_CACHE.stats()})
+		if args.profile or args.profile_output
+		else None
+	)
+	profiler = cProfile.Profile() if args.cprofile else None
+	try:
+		if profiler is not None:
+			profiler.enable()
 		try:
-			finding = plugin(scanDir=scanDir)
-		except BaseException as e:
+			scanDirs = _scanDirs(args)
+		except RuntimeError as e:
 			print(f"! SimpleSecurity encountered an error: {e}")
-		findings.extend(finding)
+			return 2
+		if len(scanDirs) > 1:
+			return _scanProjects(args, scanDirs, filename)
+		return _scanTo(args, scanDirs[0], filename)
+	finally:
+		if profiler is not None:
+			profiler.disable()
+			profiler.dump_stats(args.cprofile)
+		if profile is not None:
+			profiling.disable()
+			_writeProfile(args, profile)
+		if filename is not output:
+			filename.close()
 
-	filteredFindings = secfilter.filterSeverityAndConfidence(
-		secfilter.deduplicate(findings), args.level, args.confidence
-	)
 
-	print(
-		formatt(
-			filteredFindings,
+def _writeProfile(args: argparse.Namespace, profile: profiling.Profile):
+	"""Write the metrics for a scan to stderr and/ or --profile-output."""
+	metrics = profile.metrics({"evidence": LINE_CACHE.stats()})
+	if args.profile:
+		print(profiling.table(metrics), file=sys.stderr)
+	if args.profile_output:
+		with open(args.profile_output, "w", encoding="utf-8") as file:
+			file.write(dumps(metrics, indent="\t") + "\n")
+
+
+def _scanTo(args: argparse.Namespace, scanDir: str, filename: TextIO) -> int:
+	"""Run a scan, writing the findings to filename. Returns the exit code."""
+	colourMode = _processColour(args.no_colour, args.high_contrast)
+	formatt = _processFormat(args.format, not args.no_snippets)
+
+	LINE_CACHE.maxBytes = args.evidence_cache_mb * 1024 * 1024
+	filteredPlugins = _processPlugin(args)
+	changedOnly = args.since is not None or args.changed_only
+	try:
+		knownFindings = None if args.baseline is None else baseline.load(args.baseline)
+		# Walk the tree once and give every plugin the same list of files
+		with profiling.phase("walk"):
+			files = changedFiles(scanDir, args.since) if changedOnly else listFiles(scanDir)
+	except RuntimeError as e:
+		print(f"! SimpleSecurity encountered an error: {e}")
+		return 2
+	if args.watch:
+		selected = _selectPlugins(filteredPlugins, files, changedOnly)
+		return _watch(args, scanDir, filename, filteredPlugins, selected, knownFindings)
+	runPlugins = _limitToFiles(filteredPlugins, files, changedOnly)
+
+	if args.stream:
+		filteredFindings = secfilter.iterFilterSeverityAndConfidence(
+			secfilter.iterDeduplicate(_iterPlugins(runPlugins, scanDir, args.jobs)),
+			args.level,
+			args.confidence,
+		)
+	else:
+		filteredFindings = _filterFindings(args, _runPlugins(runPlugins, scanDir, args.jobs))
+
+	fingerprints: Counter[str] = Counter()
+	if args.write_baseline is not None:
+		filteredFindings = baseline.iterRecord(filteredFindings, fingerprints)
+	if knownFindings is not None:
+		filteredFindings = baseline.iterSuppress(filteredFindings, knownFindings)
+
+	with profiling.phase("format"):
+		count = formatt(
+			filename,
+			profiling.countAs("findings.reported", filteredFindings),
 			colourMode=colourMode,
-		),
-		file=filename,
+			ordered=not args.stream,
+		)
+	if formatt is not formatter.writeJsonl:
+		print(file=filename)
+	if args.write_baseline is not None:
+		baseline.save(args.write_baseline, fingerprints)
+
+	if count > 0 and args.zero:
+		return 1
+	return 0
+
+
+def _filterFindings(args: argparse.Namespace, findings: list[Finding]) -> list[Finding]:
+	"""Deduplicate findings and filter them by --level and --confidence."""
+	with profiling.phase("deduplicate"):
+		findings = secfilter.deduplicate(findings)
+	with profiling.phase("filter"):
+		return secfilter.filterSeverityAndConfidence(findings, args.level, args.confidence)
+
+
+def _scanDirs(args: argparse.Namespace) -> list[str]:
+	"""Get the directories to scan from --scan-dir and --manifest.
+
+	Args:
+		args (argparse.Namespace): parsed cli arguments
+
+	Raises:
+		RuntimeError: if the manifest cannot be read
+
+	Returns:
+		list[str]: directories to scan, without duplicates. ["."] if none are given
+	"""
+	scanDirs = list(args.scan_dir or [])
+	if args.manifest is not None:
+		try:
+			with open(args.manifest, encoding="utf-8") as manifest:
+				lines = manifest.read().splitlines()
+		except OSError as e:
+			raise RuntimeError(f"could not read manifest {args.manifest}: {e}") from None
+		base = os.path.dirname(args.manifest)
+		for line in lines:
+			line = line.split("#", 1)[0].strip()
+			if line:
+				scanDirs.append(os.path.join(base, line))
+	return list(dict.fromkeys(scanDirs)) or ["."]
+
+
+FORMAT_EXTENSIONS = {
+	"ansi": "txt",
+	"json": "json",
+	"jsonl": "jsonl",
+	"markdown": "md",
+	"csv": "csv",
+	"sarif": "sarif",
+	"sarif-compact": "sarif",
+}
+
+
+def _reportNames(scanDirs: list[str], formatin: str | None) -> list[str]:
+	"""Get a unique report file name for each scan directory."""
+	extension = FORMAT_EXTENSIONS.get(formatin or "ansi", "txt")
+	names: list[str] = []
+	for scanDir in scanDirs:
+		name = "".join(
+			char if char.isalnum() or char in "-_." else "_"
+			for char in os.path.normpath(scanDir).strip("/\\.")
+		)
+		name = name or "root"
+		unique, index = name, 1
+		while f"{unique}.{extension}" in names:
+			index += 1
+			unique = f"{name}-{index}"
+		names.append(f"{unique}.{extension}")
+	return names
+
+
+def _shareCpus(args: argparse.Namespace, projects: int) -> argparse.Namespace:
+	"""Split the cpus between the projects scanned at once, so scanning several
+	projects starts about as many tool processes as there are cpus rather than
+	projects x plugins x shards. Each project runs up to cpus / projects plugins
+	at once, and bandit/ flake8 are not sharded (unless --jobs or --shards are
+	given).
+
+	Args:
+		args (argparse.Namespace): parsed cli arguments
+		projects (int): number of projects scanned at once
+
+	Returns:
+		argparse.Namespace: arguments with --jobs and --shards set
+	"""
+	if projects <= 1:
+		return args
+	share = max(1, (os.cpu_count() or 1) // projects)
+	return argparse.Namespace(
+		**{**vars(args), "jobs": args.jobs or share, "shards": args.shards or 1}
 	)
 
-	if len(filteredFindings) > 0 and args.zero:
-		sysexit(1)
-	sysexit(0)
+
+def _scanProjects(args: argparse.Namespace, scanDirs: list[str], filename: TextIO) -> int:
+	"""Scan several projects at once, writing one report with the findings from
+	all of them (and a report for each to --report-dir). Tool lookups, rule
+	hashes and the in memory caches are shared between the projects, and plugins
+	marked "combine" (semgrep) run once over the files of every project.
+	"""
+	if args.watch or args.stream:
+		print("! SimpleSecurity encountered an error: --watch and --stream scan one project")
+		return 2
+	workers = max(1, min(args.project_jobs or os.cpu_count() or 1, len(scanDirs)))
+	args = _shareCpus(args, workers)
+	colourMode = _processColour(args.no_colour, args.high_contrast)
+	formatt = _processFormat(args.format, not args.no_snippets)
+	LINE_CACHE.maxBytes = args.evidence_cache_mb * 1024 * 1024
+	filteredPlugins = _processPlugin(args)
+	changedOnly = args.since is not None or args.changed_only
+	try:
+		knownFindings = None if args.baseline is None else baseline.load(args.baseline)
+	except RuntimeError as e:
+		print(f"! SimpleSecurity encountered an error: {e}")
+		return 2
+
+	def walk(scanDir: str) -> list[str] | None:
+		try:
+			with profiling.phase("walk"):
+				return changedFiles(scanDir, args.since) if changedOnly else listFiles(scanDir)
+		except RuntimeError as e:
+			print(f"! SimpleSecurity encountered an error: {scanDir}: {e}")
+			return None
+
+	combined = {k: v for k, v in filteredPlugins.items() if PLUGIN_MAP[k].get("combine")}
+	perProject = {k: v for k, v in filteredPlugins.items() if k not in combined}
+	with ThreadPoolExecutor(max_workers=workers) as executor:
+		projectFiles = list(executor.map(walk, scanDirs))
+		allFiles = [file for files in projectFiles for file in files or []]
+		combinedRun = executor.submit(
+			_runPlugins, _limitToFiles(combined, allFiles, changedOnly), ".", args.jobs
+		)
+		runs = [
+			None
+			if files is None
+			else executor.submit(
+				_runPlugins, _limitToFiles(perProject, files, changedOnly), scanDir, args.jobs
+			)
+			for scanDir, files in zip(scanDirs, projectFiles)
+		]
+		# Give each finding from a combined run back to the project it is in
+		owners = {
+			normalisePath(file): index
+			for index, files in enumerate(projectFiles)
+			for file in files or []
+		}
+		combinedFindings: list[list[Finding]] = [[] for _ in scanDirs]
+		for finding in combinedRun.result():
+			index = owners.get(normalisePath(finding["file"]))
+			if index is not None:
+				combinedFindings[index].append(finding)
+
+	results: list[list[Finding] | None] = []
+	# Record every finding, including those the baseline suppresses, as _scanTo does
+	fingerprints: Counter[str] = Counter()
+	for run, extra in zip(runs, combinedFindings):
+		if run is None:
+			results.append(None)
+			continue
+		findings = _filterFindings(args, run.result() + extra)
+		if args.write_baseline is not None:
+			fingerprints.update(map(baseline.fingerprint, findings))
+		results.append(
+			findings if knownFindings is None else baseline.suppress(findings, knownFindings)
+		)
+
+	if args.report_dir is not None:
+		os.makedirs(args.report_dir, exist_ok=True)
+		for name, findings in zip(_reportNames(scanDirs, args.format), results):
+			if findings is not None:
+				with open(
+					os.path.join(args.report_dir, name), "w", encoding="utf-8", newline=""
+				) as report:
+					formatt(report, findings, colourMode=colourMode)
+					if formatt is not formatter.writeJsonl:
+						print(file=report)
+	allFindings = [finding for findings in results if findings is not None for finding in findings]
+	if args.write_baseline is not None:
+		baseline.save(args.write_baseline, fingerprints)
+	with profiling.phase("format"):
+		count = formatt(filename, allFindings, colourMode=colourMode)
+	if formatt is not formatter.writeJsonl:
+		print(file=filename)
+
+	if any(findings is None for findings in results):
+		return 2
+	if count > 0 and args.zero:
+		return 1
+	return 0
+
+
+def _watch(
+	args: argparse.Namespace,
+	scanDir: str,
+	filename: TextIO,
+	filteredPlugins: dict[str, Callable],
+	selected: list[tuple[str, Callable, list[str] | None]],
+	knownFindings: Counter[str] | None = None,
+) -> int:
+	"""Scan, then keep rescanning the files that change (with just the plugins
+	that apply to them) until interrupted. After the first report only the
+	findings that were added or resolved are written.
+	"""
+	colourMode = _processColour(args.no_colour, args.high_contrast)
+	formatt = _processFormat(args.format, not args.no_snippets)
+	state = watch.FindingsState()
+
+	def rescan(selected: list[tuple[str, Callable, list[str] | None]]) -> list[Finding]:
+		results = _runEach([plugin for _, plugin, _ in selected], scanDir, args.jobs)
+		for (name, _, files), findings in zip(selected, results):
+			if findings is not None:
+				state.update(name, findings, files)
+		findings = secfilter.filterSeverityAndConfidence(
+			secfilter.deduplicate(state.findings()), args.level, args.confidence
+		)
+		return findings if knownFindings is None else baseline.suppress(findings, knownFindings)
+
+	def write(findings: list[Finding], heading: str | None = None):
+		formatt(filename, findings, heading, colourMode=colourMode, ordered=not args.stream)
+		if formatt is not formatter.writeJsonl:
+			print(file=filename)
+		filename.flush()
+
+	current = rescan(selected)
+	write(current)
+	try:
+		for changed in watch.iterChanges(scanDir, args.watch_interval):
+			existing = [file for file in changed if os.path.isfile(file)]
+			state.forget([file for file in changed if file not in existing])
+			latest = rescan(_selectPlugins(filteredPlugins, existing))
+			added, resolved = watch.diffFindings(current, latest)
+			current = latest
+			if len(added) > 0:
+				write(added, f"Added {len(added)} finding(s) after changes to {len(changed)} file(s)")
+			if len(resolved) > 0:
+				write(resolved, f"Resolved {len(resolved)} finding(s)")
+	except KeyboardInterrupt:
+		pass
+	return 0
+
+
+def _daemonScan(argv: list[str], output: TextIO) -> int:
+	"""Run a scan sent to the daemon."""
+	args = _parser().parse_args(argv)
+	if args.command != "scan":
+		print(f"! SimpleSecurity encountered an error: the daemon cannot {args.command}")
+		return 2
+	return _scan(args, output)
+
+
+def cli():
+	"""Cli entry point."""
+	args = _parser().parse_args()
+	path = args.socket or daemon.socketPath()
+
+	if args.command == "serve":
+		try:
+			daemon.serve(path, _daemonScan)
+		except RuntimeError as e:
+			print(f"! SimpleSecurity encountered an error: {e}")
+			sysexit(2)
+		except KeyboardInterrupt:
+			pass
+		sysexit(0)
+	if args.command == "stop":
+		sysexit(0 if daemon.request(path, {"stop": True}, stdout) is not None else 1)
+
+	# A watch never finishes so would hold up the daemon
+	if not args.no_daemon and not args.watch:
+		code = daemon.request(path, daemon.scanRequest(argv[1:]), stdout)
+		if code is not None:
+			sysexit(code)
+	sysexit(_scan(args))
@@ -0,0 +1,132 @@
+"""Suppress known findings with a baseline file (--write-baseline/ --baseline).
+
+Each finding has a fingerprint built from its id, its file and a hash of the
+code on its line(s), so it still matches after lines are added above it.
+Fingerprints are counted, so adding another copy of a known finding to the
+same file is still reported.
+
+The baseline file is json
+
+```json
+{
+	"version": 1,
+	"fingerprints": {"<fingerprint>": count}
+}
+```
+"""
+from __future__ import annotations
+
+import hashlib
+from collections import Counter
+from json import dumps, loads
+from typing import Iterable, Iterator
+
+from simplesecurity.types import Finding
+from simplesecurity.walker import normalisePath
+
+FORMAT_VERSION = 1
+
+
+def fingerprint(finding: Finding) -> str:
+	"""Get a fingerprint for a finding that does not depend on its line number.
+
+	Args:
+		finding (Finding): finding (with evidence)
+
+	Returns:
+		str: hex digest
+	"""
+	selected = [line["content"].strip() for line in finding["evidence"] if line["selected"]]
+	code = "\n".join(selected) if len(selected) > 0 else finding["title"]
+	file = normalisePath(finding["file"])
+	file = file[2:] if file.startswith("./") else file
+	digest = hashlib.blake2b(digest_size=16)
+	for part in (finding["id"], file, code):
+		digest.update(str(part).encode("utf-8", errors="ignore") + b"\0")
+	return digest.hexdigest()
+
+
+def load(path: str) -> Counter[str]:
+	"""Load a baseline file.
+
+	Args:
+		path (str): path to the baseline file
+
+	Raises:
+		RuntimeError: if the file cannot be read or is not a baseline
+
+	Returns:
+		Counter[str]: number of findings with each fingerprint
+	"""
+	try:
+		with open(path, encoding="utf-8") as file:
+			data = loads(file.read())
+	except (OSError, ValueError) as e:
+		raise RuntimeError(f"could not read baseline {path}: {e}") from None
+	if not isinstance(data, dict) or data.get("version") != FORMAT_VERSION:
+		raise RuntimeError(f"{path} is not a version {FORMAT_VERSION} baseline")
+	return Counter(data.get("fingerprints", {}))
+
+
+def save(path: str, fingerprints: Counter[str]):
+	"""Write a baseline file.
+
+	Args:
+		path (str): path to the baseline file
+		fingerprints (Counter[str]): number of findings with each fingerprint
+	"""
+	with open(path, "w", encoding="utf-8") as file:
+		file.write(
+			dumps(
+				{"version": FORMAT_VERSION, "fingerprints": dict(sorted(fingerprints.items()))},
+				indent="\t",
+			)
+			+ "\n"
+		)
+
+
+def iterRecord(findings: Iterable[Finding], fingerprints: Counter[str]) -> Iterator[Finding]:
+	"""Count the fingerprint of each finding as it passes.
+
+	Args:
+		findings (Iterable[Finding]): findings
+		fingerprints (Counter[str]): counter to add the fingerprints to
+
+	Yields:
+		Finding: the same findings
+	"""
+	for finding in findings:
+		fingerprints[fingerprint(finding)] += 1
+		yield finding
+
+
+def iterSuppress(findings: Iterable[Finding], baseline: Counter[str]) -> Iterator[Finding]:
+	"""Drop findings that are in the baseline.
+
+	Args:
+		findings (Iterable[Finding]): findings
+		baseline (Counter[str]): fingerprints from load(). This is not changed
+
+	Yields:
+		Finding: findings not in the baseline
+	"""
+	remaining = baseline.copy()
+	for finding in findings:
+		key = fingerprint(finding)
+		if remaining[key] > 0:
+			remaining[key] -= 1
+			continue
+		yield finding
+
+
+def suppress(findings: Iterable[Finding], baseline: Counter[str]) -> list[Finding]:
+	"""Drop findings that are in the baseline.
+
+	Args:
+		findings (Iterable[Finding]): findings
+		baseline (Counter[str]): fingerprints from load()
+
+	Returns:
+		list[Finding]: findings not in the baseline
+	"""
+	return list(iterSuppress(findings, baseline))
@@ -0,0 +1,258 @@
+"""On-disk cache shared by simplesecurity between runs. This holds tool
+versions and the findings for each file that a plugin has already scanned.
+
+The cache lives in $SIMPLESECURITY_CACHE_DIR if set, otherwise in
+$XDG_CACHE_HOME/simplesecurity (~/.cache/simplesecurity)
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from json import dumps, loads
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from simplesecurity.level import Level
+from simplesecurity.rules import RULES
+from simplesecurity.types import Finding, compactFinding, toDict
+from simplesecurity.walker import normalisePath
+
+LOCK = Lock()
+# Bump this when the format of cached findings changes
+FORMAT_VERSION = 2
+
+
+def cacheDir() -> Path:
+	"""Get the directory the cache is stored in.
+
+	Returns:
+		Path: the cache directory (this may not exist yet)
+	"""
+	if os.environ.get("SIMPLESECURITY_CACHE_DIR"):
+		return Path(os.environ["SIMPLESECURITY_CACHE_DIR"])
+	xdgCache = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+	return Path(xdgCache) / "simplesecurity"
+
+
+def loadJson(name: str, default: Any = None) -> Any:
+	"""Load a json document from the cache.
+
+	Args:
+		name (str): name of the cache file. eg. tools.json
+		default (Any, optional): returned if the file is missing or corrupt.
+		Defaults to None.
+
+	Returns:
+		Any: the cached document
+	"""
+	try:
+		return loads((cacheDir() / name).read_text(encoding="utf-8"))
+	except (OSError, ValueError):
+		return default
+
+
+def saveJson(name: str, data: Any):
+	"""Save a json document to the cache. Failing to write the cache is not an
+	error (the next run will just be slower).
+
+	Args:
+		name (str): name of the cache file. eg. tools.json
+		data (Any): json serialisable document to save
+	"""
+	path = cacheDir() / name
+	tmpPath = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+	try:
+		path.parent.mkdir(parents=True, exist_ok=True)
+		tmpPath.write_text(dumps(data), encoding="utf-8")
+		os.replace(tmpPath, path)
+	except OSError:
+		pass
+
+
+def fileHash(file: str) -> str:
+	"""Get a hash of the contents of a file.
+
+	Args:
+		file (str): path to the file
+
+	Returns:
+		str: hex digest of the file contents
+	"""
+	digest = hashlib.blake2b(digest_size=20)
+	with open(file, "rb") as fileContents:
+		for chunk in iter(lambda: fileContents.read(1 << 16), b""):
+			digest.update(chunk)
+	return digest.hexdigest()
+
+
+def _toJson(finding: Finding) -> dict[str, Any]:
+	return {
+		**toDict(finding),
+		"severity": int(finding["severity"]),
+		"confidence": int(finding["confidence"]),
+	}
+
+
+def _fromJson(finding: dict[str, Any]) -> Finding:
+	finding["severity"] = Level(finding["severity"])
+	finding["confidence"] = Level(finding["confidence"])
+	# The plugin did not run for this file so add the rule it would have
+	rule = RULES.add(
+		finding["id"], finding["title"], finding["title"], finding["_other"].get("more_info")
+	)
+	finding["title"] = rule.title
+	return compactFinding(finding)  # type: ignore
+
+
+class FindingsCache:
+	"""Findings from one plugin, stored per file and keyed by the hash of the
+	file contents. The whole cache is thrown away if the tool version, rule set
+	or tool config changes.
+	"""
+
+	def __init__(
+		self, plugin: str, version: str, rules: str = "", scanDir: str = ".", config: str = ""
+	):
+		"""Load the findings cache for a plugin.
+
+		Args:
+			plugin (str): name of the plugin. eg. bandit
+			version (str): version of the tool used by the plugin
+			rules (str, optional): hash of the rule set. Defaults to "".
+			scanDir (str, optional): directory being scanned. Each scan directory
+			has its own cache file so scanning several projects (at once or in
+			turn) does not evict the others. Defaults to ".".
+			config (str, optional): hashes of the tool's config files. Defaults to "".
+		"""
+		project = hashlib.blake2b(os.path.abspath(scanDir).encode("utf-8"), digest_size=8)
+		self.name = f"findings-{plugin}-{project.hexdigest()}.json"
+		self.key = {"format": FORMAT_VERSION, "version": version, "rules": rules, "config": config}
+		stored = loadJson(self.name, {})
+		self.files: dict[str, dict[str, Any]] = (
+			stored.get("files", {}) if isinstance(stored, dict) and stored.get("key") == self.key else {}
+		)
+		self.hits = 0
+		self.misses = 0
+		self._pending: dict[str, dict[str, Any]] = {}
+		self._unmatched = False
+
+	def changed(self, files: list[str]) -> list[str]:
+		"""Get the files that are not in the cache or have changed since they were
+		cached.
+
+		Args:
+			files (list[str]): files to check
+
+		Returns:
+			list[str]: files that need scanning
+		"""
+		changed = []
+		for file in files:
+			key = normalisePath(file)
+			try:
+				stat = os.stat(file)
+			except OSError:
+				continue
+			entry = self.files.get(key)
+			if entry is not None and (entry["mtime"], entry["size"]) == (
+				stat.st_mtime_ns,
+				stat.st_size,
+			):
+				self.hits += 1
+				continue
+			contentHash = fileHash(file)
+			if entry is not None and entry["hash"] == contentHash:
+				entry["mtime"], entry["size"] = stat.st_mtime_ns, stat.st_size
+				self.hits += 1
+				continue
+			self.misses += 1
+			self._pending[key] = {
+				"mtime": stat.st_mtime_ns,
+				"size": stat.st_size,
+				"hash": contentHash,
+				"findings": [],
+			}
+			changed.append(file)
+		return changed
+
+	def update(self, findings: list[Finding]) -> bool:
+		"""Store the findings for the files returned by the last call to changed.
+
+		Args:
+			findings (list[Finding]): findings from scanning those files
+
+		Returns:
+			bool: False if some findings could not be matched to a file (in which
+			case nothing is stored)
+		"""
+		for finding in findings:
+			if not self.add(finding):
+				break
+		return self.commit()
+
+	def add(self, finding: Finding) -> bool:
+		"""Add a finding for one of the files returned by the last call to changed
+		(so a streaming plugin's findings are cached as they pass).
+
+		Args:
+			finding (Finding): finding from scanning those files
+
+		Returns:
+			bool: False if the finding could not be matched to a file (in which case
+			nothing is stored by commit)
+		"""
+		entry = self._pending.get(normalisePath(finding["file"]))
+		if entry is None:
+			self._pending = {}
+			self._unmatched = True
+			return False
+		entry["findings"].append(_toJson(finding))
+		return True
+
+	def commit(self) -> bool:
+		"""Store the findings added for the files returned by the last call to
+		changed.
+
+		Returns:
+			bool: False if some findings could not be matched to a file (in which
+			case nothing is stored)
+		"""
+		pending, unmatched = self._pending, self._unmatched
+		self._pending, self._unmatched = {}, False
+		if not unmatched:
+			self.files.update(pending)
+		return not unmatched
+
+	def prune(self, files: list[str] | None = None):
+		"""Forget files that are no longer in the scan directory.
+
+		Args:
+			files (list[str] | None, optional): all files in the scan directory.
+			Defaults to None (forget files that no longer exist)
+		"""
+		if files is None:
+			self.files = {k: v for k, v in self.files.items() if os.path.isfile(k)}
+			return
+		keep = {normalisePath(file) for file in files}
+		self.files = {k: v for k, v in self.files.items() if k in keep}
+
+	def findings(self, files: list[str]) -> list[Finding]:
+		"""Get the cached findings for some files.
+
+		Args:
+			files (list[str]): files to get findings for
+
+		Returns:
+			list[Finding]: findings in the order of files
+		"""
+		findings = []
+		for file in files:
+			entry = self.files.get(normalisePath(file))
+			if entry is not None:
+				findings.extend(_fromJson(dict(finding)) for finding in entry["findings"])
+		return findings
+
+	def save(self):
+		"""Write the cache to disk."""
+		saveJson(self.name, {"key": self.key, "files": self.files})
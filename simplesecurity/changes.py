@@ -0,0 +1,85 @@
+"""Work out which files changed according to git, so a scan can be limited to
+those files.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+from fnmatch import fnmatch
+
+from simplesecurity.walker import isExcluded
+
+# Files that change the dependencies checked by safety
+DEPENDENCY_FILES = (
+	"requirements*.txt",
+	"poetry.lock",
+	"pyproject.toml",
+	"Pipfile",
+	"Pipfile.lock",
+	"setup.py",
+	"setup.cfg",
+)
+
+
+def _git(args: list[str], cwd: str) -> str:
+	try:
+		process = subprocess.run(
+			["git", *args],
+			cwd=cwd,
+			stdout=subprocess.PIPE,
+			stderr=subprocess.PIPE,
+			encoding="utf-8",
+			errors="ignore",
+			check=False,
+		)
+	except FileNotFoundError:
+		raise RuntimeError("git is not on the system path") from None
+	if process.returncode != 0:
+		raise RuntimeError(f"git {' '.join(args)} failed: {process.stderr.strip()}")
+	return process.stdout
+
+
+def changedFiles(scanDir: str = ".", since: str | None = None) -> list[str]:
+	"""Get the files in scanDir that changed according to git. Deleted files and
+	anything in EXCLUDED are left out.
+
+	Args:
+		scanDir (str, optional): directory within a git repo. Defaults to ".".
+		since (str, optional): git ref to compare against. Changes are taken from
+		the merge base of this ref and HEAD so that changes made to the ref after
+		branching are not included. Defaults to None (uncommitted changes only)
+
+	Raises:
+		RuntimeError: if git is not on the system path or scanDir is not in a repo
+
+	Returns:
+		list[str]: sorted list of changed and untracked files (joined onto scanDir)
+	"""
+	base = "HEAD" if since is None else _git(["merge-base", since, "HEAD"], scanDir).strip()
+	diff = _git(["diff", "--name-only", "--relative", "--diff-filter=d", "-z", base], scanDir)
+	untracked = _git(["ls-files", "--others", "--exclude-standard", "-z"], scanDir)
+	files = set()
+	for name in (diff + untracked).split("\0"):
+		if name and not isExcluded(name):
+			files.add(os.path.join(scanDir, name))
+	return sorted(file for file in files if os.path.isfile(file))
+
+
+def matchFiles(files: list[str], patterns: tuple[str, ...] | None) -> list[str]:
+	"""Filter files to those with a name matching one of the patterns.
+
+	Args:
+		files (list[str]): files to filter
+		patterns (tuple[str, ...] | None): glob patterns to match against the file
+		name. eg. ("*.py",). None to match every file
+
+	Returns:
+		list[str]: matching files
+	"""
+	if patterns is None:
+		return files.copy()
+	return [
+		file
+		for file in files
+		if any(fnmatch(os.path.basename(file), pattern) for pattern in patterns)
+	]
@@ -0,0 +1,254 @@
+"""Run scans in a long running process (simplesecurity serve) so that repeated
+scans (eg. from an editor or pre-commit hook) skip python startup and reuse
+what is cached in memory (tool lookups, source lines for evidence).
+
+The cli connects to the daemon over a unix socket and sends one json line
+{"protocol", "argv", "cwd", "path"}. The daemon runs the scan in cwd and sends
+back json lines of {"out": text} (the scan's stdout) and {"err": text} (its
+stderr, eg. --profile) followed by {"exit": code}
+"""
+from __future__ import annotations
+
+import os
+import socket
+import socketserver
+import sys
+import threading
+from contextlib import redirect_stderr, redirect_stdout
+from io import TextIOBase
+from json import dumps, loads
+from typing import Any, BinaryIO, Callable, TextIO
+
+from simplesecurity.cache import cacheDir
+
+# Bump when the request or response changes
+PROTOCOL = 2
+# Characters of output to buffer before sending them to the client
+SEND_SIZE = 1 << 16
+
+
+def socketPath() -> str:
+	"""Get the default path of the daemon's socket.
+
+	Returns:
+		str: path in the cache directory
+	"""
+	return str(cacheDir() / "daemon.sock")
+
+
+def isSupported() -> bool:
+	"""Check if this platform has unix sockets.
+
+	Returns:
+		bool: True if the daemon can run here
+	"""
+	return hasattr(socket, "AF_UNIX")
+
+
+class _SocketWriter(TextIOBase):
+	"""Text file that sends what is written to the client as {key: text}."""
+
+	def __init__(self, wfile: BinaryIO, key: str = "out", sendLock: Any = None):
+		super().__init__()
+		self.wfile = wfile
+		self.key = key
+		self.buffer: list[str] = []
+		self.size = 0
+		self.lock = threading.Lock()
+		# Shared by the writers for one client so their messages do not interleave
+		self.sendLock = sendLock or threading.Lock()
+
+	def send(self, message: dict[str, Any]):
+		with self.sendLock:
+			self.wfile.write((dumps(message) + "\n").encode("utf-8"))
+			self.wfile.flush()
+
+	def write(self, text: str) -> int:
+		with self.lock:
+			self.buffer.append(text)
+			self.size += len(text)
+			if self.size >= SEND_SIZE:
+				self._send()
+		return len(text)
+
+	def flush(self):
+		with self.lock:
+			self._send()
+
+	def _send(self):
+		if self.size > 0:
+			self.send({self.key: "".join(self.buffer)})
+		self.buffer, self.size = [], 0
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+	daemon_threads = True
+
+	def __init__(self, path: str, scan: Callable[[list[str], TextIO], int]):
+		super().__init__(path, _Handler)
+		self.scan = scan
+		# Scans change the working directory and stdout so run one at a time
+		self.scanLock = threading.Lock()
+
+
+class _Handler(socketserver.StreamRequestHandler):
+	server: _Server
+
+	def handle(self):
+		try:
+			self._handle()
+		except (BrokenPipeError, ConnectionResetError):
+			# The client went away
+			pass
+
+	def _handle(self):
+		line = self.rfile.readline()
+		if not line:
+			return
+		try:
+			request = loads(line)
+		except ValueError:
+			return
+		writer = _SocketWriter(self.wfile)
+		if request.get("protocol") != PROTOCOL:
+			writer.send({"error": f"the daemon speaks protocol {PROTOCOL}"})
+			return
+		if request.get("stop"):
+			writer.send({"exit": 0})
+			threading.Thread(target=self.server.shutdown).start()
+			return
+		errors = _SocketWriter(self.wfile, "err", writer.sendLock)
+		with self.server.scanLock:
+			code = _runScan(self.server.scan, request, writer, errors)
+		errors.flush()
+		writer.flush()
+		writer.send({"exit": code})
+
+
+def _runScan(
+	scan: Callable[[list[str], TextIO], int],
+	request: dict[str, Any],
+	writer: _SocketWriter,
+	errors: _SocketWriter,
+) -> int:
+	"""Run a scan as the client would have, in its working directory and with
+	its PATH, sending its stdout and stderr to the client.
+	"""
+	cwd, path = os.getcwd(), os.environ.get("PATH", "")
+	try:
+		os.chdir(request["cwd"])
+		os.environ["PATH"] = request.get("path", path)
+		with redirect_stdout(writer), redirect_stderr(errors):  # type: ignore
+			try:
+				return scan(request["argv"], writer)  # type: ignore
+			except SystemExit as e:
+				return e.code if isinstance(e.code, int) else int(e.code is not None)
+			except Exception as e:  # pylint: disable=broad-except
+				print(f"! SimpleSecurity encountered an error: {e}")
+				return 2
+	except OSError as e:
+		writer.write(f"! SimpleSecurity encountered an error: {e}\n")
+		return 2
+	finally:
+		os.environ["PATH"] = path
+		os.chdir(cwd)
+
+
+def serve(path: str, scan: Callable[[list[str], TextIO], int]):
+	"""Listen for scan requests until asked to stop.
+
+	Args:
+		path (str): path of the unix socket to listen on
+		scan (Callable[[list[str], TextIO], int]): run a scan given the cli
+		arguments and the file to write output to, returning the exit code
+
+	Raises:
+		RuntimeError: if unix sockets are not supported or another daemon is
+		already listening on path
+	"""
+	if not isSupported():
+		raise RuntimeError("serve needs unix sockets which this platform does not have")
+	if os.path.exists(path):
+		client = _connect(path)
+		if client is not None:
+			client.close()
+			raise RuntimeError(f"a daemon is already listening on {path}")
+		os.remove(path)
+	os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+	umask = os.umask(0o177)
+	try:
+		server = _Server(path, scan)
+	finally:
+		os.umask(umask)
+	try:
+		server.serve_forever()
+	finally:
+		server.server_close()
+		try:
+			os.remove(path)
+		except OSError:
+			pass
+
+
+def _connect(path: str) -> socket.socket | None:
+	if not isSupported():
+		return None
+	client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+	try:
+		client.connect(path)
+	except OSError:
+		client.close()
+		return None
+	return client
+
+
+def request(
+	path: str, message: dict[str, Any], output: TextIO, errors: TextIO | None = None
+) -> int | None:
+	"""Send a request to the daemon, writing its output to output.
+
+	Args:
+		path (str): path of the daemon's unix socket
+		message (dict[str, Any]): request (protocol is added)
+		output (TextIO): file to write the scan output to
+		errors (TextIO | None, optional): file to write the scan's stderr to.
+		Defaults to None (sys.stderr)
+
+	Returns:
+		int | None: exit code of the scan, or None if there is no daemon (or it
+		could not run the scan) so the scan should run in this process
+	"""
+	client = _connect(path)
+	if client is None:
+		return None
+	with client, client.makefile("rwb") as stream:
+		stream.write((dumps({**message, "protocol": PROTOCOL}) + "\n").encode("utf-8"))
+		stream.flush()
+		received = False
+		for line in stream:
+			response = loads(line)
+			if "out" in response or "err" in response:
+				received = True
+				file = output if "out" in response else errors or sys.stderr
+				file.write(response.get("out", response.get("err")))
+				file.flush()
+			elif "exit" in response:
+				return response["exit"]
+			else:
+				break
+	if received:
+		print("! SimpleSecurity encountered an error: lost the connection to the daemon")
+		return 2
+	return None
+
+
+def scanRequest(argv: list[str]) -> dict[str, Any]:
+	"""Build the request for a scan run by the cli.
+
+	Args:
+		argv (list[str]): cli arguments
+
+	Returns:
+		dict[str, Any]: request to pass to request()
+	"""
+	return {"argv": argv, "cwd": os.getcwd(), "path": os.environ.get("PATH", "")}
@@ -0,0 +1,164 @@
+"""Grab evidence (the lines around a finding) from source files.
+
+addEvidence groups findings by file so each file is read once per plugin. The
+decoded lines are kept in LINE_CACHE (a size bounded LRU cache) so files that
+several plugins report on are only read from disk once per run
+"""
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+from threading import Lock
+from typing import Any
+
+from simplesecurity import profiling
+from simplesecurity.types import CompactLine, Finding, Line
+
+# Rough per-line overhead of a python str in a list, used to estimate memory use
+LINE_OVERHEAD = 64
+
+
+def readLines(file: str) -> list[str]:
+	"""Read the lines of a source file.
+
+	Args:
+		file (str): file to read
+
+	Returns:
+		list[str]: lines without line endings. The index of a line is its line
+		number - 1
+	"""
+	with open(file, encoding="utf-8", errors="ignore") as fileContents:
+		lines = fileContents.read().split("\n")
+	if lines[-1] == "":
+		lines.pop()
+	return lines
+
+
+class LineCache:
+	"""Size bounded LRU cache of the decoded lines of source files. Entries are
+	reloaded if the file's modification time or size changes.
+	"""
+
+	def __init__(self, maxBytes: int = 64 * 1024 * 1024):
+		"""Create a cache.
+
+		Args:
+			maxBytes (int, optional): approximate memory budget in bytes. Defaults to
+			64MiB.
+		"""
+		self.maxBytes = maxBytes
+		self.size = 0
+		self.hits = 0
+		self.misses = 0
+		self._files: OrderedDict[str, tuple[int, int, list[str], int]] = OrderedDict()
+		self._lock = Lock()
+
+	def lines(self, file: str) -> list[str]:
+		"""Get the lines of a file, reading it if it is not in the cache.
+
+		Args:
+			file (str): file to read
+
+		Returns:
+			list[str]: lines of the file (see readLines)
+		"""
+		stat = os.stat(file)
+		key = os.path.abspath(file)
+		with self._lock:
+			entry = self._files.get(key)
+			if entry is not None and entry[:2] == (stat.st_mtime_ns, stat.st_size):
+				self._files.move_to_end(key)
+				self.hits += 1
+				return entry[2]
+			self.misses += 1
+		lines = readLines(file)
+		cost = stat.st_size + LINE_OVERHEAD * len(lines)
+		with self._lock:
+			self._evict(key)
+			if cost <= self.maxBytes:
+				self._files[key] = (stat.st_mtime_ns, stat.st_size, lines, cost)
+				self.size += cost
+				while self.size > self.maxBytes:
+					self._evict(next(iter(self._files)))
+		return lines
+
+	def _evict(self, key: str):
+		entry = self._files.pop(key, None)
+		if entry is not None:
+			self.size -= entry[3]
+
+	def clear(self):
+		"""Empty the cache and reset the counters."""
+		with self._lock:
+			self._files.clear()
+			self.size = self.hits = self.misses = 0
+
+	def stats(self) -> dict[str, Any]:
+		"""Get the cache counters.
+
+		Returns:
+			dict[str, Any]: hits, misses, number of files and approximate size in bytes
+		"""
+		with self._lock:
+			return {
+				"hits": self.hits,
+				"misses": self.misses,
+				"files": len(self._files),
+				"size": self.size,
+				"maxBytes": self.maxBytes,
+			}
+
+
+LINE_CACHE = LineCache()
+
+
+def evidenceFromLines(lines: list[str], desiredLine: int) -> list[Line]:
+	"""Get up to two lines either side of a line.
+
+	Args:
+		lines (list[str]): lines of the file (see readLines)
+		desiredLine (int): line to highlight
+
+	Returns:
+		list[Line]: list of lines
+	"""
+	start = max(desiredLine - 3, 0)
+	return [  # type: ignore
+		CompactLine(line == desiredLine, line, lines[line - 1].rstrip().replace("\t", "    "))
+		for line in range(start + 1, min(desiredLine + 3, len(lines) + 1))
+	]
+
+
+def extractEvidence(desiredLine: int, file: str) -> list[Line]:
+	"""Grab evidence from the source file.
+
+	Args:
+		desiredLine (int): line to highlight
+		file (str): file to extract evidence from
+
+	Returns:
+		list[Line]: list of lines
+	"""
+	return evidenceFromLines(LINE_CACHE.lines(file), desiredLine)
+
+
+def addEvidence(findings: list[Finding]) -> list[Finding]:
+	"""Set the evidence for each finding, reading each file once.
+
+	Args:
+		findings (list[Finding]): findings to add evidence to (these are updated
+		in place)
+
+	Returns:
+		list[Finding]: the same findings
+	"""
+	with profiling.phase("evidence"):
+		byFile: dict[str, list[Finding]] = {}
+		for finding in findings:
+			byFile.setdefault(finding["file"], []).append(finding)
+		for file, fileFindings in byFile.items():
+			lines = LINE_CACHE.lines(file)
+			for finding in fileFindings:
+				finding["evidence"] = evidenceFromLines(lines, finding["line"])
+	return findings
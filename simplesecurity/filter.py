@@ -2,6 +2,8 @@
 """
 from __future__ import annotations
 
+from typing import Any, Iterable, Iterator
+
 from simplesecurity.types import Finding
 
 ID_MAP = {
@@ -58,21 +60,32 @@ def findingsEqual(findingA: Finding, findingB: Finding) -> int:
 def deduplicate(findings: list[Finding]) -> list[Finding]:
 	"""Deduplicate the list of findings.
 
+	Findings are bucketed by file and line, so this runs in linear time. Within a
+	bucket, a finding is dropped if a later finding has the same id, or if
+	another finding has an id that lookupId(finding) maps to.
+
 	Args:
 		findings (list[Finding]): list of findings to deduplicate
 
 	Returns:
 		list[Finding]: new deduplicated list
 	"""
-	findings = findings.copy()
-	for indexA, findingA in enumerate(findings):
-		for _indexB, findingB in enumerate(findings[indexA + 1 :]):
-			equal = findingsEqual(findingA, findingB)
-			if equal == 1:  # lookup(left) is equal to right - bin left.
-				findings.remove(findingA)
-			elif equal == -1:  # lookup(right) is equal to left - bin right.
-				findings.remove(findingB)
-	return findings
+	# (file, line) -> {id: index of the last finding with that id}
+	buckets: dict[tuple[str, Any], dict[str, int]] = {}
+	keys = []
+	for index, finding in enumerate(findings):
+		key = (finding["file"].replace("./", ""), finding["line"])
+		buckets.setdefault(key, {})[finding["id"]] = index
+		keys.append(key)
+	deduplicated = []
+	for index, finding in enumerate(findings):
+		ids = buckets[keys[index]]
+		if ids[finding["id"]] != index:
+			continue
+		if any(other in ids for other in ID_MAP.get(finding["id"], ())):
+			continue
+		deduplicated.append(finding)
+	return deduplicated
 
 
 def filterSeverityAndConfidence(
@@ -90,11 +103,49 @@ def filterSeverityAndConfidence(
 	"""
 	if severity == 0 and confidence == 0:
 		return findings.copy()
-	filtered = []
+	return list(iterFilterSeverityAndConfidence(findings, severity, confidence))
+
+
+def iterDeduplicate(findings: Iterable[Finding]) -> Iterator[Finding]:
+	"""Deduplicate findings as they arrive, for use with a stream of findings.
+
+	Unlike deduplicate, a finding is yielded before any later finding that
+	would replace it is seen. So a finding is only dropped if an identical
+	finding, or one that lookupId(finding) maps to, was yielded earlier.
+
+	Args:
+		findings (Iterable[Finding]): findings to deduplicate
+
+	Yields:
+		Finding: deduplicated findings
+	"""
+	# hash((file, line, id)) of each finding yielded. Only the hash is kept, so
+	# memory does not grow with the size of the findings
+	seen: set[int] = set()
+	for finding in findings:
+		file, line = finding["file"].replace("./", ""), finding["line"]
+		fingerprint = hash((file, line, finding["id"]))
+		if fingerprint in seen or any(
+			hash((file, line, other)) in seen for other in ID_MAP.get(finding["id"], ())
+		):
+			continue
+		seen.add(fingerprint)
+		yield finding
+
+
+def iterFilterSeverityAndConfidence(
+	findings: Iterable[Finding], severity: int, confidence: int
+) -> Iterator[Finding]:
+	"""Filter findings as they arrive, for use with a stream of findings.
+
+	Args:
+		findings (Iterable[Finding]): findings to filter
+		severity (int): min severity
+		confidence (int): min confidence
+
+	Yields:
+		Finding: findings with at least the min severity and confidence
+	"""
 	for finding in findings:
-		print(
-			f'severity {finding["severity"] < severity} confidence {finding["confidence"] < confidence}'
-		)
 		if finding["severity"] >= severity and finding["confidence"] >= confidence:
-			filtered.append(finding)
-	return filtered
+			yield finding
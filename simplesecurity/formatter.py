@@ -19,9 +19,17 @@ Formats
 
 - ansi (for terminal)
 - json
+- jsonl (one finding per line, for streaming)
 - markdown
 - csv
 - sarif
+- sarif-compact (writeSarif with compact=True, no indentation and each file
+  listed once)
+
+Each format has a writer (eg. writeJson) that writes to a file as the findings
+are consumed, and a function (eg. json) that returns the output as a string.
+Writers sort the findings by severity unless ordered=False, in which case each
+finding is written (and flushed) as soon as it arrives
 """
 # pyright: reportConstantRedefinition=false
 from __future__ import annotations
@@ -29,8 +37,10 @@ from __future__ import annotations
 from csv import QUOTE_ALL, writer
 from io import StringIO
 from json import dumps
+from typing import Any, Iterable, TextIO
 
-from simplesecurity.types import Finding, Line
+from simplesecurity.rules import RULES, Rule
+from simplesecurity.types import Finding, Line, toDict
 
 
 def formatEvidence(evidence: list[Line], newlineChar: bool = True) -> str:
@@ -49,102 +59,226 @@ def formatEvidence(evidence: list[Line], newlineChar: bool = True) -> str:
 	return "\\n".join(evidenceText)
 
 
-def markdown(findings: list[Finding], heading: str | None = None, colourMode: int = 0) -> str:
-	"""Format to Markdown.
+def _order(findings: Iterable[Finding], ordered: bool) -> Iterable[Finding]:
+	if ordered:
+		return sorted(findings, key=lambda i: i["severity"], reverse=True)
+	return findings
+
+
+def _flush(file: TextIO, ordered: bool):
+	if not ordered:
+		file.flush()
+
+
+def _writeJsonArray(
+	file: TextIO,
+	skeleton: dict[str, Any],
+	path: list[Any],
+	items: Iterable[Any],
+	ordered: bool,
+	compact: bool = False,
+) -> int:
+	"""Write skeleton as tab indented json with the (empty) list at path filled
+	from items one at a time. The output matches dumps(..., indent="\\t").
 
 	Args:
-		findings (list[Finding]): Findings to format
+		file (TextIO): file to write to
+		skeleton (dict[str, Any]): json document with an empty list at path
+		path (list[Any]): keys leading to the list
+		items (Iterable[Any]): items for the list
+		ordered (bool): False to flush after each item
+		compact (bool, optional): Write without whitespace, matching
+			dumps(..., separators=(",", ":")). Defaults to False.
+
+	Returns:
+		int: number of items written
+	"""
+	options: dict[str, Any] = {"separators": (",", ":")} if compact else {"indent": "\t"}
+	marker = "\x01items\x01"
+	node = skeleton
+	for key in path[:-1]:
+		node = node[key]
+	node[path[-1]] = marker
+	prefix, suffix = dumps(skeleton, **options).split(dumps(marker))
+	indent = "" if compact else "\n" + prefix[prefix.rfind("\n") + 1 :].split('"')[0] + "\t"
+	file.write(prefix + "[")
+	count = 0
+	for item in items:
+		itemStr = dumps(item, **options)
+		if not compact:
+			itemStr = itemStr.replace("\n", indent)
+		file.write(("," if count > 0 else "") + indent + itemStr)
+		count += 1
+		_flush(file, ordered)
+	file.write((indent[:-1] if count > 0 else "") + "]" + suffix)
+	return count
+
+
+def writeMarkdown(
+	file: TextIO,
+	findings: Iterable[Finding],
+	heading: str | None = None,
+	colourMode: int = 0,
+	ordered: bool = True,
+) -> int:
+	"""Write findings to a file as Markdown.
+
+	Args:
+		file (TextIO): file to write to
+		findings (Iterable[Finding]): Findings to format
 		heading (str, optional): Optional heading to include. Defaults to None.
 		colourMode (int, optional): Output with a given colour mode 0: no colour,
 			1: default, 2: high contrast. Defaults to 0.
+		ordered (bool, optional): Sort by severity. Otherwise write each finding as
+			it arrives and put the summary table at the end. Defaults to True.
 
 	Returns:
-		str: String to write to a file of stdout
+		int: number of findings written
 	"""
 	_ = colourMode  # silence pylint
-	if len(findings) == 0:
-		return "No findings"
+	if heading is None:
+		heading = "# Findings\nFind a list of findings below" + (
+			" ordered by severity" if ordered else ""
+		)
+	findings = _order(findings, ordered)
 
-	heading = (
-		heading
-		if heading is not None
-		else "# Findings\nFind a list of findings below ordered by severity"
-	)
-	strBuf = [heading]
-	findings = sorted(findings, key=lambda i: i["severity"], reverse=True)
+	def summary(rows: Iterable[Any]):
+		file.write("\n|Severity|Finding|\n|:--|:--|\n")
+		for row in rows:
+			file.write(f"|{row['severity']}|{row['title']}|\n")
+		file.write("\n")
 
-	# Summary Table
-	strBuf.append("")
-	strBuf.append("|Severity|Finding|\n|:--|:--|")
+	summaryRows = []
 	for finding in findings:
-		strBuf.append(f"|{finding['severity']}|{finding['title']}|")
-	strBuf.append("")
-
-	# Details
-	for finding in findings:
-		strBuf.extend(
-			[
-				f"## {finding['title']}",
-				f"{finding['description']}",
-				f"\n\nFile: `{finding['file']}`",
-				f"### Severity\n\n{finding['severity']} (confidence: {finding['confidence']})",
-				f"### Evidence\n\nLine: {finding['line']}\n",
-				f"```python\n{formatEvidence(finding['evidence'])}\n```",
-			]
+		if len(summaryRows) == 0:
+			file.write(heading + "\n")
+			if ordered:
+				summary(findings)
+			else:
+				file.write("\n")
+		summaryRows.append({"severity": finding["severity"], "title": finding["title"]})
+		file.write(
+			"\n".join(
+				[
+					f"## {finding['title']}",
+					f"{finding['description']}",
+					f"\n\nFile: `{finding['file']}`",
+					f"### Severity\n\n{finding['severity']} (confidence: {finding['confidence']})",
+					f"### Evidence\n\nLine: {finding['line']}\n",
+					f"```python\n{formatEvidence(finding['evidence'])}\n```",
+				]
+			)
+			+ "\n"
 		)
-	return "\n".join(strBuf) + "\n"
-
-
-def json(findings: list[Finding], heading: str | None = None, colourMode: int = 0) -> str:
-	"""Format to Json.
+		_flush(file, ordered)
+	if len(summaryRows) == 0:
+		file.write("No findings")
+	elif not ordered:
+		summary(summaryRows)
+	return len(summaryRows)
+
+
+def writeJson(
+	file: TextIO,
+	findings: Iterable[Finding],
+	heading: str | None = None,
+	colourMode: int = 0,
+	ordered: bool = True,
+) -> int:
+	"""Write findings to a file as Json.
 
 	Args:
-		findings (list[Finding]): Findings to format
+		file (TextIO): file to write to
+		findings (Iterable[Finding]): Findings to format
 		heading (str, optional): Optional heading to include. Defaults to None.
 		colourMode (int, optional): Output with a given colour mode 0: no colour,
 			1: default, 2: high contrast. Defaults to 0.
+		ordered (bool, optional): Sort by severity. Defaults to True.
 
 	Returns:
-		str: String to write to a file of stdout
+		int: number of findings written
 	"""
 	_ = colourMode  # silence pylint
-	findings = sorted(findings, key=lambda i: i["severity"], reverse=True)
 	out = {
 		"heading": heading
 		if heading is not None
-		else "Findings - Findings below are ordered by severity",
-		"findings": findings,
+		else "Findings" + (" - Findings below are ordered by severity" if ordered else ""),
+		"findings": [],
 	}
-	return dumps(out, indent="\t")
+	return _writeJsonArray(
+		file, out, ["findings"], map(toDict, _order(findings, ordered)), ordered
+	)
 
 
-def csv(findings: list[Finding], heading: str | None = None, colourMode: int = 0) -> str:
-	"""Format to CSV.
+def writeJsonl(
+	file: TextIO,
+	findings: Iterable[Finding],
+	heading: str | None = None,
+	colourMode: int = 0,
+	ordered: bool = True,
+) -> int:
+	"""Write findings to a file as Json lines, one finding per line. This lets a
+	consumer process findings as they are written.
 
 	Args:
-		findings (list[Finding]): Findings to format
+		file (TextIO): file to write to
+		findings (Iterable[Finding]): Findings to format
+		heading (str, optional): Optional heading, written first as a
+			{"heading": heading} line. Defaults to None.
+		colourMode (int, optional): Output with a given colour mode 0: no colour,
+			1: default, 2: high contrast. Defaults to 0.
+		ordered (bool, optional): Sort by severity. Defaults to True.
+
+	Returns:
+		int: number of findings written
+	"""
+	_ = colourMode  # silence pylint
+	if heading is not None:
+		file.write(dumps({"heading": heading}) + "\n")
+	count = 0
+	for finding in _order(findings, ordered):
+		file.write(dumps(toDict(finding)) + "\n")
+		count += 1
+		_flush(file, ordered)
+	return count
+
+
+def writeCsv(
+	file: TextIO,
+	findings: Iterable[Finding],
+	heading: str | None = None,
+	colourMode: int = 0,
+	ordered: bool = True,
+) -> int:
+	"""Write findings to a file as CSV.
+
+	Args:
+		file (TextIO): file to write to
+		findings (Iterable[Finding]): Findings to format
 		heading (str, optional): Optional heading to include. Defaults to None.
 		colourMode (int, optional): Output with a given colour mode 0: no colour,
 			1: default, 2: high contrast. Defaults to 0.
+		ordered (bool, optional): Sort by severity. Defaults to True.
 
 	Returns:
-		str: String to write to a file of stdout
+		int: number of findings written
 	"""
 	_ = colourMode  # silence pylint
-	findings = sorted(findings, key=lambda i: i["severity"], reverse=True)
-	output = StringIO()
-	csvString = writer(output, quoting=QUOTE_ALL, lineterminator="\n", strict=True)
+	csvString = writer(file, quoting=QUOTE_ALL, lineterminator="\n", strict=True)
 	csvString.writerow(
 		[
 			heading
 			if heading is not None
-			else "Findings - Findings below are ordered by severity (you may want to delete this line)"
+			else "Findings - Findings below are "
+			+ ("ordered by severity " if ordered else "")
+			+ "(you may want to delete this line)"
 		]
 	)
 	csvString.writerow(
 		["id", "title", "description", "file", "evidence", "severity", "confidence", "line"]
 	)
-	for finding in findings:
+	count = 0
+	for finding in _order(findings, ordered):
 		csvString.writerow(
 			[
 				finding["id"],
@@ -157,34 +291,14 @@ def csv(findings: list[Finding], heading: str | None = None, colourMode: int = 0
 				finding["line"],
 			]
 		)
-	return output.getvalue()
+		count += 1
+		_flush(file, ordered)
+	return count
 
 
-def ansi(findings: list[Finding], heading: str | None = None, colourMode: int = 0) -> str:
-	"""Format to ansi.
-
-	Args:
-		findings (list[Finding]): Findings to format
-		heading (str, optional): Optional heading to include. Defaults to None.
-		colourMode (int, optional): Output with a given colour mode 0: no colour,
-			1: default, 2: high contrast. Defaults to 0.
-
-	Returns:
-		str: String to write to a file of stdout
-	"""
-	# pylint: disable=invalid-name
-	FMT = {
-		"TXT": "",
-		"BLD": "",
-		"CLS": "",
-		"UL": "",
-		"CB": "",
-		"CG": "",
-		"CY": "",
-		"CODE": "│",
-	}
+def _ansiFormat(colourMode: int) -> dict[str, str]:
 	if colourMode == 1:
-		FMT = {
+		return {
 			"TXT": "",
 			"BLD": "\033[01m",
 			"CLS": "\033[00m",
@@ -194,8 +308,8 @@ def ansi(findings: list[Finding], heading: str | None = None, colourMode: int =
 			"CY": "\033[33m",
 			"CODE": "│\033[100m\033[93m",
 		}
-	elif colourMode == 2:
-		FMT = {
+	if colourMode == 2:
+		return {
 			"TXT": "\033[97m",
 			"BLD": "\033[01m",
 			"CLS": "\033[00m",
@@ -205,31 +319,68 @@ def ansi(findings: list[Finding], heading: str | None = None, colourMode: int =
 			"CY": "\033[93m",
 			"CODE": "\033[97m│\033[107m\033[90m",
 		}
-	if len(findings) == 0:
-		return f"{FMT['BLD']}{FMT['UL']}{FMT['CB']}No findings{FMT['CLS']}"
+	return {
+		"TXT": "",
+		"BLD": "",
+		"CLS": "",
+		"UL": "",
+		"CB": "",
+		"CG": "",
+		"CY": "",
+		"CODE": "│",
+	}
 
+
+def writeAnsi(
+	file: TextIO,
+	findings: Iterable[Finding],
+	heading: str | None = None,
+	colourMode: int = 0,
+	ordered: bool = True,
+) -> int:
+	"""Write findings to a file formatted with ansi.
+
+	Args:
+		file (TextIO): file to write to
+		findings (Iterable[Finding]): Findings to format
+		heading (str, optional): Optional heading to include. Defaults to None.
+		colourMode (int, optional): Output with a given colour mode 0: no colour,
+			1: default, 2: high contrast. Defaults to 0.
+		ordered (bool, optional): Sort by severity. Otherwise write each finding as
+			it arrives and put the summary table at the end. Defaults to True.
+
+	Returns:
+		int: number of findings written
+	"""
+	# pylint: disable=invalid-name
+	FMT = _ansiFormat(colourMode)
 	# pylint: enable=invalid-name
-	strBuf = (
+	headingBuf = (
 		[heading]
 		if heading is not None
 		else [
 			f"{FMT['BLD']}{FMT['UL']}{FMT['CB']}Findings{FMT['CLS']}\n",
-			f"{FMT['TXT']}Find a list of findings below ordered by severity\n",
+			f"{FMT['TXT']}Find a list of findings below"
+			+ (" ordered by severity\n" if ordered else "\n"),
 		]
 	)
-	findings = sorted(findings, key=lambda i: i["severity"], reverse=True)
+	findings = _order(findings, ordered)
 
-	# Summary Table
-	strBuf.append(f"{FMT['TXT']}┌{'─'*10}┬{'─'*50}┐")
-	strBuf.append("│Severity  │Finding                                           │")
-	strBuf.append(f"├{'─'*10}┼{'─'*50}┤")
-	for finding in findings:
-		strBuf.append(f"│{str(finding['severity']): <10}│{finding['title'][:50]: <50}│")
-	strBuf.append(f"└{'─'*10}┴{'─'*50}┘")
-	strBuf.append("")
+	def summary(rows: Iterable[Any]):
+		file.write(f"\n{FMT['TXT']}┌{'─'*10}┬{'─'*50}┐")
+		file.write("\n│Severity  │Finding                                           │")
+		file.write(f"\n├{'─'*10}┼{'─'*50}┤")
+		for row in rows:
+			file.write(f"\n│{str(row['severity']): <10}│{row['title'][:50]: <50}│")
+		file.write(f"\n└{'─'*10}┴{'─'*50}┘\n")
 
-	# Details
+	summaryRows = []
 	for finding in findings:
+		if len(summaryRows) == 0:
+			file.write("\n".join(headingBuf))
+			if ordered:
+				summary(findings)
+		summaryRows.append({"severity": finding["severity"], "title": finding["title"]})
 		evidence = [f"{FMT['TXT']}┌{' ' + finding['file'] + ' ':─^85}┐"]
 		for line in finding["evidence"]:
 			evidence.append(
@@ -239,83 +390,265 @@ def ansi(findings: list[Finding], heading: str | None = None, colourMode: int =
 			)
 		evidence.append(f"└{'─'*85}┘")
 		evidenceStr = "\n".join(evidence)
-		strBuf.extend(
-			[
-				f"{FMT['BLD']}{FMT['UL']}{FMT['CG']}{finding['title']}{FMT['CLS']}",
-				f"{FMT['TXT']}{finding['description']}",
-				f"\n{FMT['UL']}{FMT['CY']}Severity: {finding['severity']} "
-				+ f"(confidence: {finding['confidence']}){FMT['CLS']}\n",
-				f"{FMT['UL']}{FMT['CY']}Evidence{FMT['CLS']}\n{evidenceStr}\n",
-			]
+		file.write(
+			"\n"
+			+ "\n".join(
+				[
+					f"{FMT['BLD']}{FMT['UL']}{FMT['CG']}{finding['title']}{FMT['CLS']}",
+					f"{FMT['TXT']}{finding['description']}",
+					f"\n{FMT['UL']}{FMT['CY']}Severity: {finding['severity']} "
+					+ f"(confidence: {finding['confidence']}){FMT['CLS']}\n",
+					f"{FMT['UL']}{FMT['CY']}Evidence{FMT['CLS']}\n{evidenceStr}\n",
+				]
+			)
 		)
-	return "\n".join(strBuf) + f"{FMT['CLS']}"
+		_flush(file, ordered)
+	if len(summaryRows) == 0:
+		file.write(f"{FMT['BLD']}{FMT['UL']}{FMT['CB']}No findings{FMT['CLS']}")
+		return 0
+	if not ordered:
+		summary(summaryRows)
+	file.write(f"{FMT['CLS']}")
+	return len(summaryRows)
+
+
+def _sarifRule(rule: Rule) -> dict[str, Any]:
+	"""Get the sarif reportingDescriptor for a rule."""
+	descriptor: dict[str, Any] = {
+		"id": rule.id,
+		"shortDescription": {"text": rule.title},
+		"fullDescription": {"text": rule.description},
+	}
+	if isinstance(rule.moreInfo, str) and rule.moreInfo:
+		descriptor["helpUri"] = rule.moreInfo
+	return descriptor
 
 
-def sarif(findings: list[Finding], heading: str | None = None, colourMode: int = 0) -> str:
-	"""Format to sarif https://sarifweb.azurewebsites.net/.
+def _sarifResult(
+	finding: Finding, ruleIndex: int, artifactIndex: int | None, snippets: bool
+) -> dict[str, Any]:
+	"""Get the sarif result for a finding. The message leaves out the title (it
+	is in the rule) when artifactIndex is given (for compact output).
+	"""
+	artifactLocation: dict[str, Any] = {"uri": finding["file"]}
+	region: dict[str, Any] = {"startLine": max(finding["line"], 1)}
+	physicalLocation: dict[str, Any] = {"artifactLocation": artifactLocation, "region": region}
+	if artifactIndex is not None:
+		artifactLocation["index"] = artifactIndex
+	evidence = finding["evidence"]
+	if snippets:
+		region["snippet"] = {
+			"text": "".join([line["content"] for line in evidence if line["selected"]])
+		}
+		if len(evidence) > 0:
+			physicalLocation["contextRegion"] = {
+				"startLine": max(evidence[0]["line"], 1),
+				"endLine": max(evidence[-1]["line"], 1),
+				"snippet": {"text": "\n".join([line["content"] for line in evidence])},
+			}
+	return {
+		"ruleId": finding["id"],
+		"ruleIndex": ruleIndex,
+		"level": finding["severity"].toSarif(),
+		"message": {
+			"text": finding["description"]
+			if artifactIndex is not None
+			else f"{finding['title']}: {finding['description']}"
+		},
+		"locations": [{"physicalLocation": physicalLocation}],
+	}
+
+
+def writeSarif(
+	file: TextIO,
+	findings: Iterable[Finding],
+	heading: str | None = None,
+	colourMode: int = 0,
+	ordered: bool = True,
+	compact: bool = False,
+	snippets: bool = True,
+) -> int:
+	"""Write findings to a file as sarif https://sarifweb.azurewebsites.net/.
 
 	Args:
-		findings (list[Finding]): Findings to format
+		file (TextIO): file to write to
+		findings (Iterable[Finding]): Findings to format
 		heading (str, optional): Optional heading to include. Defaults to None.
 		colourMode (int, optional): Output with a given colour mode 0: no colour,
 			1: default, 2: high contrast. Defaults to 0.
+		ordered (bool, optional): Unused, sarif results keep the order given
+			(flushed after each result when False). The rules are written before
+			the results so findings are collected first. Defaults to True.
+		compact (bool, optional): Write without indentation, list each file once
+			in the run's artifacts (results reference them by index) and leave the
+			rule title out of each result's message. Defaults to False.
+		snippets (bool, optional): Include the code for each result. Defaults to True.
 
 	Returns:
-		str: String to write to a file of stdout
+		int: number of findings written
 	"""
 	_, _ = colourMode, heading  # silence pylint
+	findings = list(findings)
+	ruleIndex: dict[str, int] = {}
+	rules = []
+	artifactIndex: dict[str, int] = {}
+	for finding in findings:
+		if finding["id"] not in ruleIndex:
+			ruleIndex[finding["id"]] = len(rules)
+			rules.append(_sarifRule(RULES.forFinding(finding)))
+		artifactIndex.setdefault(finding["file"], len(artifactIndex))
+	run: dict[str, Any] = {
+		"tool": {
+			"driver": {
+				"name": "SimpleSecurity",
+				"informationUri": "https://github.com/FHPythonUtils/SimpleSecurity",
+				"version": "2020.*",
+				"rules": rules,
+			}
+		},
+	}
+	if compact:
+		run["artifacts"] = [{"location": {"uri": uri}} for uri in artifactIndex]
+	run["results"] = []
 	out = {
 		"version": "2.1.0",
 		"$schema": (
 			"https://raw.githubusercontent.com/oasis-tcs/sarif-spec/"
 			"master/Schemata/sarif-schema-2.1.0.json"
 		),
-		"runs": [
-			{
-				"tool": {
-					"driver": {
-						"name": "SimpleSecurity",
-						"informationUri": "https://github.com/FHPythonUtils/SimpleSecurity",
-						"version": "2020.*",
-					}
-				},
-				"results": [
-					{
-						"ruleId": finding["id"],
-						"level": finding["severity"].toSarif(),
-						"message": {"text": f"{finding['title']}: {finding['description']}"},
-						"locations": [
-							{
-								"physicalLocation": {
-									"artifactLocation": {"uri": finding["file"]},
-									"region": {
-										"startLine": max(finding["line"], 1),
-										"snippet": {
-											"text": "".join(
-												[
-													line["content"]
-													for line in finding["evidence"]
-													if line["selected"]
-												]
-											)
-										},
-									},
-									"contextRegion": {
-										"startLine": max(finding["evidence"][0]["line"], 1),
-										"endLine": max(finding["evidence"][-1]["line"], 1),
-										"snippet": {
-											"text": "\n".join(
-												[line["content"] for line in finding["evidence"]]
-											)
-										},
-									},
-								}
-							}
-						],
-					}
-					for finding in findings
-				],
-			}
-		],
+		"runs": [run],
 	}
-	return dumps(out, indent="\t")
+	results = (
+		_sarifResult(
+			finding,
+			ruleIndex[finding["id"]],
+			artifactIndex[finding["file"]] if compact else None,
+			snippets,
+		)
+		for finding in findings
+	)
+	return _writeJsonArray(file, out, ["runs", 0, "results"], results, ordered, compact)
+
+
+def markdown(findings: list[Finding], heading: str | None = None, colourMode: int = 0) -> str:
+	"""Format to Markdown.
+
+	Args:
+		findings (list[Finding]): Findings to format
+		heading (str, optional): Optional heading to include. Defaults to None.
+		colourMode (int, optional): Output with a given colour mode 0: no colour,
+			1: default, 2: high contrast. Defaults to 0.
+
+	Returns:
+		str: String to write to a file of stdout
+	"""
+	output = StringIO()
+	writeMarkdown(output, findings, heading, colourMode)
+	return output.getvalue()
+
+
+def json(findings: list[Finding], heading: str | None = None, colourMode: int = 0) -> str:
+	"""Format to Json.
+
+	Args:
+		findings (list[Finding]): Findings to format
+		heading (str, optional): Optional heading to include. Defaults to None.
+		colourMode (int, optional): Output with a given colour mode 0: no colour,
+			1: default, 2: high contrast. Defaults to 0.
+
+	Returns:
+		str: String to write to a file of stdout
+	"""
+	output = StringIO()
+	writeJson(output, findings, heading, colourMode)
+	return output.getvalue()
+
+
+def jsonl(findings: list[Finding], heading: str | None = None, colourMode: int = 0) -> str:
+	"""Format to Json lines, one finding per line.
+
+	Args:
+		findings (list[Finding]): Findings to format
+		heading (str, optional): Optional heading, written first as a
+			{"heading": heading} line. Defaults to None.
+		colourMode (int, optional): Output with a given colour mode 0: no colour,
+			1: default, 2: high contrast. Defaults to 0.
+
+	Returns:
+		str: String to write to a file of stdout
+	"""
+	output = StringIO()
+	writeJsonl(output, findings, heading, colourMode)
+	return output.getvalue()
+
+
+def csv(findings: list[Finding], heading: str | None = None, colourMode: int = 0) -> str:
+	"""Format to CSV.
+
+	Args:
+		findings (list[Finding]): Findings to format
+		heading (str, optional): Optional heading to include. Defaults to None.
+		colourMode (int, optional): Output with a given colour mode 0: no colour,
+			1: default, 2: high contrast. Defaults to 0.
+
+	Returns:
+		str: String to write to a file of stdout
+	"""
+	output = StringIO()
+	writeCsv(output, findings, heading, colourMode)
+	return output.getvalue()
+
+
+def ansi(findings: list[Finding], heading: str | None = None, colourMode: int = 0) -> str:
+	"""Format to ansi.
+
+	Args:
+		findings (list[Finding]): Findings to format
+		heading (str, optional): Optional heading to include. Defaults to None.
+		colourMode (int, optional): Output with a given colour mode 0: no colour,
+			1: default, 2: high contrast. Defaults to 0.
+
+	Returns:
+		str: String to write to a file of stdout
+	"""
+	output = StringIO()
+	writeAnsi(output, findings, heading, colourMode)
+	return output.getvalue()
+
+
+def sarif(findings: list[Finding], heading: str | None = None, colourMode: int = 0) -> str:
+	"""Format to sarif https://sarifweb.azurewebsites.net/.
+
+	Args:
+		findings (list[Finding]): Findings to format
+		heading (str, optional): Optional heading to include. Defaults to None.
+		colourMode (int, optional): Output with a given colour mode 0: no colour,
+			1: default, 2: high contrast. Defaults to 0.
+
+	Returns:
+		str: String to write to a file of stdout
+	"""
+	output = StringIO()
+	writeSarif(output, findings, heading, colourMode)
+	return output.getvalue()
+
+
+def sarifCompact(
+	findings: list[Finding], heading: str | None = None, colourMode: int = 0, snippets: bool = True
+) -> str:
+	"""Format to compact sarif https://sarifweb.azurewebsites.net/ (no
+	indentation, files listed once as artifacts, see writeSarif).
+
+	Args:
+		findings (list[Finding]): Findings to format
+		heading (str, optional): Optional heading to include. Defaults to None.
+		colourMode (int, optional): Output with a given colour mode 0: no colour,
+			1: default, 2: high contrast. Defaults to 0.
+		snippets (bool, optional): Include the code for each result. Defaults to True.
+
+	Returns:
+		str: String to write to a file of stdout
+	"""
+	output = StringIO()
+	writeSarif(output, findings, heading, colourMode, compact=True, snippets=snippets)
+	return output.getvalue()
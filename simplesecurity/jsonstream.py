@@ -0,0 +1,163 @@
+"""Parse the json output of a tool as it is read, rather than loading the whole
+output into memory first.
+
+Tools write one top level json object containing (possibly huge) arrays of
+results. JsonStream yields the items of those arrays one at a time, so memory
+use depends on the size of a single result rather than the whole output
+"""
+from __future__ import annotations
+
+import re
+from json import JSONDecodeError, JSONDecoder
+from typing import Any
+
+NON_WHITESPACE = re.compile(r"\S")
+
+
+class JsonStream:
+	"""Push parser for a top level json object. Feed it chunks of text and get
+	back (key, item) for each item of the arrays under the selected keys.
+	"""
+
+	def __init__(self, keys: set[str] | None = None, allowEmpty: bool = False):
+		"""Create a parser.
+
+		Args:
+			keys (set[str], optional): keys of the arrays to stream. Values under
+			other keys are skipped. Defaults to None (stream every array, any other
+			value is returned whole)
+			allowEmpty (bool, optional): treat empty input as an empty object.
+			Defaults to False.
+		"""
+		self.keys = keys
+		self.allowEmpty = allowEmpty
+		self._decoder = JSONDecoder()
+		self._buf = ""
+		self._pos = 0
+		self._state = "start"
+		self._key = ""
+		# Do not retry an incomplete value until the buffer is at least this long
+		self._retryAt = 0
+
+	def feed(self, chunk: str) -> list[tuple[str, Any]]:
+		"""Parse the next chunk of text.
+
+		Args:
+			chunk (str): text to parse
+
+		Returns:
+			list[tuple[str, Any]]: (key, item) for each item completed by this chunk
+		"""
+		if self._pos > 1 << 16 and self._pos * 2 > len(self._buf):
+			self._buf = self._buf[self._pos :]
+			self._retryAt -= self._pos
+			self._pos = 0
+		self._buf += chunk
+		if len(self._buf) < self._retryAt:
+			return []
+		return self._parse(final=False)
+
+	def close(self) -> list[tuple[str, Any]]:
+		"""Finish parsing.
+
+		Raises:
+			ValueError: if the input was not a complete json object
+
+		Returns:
+			list[tuple[str, Any]]: (key, item) for any remaining items
+		"""
+		items = self._parse(final=True)
+		if self._state == "start" and self.allowEmpty:
+			return items
+		if self._state != "end":
+			raise ValueError(
+				f"incomplete or invalid json at char {self._pos}: "
+				f"{self._buf[self._pos : self._pos + 80]!r}"
+			)
+		return items
+
+	def _skip(self) -> str | None:
+		"""Skip whitespace and return the next character (None if more input is
+		needed).
+		"""
+		match = NON_WHITESPACE.search(self._buf, self._pos)
+		if match is None:
+			self._pos = len(self._buf)
+			return None
+		self._pos = match.start()
+		return self._buf[self._pos]
+
+	def _decode(self, final: bool) -> tuple[bool, Any]:
+		"""Decode the value at the current position. Returns (False, None) if more
+		input is needed.
+		"""
+		try:
+			value, end = self._decoder.raw_decode(self._buf, self._pos)
+		except JSONDecodeError:
+			if final:
+				raise ValueError(f"invalid json at char {self._pos}") from None
+			self._retryAt = len(self._buf) * 2
+			return False, None
+		# A number (or anything else) running to the end of the buffer may be cut off
+		if end == len(self._buf) and not final:
+			self._retryAt = len(self._buf) + 1
+			return False, None
+		self._pos = end
+		return True, value
+
+	def _parse(self, final: bool) -> list[tuple[str, Any]]:
+		items = []
+		while True:
+			char = self._skip()
+			if char is None or self._state == "end":
+				return items
+			state = self._state
+			if state == "start":
+				if char != "{":
+					raise ValueError(f"expected a json object but found {char!r}")
+				self._pos += 1
+				self._state = "key"
+			elif state in ("key", "nextKey"):
+				if char == "}":
+					self._pos += 1
+					self._state = "end"
+				elif state == "nextKey" and char == ",":
+					self._pos += 1
+					self._state = "key"
+				else:
+					done, key = self._decode(final)
+					if not done:
+						return items
+					if not isinstance(key, str):
+						raise ValueError(f"expected a key at char {self._pos}")
+					self._key = key
+					self._state = "colon"
+			elif state == "colon":
+				if char != ":":
+					raise ValueError(f"expected ':' at char {self._pos}")
+				self._pos += 1
+				self._state = "value"
+			elif state == "value":
+				if char == "[" and (self.keys is None or self._key in self.keys):
+					self._pos += 1
+					self._state = "item"
+				else:
+					done, value = self._decode(final)
+					if not done:
+						return items
+					if self.keys is None:
+						items.append((self._key, value))
+					self._state = "nextKey"
+			elif state in ("item", "nextItem"):
+				if char == "]":
+					self._pos += 1
+					self._state = "nextKey"
+				elif state == "nextItem" and char == ",":
+					self._pos += 1
+					self._state = "item"
+				else:
+					done, value = self._decode(final)
+					if not done:
+						return items
+					items.append((self._key, value))
+					self._state = "nextItem"
@@ -3,9 +3,15 @@
 - bandit
 - safety
 - dodgy
+- secrets (dodgy's checks, run in process)
 - dlint
 - semgrep
 
+Each plugin also has a generator variant (eg. iterBandit) that yields findings
+as the tool output is parsed, and an async variant (eg. banditAsync) built on
+asyncio subprocesses, use runAsync to run several of these at once. bandit runs
+through its python api instead of a subprocess when it can be imported
+
 Functions return finding dictionary
 
 ```json
@@ -23,26 +29,64 @@ Functions return finding dictionary
 """
 from __future__ import annotations
 
+import asyncio
+import codecs
+import logging
 import platform
 import subprocess
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from heapq import heappop, heappush
 from json import loads
-from os import remove
+from os import cpu_count, getcwd
+from os.path import abspath, getsize, isfile, join
 from pathlib import Path
-from typing import Any
+from typing import Any, Awaitable, Callable, Iterable, Iterator
 
+from simplesecurity import profiling
+from simplesecurity.cache import FindingsCache, fileHash
+from simplesecurity.evidence import addEvidence
+from simplesecurity.evidence import extractEvidence  # pylint: disable=unused-import
 from simplesecurity.excluded import EXCLUDED
+from simplesecurity.jsonstream import JsonStream
 from simplesecurity.level import Level
-from simplesecurity.types import Finding, Line
+from simplesecurity.rules import RULES
+from simplesecurity.secretscan import scanFiles
+from simplesecurity.tools import findTool, requireTool, toolVersion
+from simplesecurity.types import Finding, compactFinding
+from simplesecurity.walker import listFiles, normalisePath, reportPath
 
 THISDIR = str(Path(__file__).resolve().parent)
+SEMGREP_RULES = f"{THISDIR}/semgrep_sec.yaml"
+# Keep well below the ~32k character command line limit on windows (and the
+# larger limit elsewhere) when passing files to a tool
+MAX_ARGS_LENGTH = 16000 if platform.system() == "Windows" else 1 << 17
+# Bytes to read from a tool's output at a time
+CHUNK_SIZE = 1 << 16
+# Don't start another tool process for less than this many bytes of source
+SHARD_MIN_BYTES = 1 << 18
+# Run bandit through its python api (or python -m bandit for sharded scans) when
+# it can be imported (False to always run the executable on the path)
+BANDIT_IN_PROCESS = True
+# Held while bandit runs in process. bandit is cpu bound, so a second scan at the
+# same time (eg. several projects) runs a process rather than wait for the GIL
+_BANDIT_RUNNING = threading.Lock()
 
 
-def _doSysExec(command: str, errorAsOut: bool = True) -> tuple[int, str]:
+def _doSysExec(
+	command: str | list[str], errorAsOut: bool = True, cwd: str | None = None
+) -> tuple[int, str]:
 	"""Execute a command and check for errors.
 
 	Args:
-			command (str): commands as a string
+			command (str | list[str]): commands as a string (run through the shell)
+			or as a list of arguments (run without a shell)
 			errorAsOut (bool, optional): redirect errors to stdout
+			cwd (str, optional): directory to run the command in. Defaults to None
+			(the current directory)
 
 	Raises:
 			RuntimeWarning: throw a warning should there be a non exit code
@@ -50,96 +94,583 @@ def _doSysExec(command: str, errorAsOut: bool = True) -> tuple[int, str]:
 	Returns:
 			tuple[int, str]: tuple of return code (int) and stdout (str)
 	"""
-	with subprocess.Popen(
-		command,
-		shell=True,
-		stdout=subprocess.PIPE,
-		stderr=subprocess.STDOUT if errorAsOut else subprocess.PIPE,
-		encoding="utf-8",
-		errors="ignore",
-	) as process:
-		out = process.communicate()[0]
-		exitCode = process.returncode
+	try:
+		with subprocess.Popen(
+			command,
+			shell=isinstance(command, str),
+			stdout=subprocess.PIPE,
+			stderr=subprocess.STDOUT if errorAsOut else subprocess.PIPE,
+			encoding="utf-8",
+			errors="ignore",
+			cwd=cwd,
+		) as process:
+			out = process.communicate()[0]
+			exitCode = process.returncode
+	except FileNotFoundError:
+		# Mirror the shell's 'command not found' exit code
+		return 127, ""
 	return exitCode, out
 
 
-def extractEvidence(desiredLine: int, file: str) -> list[Line]:
-	"""Grab evidence from the source file.
+async def _doSysExecAsync(
+	command: list[str],
+	errorAsOut: bool = True,
+	timeout: float | None = None,
+	cwd: str | None = None,
+) -> tuple[int, str]:
+	"""Execute a command without a shell and without blocking the event loop.
 
 	Args:
-		desiredLine (int): line to highlight
-		file (str): file to extract evidence from
+			command (list[str]): command as a list of arguments
+			errorAsOut (bool, optional): redirect errors to stdout
+			timeout (float, optional): seconds to wait for the command. Defaults to None
+			(no limit)
+			cwd (str, optional): directory to run the command in. Defaults to None
+			(the current directory)
+
+	Raises:
+			RuntimeError: if the command does not finish within the timeout
 
 	Returns:
-		list[Line]: list of lines
+			tuple[int, str]: tuple of return code (int) and stdout (str)
 	"""
-	with open(file, encoding="utf-8", errors="ignore") as fileContents:
-		start = max(desiredLine - 3, 0)
-		content = []
+	try:
+		process = await asyncio.create_subprocess_exec(
+			*command,
+			stdout=asyncio.subprocess.PIPE,
+			stderr=asyncio.subprocess.STDOUT if errorAsOut else asyncio.subprocess.PIPE,
+			cwd=cwd,
+		)
+	except FileNotFoundError:
+		return 127, ""
+	try:
+		out = (await asyncio.wait_for(process.communicate(), timeout))[0]
+	except asyncio.TimeoutError:
+		process.kill()
+		await process.wait()
+		raise RuntimeError(f"{command[0]} did not finish within {timeout}s") from None
+	except asyncio.CancelledError:
+		process.kill()
+		await process.wait()
+		raise
+	return process.returncode or 0, out.decode("utf-8", errors="ignore")
+
+
+def _iterFindings(
+	command: list[str], stream: JsonStream, toFinding: Callable[[str, Any], Finding]
+) -> Iterator[Finding]:
+	"""Run a tool and turn each result in its json output into a finding as it
+	is read, without holding the whole output in memory.
+
+	Args:
+		command (list[str]): command as a list of arguments
+		stream (JsonStream): parser selecting the results from the output
+		toFinding (Callable[[str, Any], Finding]): convert (key, result) to a finding
+
+	Raises:
+		RuntimeError: if the tool cannot be run or does not output valid json
+
+	Yields:
+		Finding: findings, with evidence
+	"""
+	with tempfile.TemporaryFile() as stderr:
 		try:
-			for line in range(start):
-				next(fileContents)
-			for line in range(start + 1, desiredLine + 3):
-				lineContent = next(fileContents).rstrip().replace("\t", "    ")
-				content.append(
-					{"selected": line == desiredLine, "line": line, "content": lineContent}
-				)
-		except StopIteration:
-			pass
-	return content
+			process = subprocess.Popen(  # pylint: disable=consider-using-with
+				command,
+				stdout=subprocess.PIPE,
+				stderr=stderr,
+				encoding="utf-8",
+				errors="ignore",
+			)
+		except FileNotFoundError:
+			raise RuntimeError(f"{command[0]} is not on the system path") from None
+		with process:
+			assert process.stdout is not None
+			tool = Path(command[0]).name
+			try:
+				while True:
+					with profiling.phase(f"tool.{tool}"):
+						chunk = process.stdout.read(CHUNK_SIZE)
+					with profiling.phase(f"parse.{tool}"):
+						found = [
+							toFinding(*item) for item in (stream.feed(chunk) if chunk else stream.close())
+						]
+					yield from addEvidence(found)
+					if not chunk:
+						break
+			except ValueError as e:
+				process.kill()
+				stderr.seek(0)
+				error = stderr.read().decode("utf-8", errors="ignore").strip()
+				raise RuntimeError(f"{command[0]} failed: {error or e}") from None
+			except GeneratorExit:
+				# The consumer stopped early so don't wait for the tool to finish
+				process.kill()
+				raise
+
+
+async def _streamFindingsAsync(
+	command: list[str],
+	stream: JsonStream,
+	toFinding: Callable[[str, Any], Finding],
+	timeout: float | None = None,
+) -> list[Finding]:
+	"""Async variant of _iterFindings.
+
+	Args:
+		command (list[str]): command as a list of arguments
+		stream (JsonStream): parser selecting the results from the output
+		toFinding (Callable[[str, Any], Finding]): convert (key, result) to a finding
+		timeout (float, optional): seconds to allow the tool. Defaults to None
+		(no limit)
+
+	Raises:
+		RuntimeError: if the tool cannot be run, does not output valid json or
+		does not finish within the timeout
+
+	Returns:
+		list[Finding]: findings, with evidence
+	"""
+	findings = []
+
+	async def read(process: asyncio.subprocess.Process):
+		assert process.stdout is not None
+		decoder = codecs.getincrementaldecoder("utf-8")(errors="ignore")
+		while chunk := await process.stdout.read(CHUNK_SIZE):
+			findings.extend(toFinding(*item) for item in stream.feed(decoder.decode(chunk)))
+		findings.extend(toFinding(*item) for item in stream.feed(decoder.decode(b"", True)))
+		findings.extend(toFinding(*item) for item in stream.close())
+		await process.wait()
+
+	with tempfile.TemporaryFile() as stderr:
+		try:
+			process = await asyncio.create_subprocess_exec(
+				*command, stdout=asyncio.subprocess.PIPE, stderr=stderr
+			)
+		except FileNotFoundError:
+			raise RuntimeError(f"{command[0]} is not on the system path") from None
+		try:
+			await asyncio.wait_for(read(process), timeout)
+		except asyncio.TimeoutError:
+			process.kill()
+			await process.wait()
+			raise RuntimeError(f"{command[0]} did not finish within {timeout}s") from None
+		except asyncio.CancelledError:
+			process.kill()
+			await process.wait()
+			raise
+		except ValueError as e:
+			process.kill()
+			await process.wait()
+			stderr.seek(0)
+			error = stderr.read().decode("utf-8", errors="ignore").strip()
+			raise RuntimeError(f"{command[0]} failed: {error or e}") from None
+	return addEvidence(findings)
+
+
+def _targetChunks(scanDir: str, files: list[str] | None) -> list[list[str]]:
+	"""Split the files to scan into batches that fit on a command line.
+
+	Args:
+		scanDir (str): directory to scan if files is None
+		files (list[str] | None): files to scan
+
+	Returns:
+		list[list[str]]: list of targets for each tool invocation
+	"""
+	if files is None:
+		return [[scanDir]]
+	chunks: list[list[str]] = []
+	chunk: list[str] = []
+	size = 0
+	for file in files:
+		if chunk and size + len(file) > MAX_ARGS_LENGTH:
+			chunks.append(chunk)
+			chunk, size = [], 0
+		chunk.append(file)
+		size += len(file) + 1
+	if chunk:
+		chunks.append(chunk)
+	return chunks
+
+
+def _shardFiles(
+	scanDir: str, files: list[str] | None, shards: int | None = None
+) -> list[list[str] | None]:
+	"""Split the python files to scan into shards of similar total size, so that
+	each shard can be scanned by its own tool process.
+
+	Args:
+		scanDir (str): directory to scan if files is None
+		files (list[str] | None): files to scan
+		shards (int | None, optional): maximum number of shards. Defaults to None
+		(the number of cpus)
+
+	Returns:
+		list[list[str] | None]: files for each shard. This is [files] if the scan
+		is too small to be worth splitting
+	"""
+	maxShards = shards or cpu_count() or 1
+	if maxShards <= 1:
+		return [files]
+	allFiles = listFiles(scanDir, ("*.py",)) if files is None else files
+	sizes = []
+	for file in allFiles:
+		try:
+			sizes.append(getsize(file))
+		except OSError:
+			sizes.append(0)
+	count = min(maxShards, len(allFiles), -(-sum(sizes) // SHARD_MIN_BYTES))
+	if count <= 1:
+		return [files]
+	# Largest first, each into the shard with the fewest bytes so far
+	heap = [(0, index) for index in range(count)]
+	buckets: list[list[str]] = [[] for _ in range(count)]
+	for size, file in sorted(zip(sizes, allFiles), reverse=True):
+		load, index = heappop(heap)
+		buckets[index].append(file)
+		heappush(heap, (load + size, index))
+	return [sorted(bucket) for bucket in buckets]
+
+
+def _iterSharded(
+	shards: list[list[str] | None], run: Callable[[list[str] | None], Iterable[Finding]]
+) -> Iterator[Finding]:
+	"""Run each shard in its own thread (each running its own tool process) and
+	merge the findings in shard order.
+
+	Args:
+		shards (list[list[str] | None]): files for each shard, from _shardFiles
+		run (Callable[[list[str] | None], Iterable[Finding]]): scan some files
+
+	Yields:
+		Finding: findings from each shard
+	"""
+	if len(shards) == 1:
+		yield from run(shards[0])
+		return
+	with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+		for findings in executor.map(lambda files: list(run(files)), shards):
+			yield from findings
+
+
+def _onlyFiles(findings: Iterable[Finding], files: list[str] | None) -> Iterator[Finding]:
+	"""Drop findings from files that are not in files (for tools that can only
+	scan a whole directory).
+	"""
+	normFiles = None if files is None else {normalisePath(file) for file in files}
+	for finding in findings:
+		if normFiles is None or normalisePath(finding["file"]) in normFiles:
+			yield finding
+
+
+def _banditIni(scanDir: str) -> str | None:
+	"""Get the project's .bandit file, which bandit's cli only finds by itself
+	when it is given the directory rather than a list of files.
+
+	Args:
+		scanDir (str): scan directory
+
+	Returns:
+		str | None: path to scanDir/.bandit, or None if there is not one
+	"""
+	path = join(scanDir, ".bandit")
+	return path if isfile(path) else None
+
+
+def _banditCommand(executable: list[str], targets: list[str], ini: str | None) -> list[str]:
+	return [
+		*executable,
+		*([] if ini is None else ["--ini", ini]),
+		"-lirq",
+		"-x",
+		",".join([f"./{x}" for x in EXCLUDED]),
+		"-f",
+		"json",
+		*targets,
+	]
+
+
+BANDIT_LEVELS = {
+	"LOW": Level.LOW,
+	"MEDIUM": Level.MED,
+	"HIGH": Level.HIGH,
+	"UNDEFINED": Level.UNKNOWN,
+}
+
+
+def _banditDescription(testName: str) -> str:
+	"""Describe a bandit test by its name (the issue text can quote the code, eg.
+	a hardcoded password, so it is not used for the rule).
+	"""
+	return str(testName).replace("_", " ").capitalize()
+
+
+def _banditFinding(_key: str, result: dict[str, Any]) -> Finding:
+	file = reportPath(result.get("filename"))
+	resultId = result.get("test_id")
+	rule = RULES.add(
+		resultId,
+		f"{resultId}: {result.get('test_name')}",
+		_banditDescription(result.get("test_name")),
+		result.get("more_info"),
+	)
+	return compactFinding(
+		{
+			"id": resultId,
+			"title": rule.title,
+			"description": result.get("issue_text"),
+			"file": file,
+			"evidence": [],
+			"severity": BANDIT_LEVELS[result.get("issue_severity")],
+			"confidence": BANDIT_LEVELS[result.get("issue_confidence")],
+			"line": result.get("line_number"),
+			"_other": {
+				"more_info": rule.moreInfo,
+				"line_range": result.get("line_range"),
+			},
+		}
+	)
+
+
+@lru_cache(maxsize=None)
+def _banditApi() -> tuple[Any, Any, Any] | None:
+	"""Import bandit's python api (only when bandit is first run, as this loads
+	all of its plugins).
+
+	Returns:
+		tuple[Any, Any, Any] | None: bandit.core config, docs_utils and manager
+		modules, or None if bandit cannot be imported
+	"""
+	try:
+		# pylint: disable=import-outside-toplevel
+		from bandit.core import config, docs_utils, manager
+	except ImportError:
+		return None
+	# Warnings went to the stderr of the bandit process, don't print them here
+	# unless the application has configured logging
+	logging.getLogger("bandit").addHandler(logging.NullHandler())
+	return config, docs_utils, manager
+
+
+def _banditIssueFinding(issue: Any, docsUtils: Any) -> Finding:
+	rule = RULES.get(issue.test_id) or RULES.add(
+		issue.test_id,
+		f"{issue.test_id}: {issue.test}",
+		_banditDescription(issue.test),
+		docsUtils.get_url(issue.test_id),
+	)
+	return compactFinding(
+		{
+			"id": issue.test_id,
+			"title": rule.title,
+			"description": issue.text,
+			"file": reportPath(issue.fname),
+			"evidence": [],
+			"severity": BANDIT_LEVELS[issue.severity],
+			"confidence": BANDIT_LEVELS[issue.confidence],
+			"line": issue.lineno,
+			"_other": {
+				"more_info": rule.moreInfo,
+				"line_range": issue.linerange,
+			},
+		}
+	)
+
+
+def _iterBanditInProcess(api: tuple[Any, Any, Any], targets: list[str]) -> Iterator[Finding]:
+	"""Run bandit's manager in this process, with the same options as
+	_banditCommand, and turn its issues into findings.
+
+	Args:
+		api (tuple[Any, Any, Any]): modules from _banditApi
+		targets (list[str]): files and directories to scan
+
+	Yields:
+		Finding: findings, with evidence
+	"""
+	config, docsUtils, manager = api
+	banditManager = manager.BanditManager(config.BanditConfig(), "file", quiet=True)
+	with profiling.phase("tool.bandit"):
+		banditManager.discover_files(
+			targets, recursive=True, excluded_paths=",".join([f"./{x}" for x in EXCLUDED])
+		)
+		banditManager.run_tests()
+	with profiling.phase("parse.bandit"):
+		found = [_banditIssueFinding(x, docsUtils) for x in banditManager.get_issue_list()]
+	yield from addEvidence(found)
+
+
+def _banditExecutable() -> list[str]:
+	"""Get the command to run bandit as a process. This is the bandit that runs
+	in process if it can be imported (so every scan runs the same version, and
+	the executable is not needed), otherwise the executable on the path.
+
+	Raises:
+		RuntimeError: if bandit cannot be imported and is not on the system path
 
+	Returns:
+		list[str]: command to run bandit
+	"""
+	if BANDIT_IN_PROCESS and _banditApi() is not None:
+		return [sys.executable, "-m", "bandit"]
+	return [requireTool("bandit")]
+
+
+def _banditVersion() -> str | None:
+	"""Get the version of bandit when it runs from this python (as
+	_banditExecutable), or None if it runs the executable on the path.
+	"""
+	if not BANDIT_IN_PROCESS or _banditApi() is None:
+		return None
+	import bandit  # pylint: disable=import-outside-toplevel
+
+	return f"bandit {bandit.__version__}"
 
-def bandit(scanDir=".") -> list[Finding]:
-	"""Generate list of findings using bandit. requires bandit on the system path.
+
+def _banditInProcess(
+	fileShards: list[list[str] | None], ini: str | None
+) -> tuple[Any, Any, Any] | None:
+	"""Get bandit's api if this scan should run in process, holding
+	_BANDIT_RUNNING (release it when the scan finishes).
+
+	Scans big enough to be sharded still run a bandit process per shard, as
+	bandit is cpu bound and threads in this process would take turns. So do
+	projects with a .bandit file (read by the cli), and scans started while bandit
+	is already running in process.
+	"""
+	if not BANDIT_IN_PROCESS or len(fileShards) != 1:
+		return None
+	api = _banditApi()
+	if api is None or ini is not None or not _BANDIT_RUNNING.acquire(blocking=False):
+		return None
+	return api
+
+
+def iterBandit(
+	scanDir=".", files: list[str] | None = None, shards: int | None = None
+) -> Iterator[Finding]:
+	"""Generate findings using bandit as they are found. bandit runs in process
+	if it can be imported, otherwise this requires bandit on the system path.
 
 	Params:
 		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+		shards(int): maximum number of tool processes to split the files between.
+		Defaults to None (the number of cpus)
 
 	Raises:
-		RuntimeError: if bandit is not on the system path, then throw this
-		error
+		RuntimeError: if bandit cannot be imported and is not on the system
+		path, then throw this error
+
+	Yields:
+		Finding: findings as they are parsed from the tool output
+	"""
+	fileShards = _shardFiles(scanDir, files, shards)
+	targets = [scanDir] if files is None else files
+	ini = _banditIni(scanDir)
+	api = _banditInProcess(fileShards, ini)
+	if api is not None:
+		try:
+			yield from _iterBanditInProcess(api, targets)
+		finally:
+			_BANDIT_RUNNING.release()
+		return
+	executable = _banditExecutable()
+
+	def run(shardFiles: list[str] | None) -> Iterator[Finding]:
+		for targets in _targetChunks(scanDir, shardFiles):
+			command = _banditCommand(executable, targets, ini)
+			yield from _iterFindings(command, JsonStream({"results"}), _banditFinding)
+
+	yield from _iterSharded(fileShards, run)
+
+
+def bandit(
+	scanDir=".", files: list[str] | None = None, shards: int | None = None
+) -> list[Finding]:
+	"""Generate list of findings using bandit. bandit runs in process if it can be
+	imported, otherwise this requires bandit on the system path.
+
+	Params:
+		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+		shards(int): maximum number of tool processes to split the files between.
+		Defaults to None (the number of cpus)
+
+	Raises:
+		RuntimeError: if bandit cannot be imported and is not on the system
+		path, then throw this error
 
 	Returns:
 		list[Finding]: our findings dictionary
 	"""
-	if _doSysExec("bandit -h")[0] != 0:
-		raise RuntimeError("bandit is not on the system path")
-	findings = []
-	levelMap = {
-		"LOW": Level.LOW,
-		"MEDIUM": Level.MED,
-		"HIGH": Level.HIGH,
-		"UNDEFINED": Level.UNKNOWN,
-	}
-	results = loads(
-		_doSysExec(
-			f"bandit -lirq -x {','.join([f'./{x}' for x in EXCLUDED])} -f json {scanDir}", False
-		)[1]
-	)["results"]
-	for result in results:
-		file = result.get("filename").replace("\\", "/")
-		resultId = result.get("test_id")
-		line = result.get("line_number")
-		findings.append(
-			{
-				"id": resultId,
-				"title": f"{resultId}: {result.get('test_name')}",
-				"description": result.get("issue_text"),
-				"file": file,
-				"evidence": extractEvidence(line, file),
-				"severity": levelMap[result.get("issue_severity")],
-				"confidence": levelMap[result.get("issue_confidence")],
-				"line": line,
-				"_other": {
-					"more_info": result.get("more_info"),
-					"line_range": result.get("line_range"),
-				},
-			}
-		)
-	return findings
+	return list(iterBandit(scanDir, files, shards))
+
+
+async def banditAsync(
+	scanDir=".",
+	files: list[str] | None = None,
+	timeout: float | None = None,
+	shards: int | None = None,
+) -> list[Finding]:
+	"""Async variant of bandit. Generate list of findings using bandit.
+
+	Params:
+		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+		timeout(float): seconds to allow each bandit process. Defaults to None
+		shards(int): maximum number of tool processes to split the files between.
+		Defaults to None (the number of cpus)
+
+	Raises:
+		RuntimeError: if bandit cannot be imported and is not on the system
+		path, then throw this error
+
+	Returns:
+		list[Finding]: our findings dictionary
+	"""
+	fileShards = _shardFiles(scanDir, files, shards)
+	targets = [scanDir] if files is None else files
+	ini = _banditIni(scanDir)
+	api = _banditInProcess(fileShards, ini)
+	if api is not None:
+
+		def runInProcess() -> list[Finding]:
+			try:
+				return list(_iterBanditInProcess(api, targets))
+			finally:
+				_BANDIT_RUNNING.release()
+
+		loop = asyncio.get_running_loop()
+		try:
+			return await asyncio.wait_for(loop.run_in_executor(None, runInProcess), timeout)
+		except asyncio.TimeoutError:
+			raise RuntimeError(f"bandit did not finish within {timeout}s") from None
+	executable = _banditExecutable()
+
+	async def run(shardFiles: list[str] | None) -> list[Finding]:
+		findings = []
+		for targets in _targetChunks(scanDir, shardFiles):
+			command = _banditCommand(executable, targets, ini)
+			stream = JsonStream({"results"})
+			findings.extend(await _streamFindingsAsync(command, stream, _banditFinding, timeout))
+		return findings
+
+	results = await asyncio.gather(*(run(x) for x in fileShards))
+	return [finding for findings in results for finding in findings]
 
 
-def _doSafetyProcessing(results: dict[str, Any]) -> list[Finding]:
+def _requirementsFile(scanDir: str) -> str:
+	"""Get the name safety findings are reported against for a scan directory."""
+	scanDir = normalisePath(scanDir)
+	return "Project Requirements" if scanDir == "." else f"Project Requirements ({scanDir})"
+
+
+def _doSafetyProcessing(results: dict[str, Any], scanDir: str = ".") -> list[Finding]:
 	findings = []
 	for result in results["vulnerabilities"]:
 		vulnerabilityId = result.get("vulnerability_id")
@@ -164,42 +695,135 @@ def _doSafetyProcessing(results: dict[str, Any]) -> list[Finding]:
 		if cvssv3Score > 8.9:
 			severity = Level.CRIT
 
+		rule = RULES.add(
+			vulnerabilityId, f"{vulnerabilityId}: {packageName}", description, moreInfo
+		)
 		findings.append(
-			{
-				"id": vulnerabilityId,
-				"title": f"{vulnerabilityId}: {packageName}",
-				"description": description,
-				"file": "Project Requirements",
-				"evidence": [
-					{
-						"selected": True,
-						"line": 0,
-						"content": content,
-					}
-				],
-				"severity": severity,
-				"confidence": Level.HIGH,
-				"line": "Unknown",
-				"_other": {"id": vulnerabilityId, "affectedVersions": affectedVersions},
-			}
+			compactFinding(
+				{
+					"id": vulnerabilityId,
+					"title": rule.title,
+					"description": description,
+					"file": _requirementsFile(scanDir),
+					"evidence": [
+						{
+							"selected": True,
+							"line": 0,
+							"content": content,
+						}
+					],
+					"severity": severity,
+					"confidence": Level.HIGH,
+					"line": "Unknown",
+					"_other": {"id": vulnerabilityId, "affectedVersions": affectedVersions},
+				}
+			)
 		)
 	return findings
 
 
-def _doPureSafety() -> dict[str, Any]:
-	safe = _doSysExec("safety check -r requirements.txt --json")[1]
+def _poetryShowToRequirements(output: str) -> str:
+	data = []
+	for line in output.splitlines(False):
+		parts = line.replace("(!)", "").split()
+		if len(parts) > 1:
+			data.append(f"{parts[0]}=={parts[1]}")
+		else:
+			data.append(f"{parts[0]}")
+	return "\n".join(data)
+
+
+def _doPureSafety(executable: str, scanDir: str = ".") -> dict[str, Any]:
+	safe = _doSysExec([executable, "check", "-r", "requirements.txt", "--json"], cwd=scanDir)[1]
 	if safe.startswith("Warning:"):
-		safe = _doSysExec("safety check --json")[1]
+		safe = _doSysExec([executable, "check", "--json"], cwd=scanDir)[1]
 		if safe.startswith("Warning:"):
 			raise RuntimeError("some error occurred: " + safe)
 	return loads(safe)
 
 
-def safety(scanDir=".") -> list[Finding]:
+async def _doPureSafetyAsync(
+	executable: str, timeout: float | None = None, scanDir: str = "."
+) -> dict[str, Any]:
+	safe = (
+		await _doSysExecAsync(
+			[executable, "check", "-r", "requirements.txt", "--json"], timeout=timeout, cwd=scanDir
+		)
+	)[1]
+	if safe.startswith("Warning:"):
+		safe = (
+			await _doSysExecAsync([executable, "check", "--json"], timeout=timeout, cwd=scanDir)
+		)[1]
+		if safe.startswith("Warning:"):
+			raise RuntimeError("some error occurred: " + safe)
+	return loads(safe)
+
+
+def iterSafety(scanDir=".", files: list[str] | None = None) -> Iterator[Finding]:
+	"""Generate findings using safety. requires safety on the system path.
+
+	Params:
+		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+
+	Raises:
+		RuntimeError: if safety is not on the system path, then throw this
+		error
+
+	Yields:
+		Finding: findings as they are parsed from the tool output
+	"""
+	_ = files
+	executable = requireTool("safety")
+	poetry, pipreqs = findTool("poetry"), findTool("pipreqs")
+	# Write the requirements outside the project so scans of several projects
+	# at once don't overwrite each other's
+	with tempfile.TemporaryDirectory() as tmp:
+		reqsFile = str(Path(tmp) / "reqs.txt")
+		reqsCommand = [executable, "check", "-r", reqsFile, "--json"]
+		pShow = _doSysExec([poetry, "show"], cwd=scanDir) if poetry else (1, "")
+		pipreqsCommand = [pipreqs or "pipreqs", "--savepath", reqsFile, "--encoding", "utf-8"]
+		if not pShow[0]:
+			with open(reqsFile, "w", encoding="utf-8", errors="ignore") as reqs:
+				reqs.write(_poetryShowToRequirements(pShow[1]))
+			results = loads(_doSysExec(reqsCommand, cwd=scanDir)[1])
+		elif pipreqs and not _doSysExec(pipreqsCommand, cwd=scanDir)[0]:
+			results = loads(_doSysExec(reqsCommand, cwd=scanDir)[1])
+		else:
+			# Use plain old safety (this will miss optional dependencies)
+			results = _doPureSafety(executable, scanDir)
+	yield from _doSafetyProcessing(results, scanDir)
+
+
+def safety(scanDir=".", files: list[str] | None = None) -> list[Finding]:
 	"""Generate list of findings using _tool_. requires _tool_ on the system path.
 
 	Params:
 		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+
+	Raises:
+		RuntimeError: if safety is not on the system path, then throw this
+		error
+
+	Returns:
+		list[Finding]: our findings dictionary
+	"""
+	return list(iterSafety(scanDir, files))
+
+
+async def safetyAsync(
+	scanDir=".", files: list[str] | None = None, timeout: float | None = None
+) -> list[Finding]:
+	"""Async variant of safety. Generate list of findings using safety.
+
+	Params:
+		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+		timeout(float): seconds to allow each safety process. Defaults to None
 
 	Raises:
 		RuntimeError: if safety is not on the system path, then throw this
@@ -208,37 +832,85 @@ def safety(scanDir=".") -> list[Finding]:
 	Returns:
 		list[Finding]: our findings dictionary
 	"""
-	_ = scanDir
-	if _doSysExec("safety --help")[0] != 0:
-		raise RuntimeError("safety is not on the system path")
-	pShow = _doSysExec("poetry show")
-	if not pShow[0]:
-		lines = pShow[1].splitlines(False)
-		data = []
-		for line in lines:
-			parts = line.replace("(!)", "").split()
-			if len(parts) > 1:
-				data.append(f"{parts[0]}=={parts[1]}")
-			else:
-				data.append(f"{parts[0]}")
-		with open("reqs.txt", "w", encoding="utf-8", errors="ignore") as reqs:
-			reqs.write("\n".join(data))
-		results = loads(_doSysExec("safety check -r reqs.txt --json")[1])
-		remove("reqs.txt")
-	elif not _doSysExec("pipreqs --savepath reqs.txt --encoding utf-8")[0]:
-		results = loads(_doSysExec("safety check -r reqs.txt --json")[1])
-		remove("reqs.txt")
-	else:
-		# Use plain old safety (this will miss optional dependencies)
-		results = _doPureSafety()
-	return _doSafetyProcessing(results)
-
-
-def dodgy(scanDir=".") -> list[Finding]:
+	_ = files
+	executable = requireTool("safety")
+	poetry, pipreqs = findTool("poetry"), findTool("pipreqs")
+	with tempfile.TemporaryDirectory() as tmp:
+		reqsFile = str(Path(tmp) / "reqs.txt")
+		reqsCommand = [executable, "check", "-r", reqsFile, "--json"]
+		pShow = (
+			await _doSysExecAsync([poetry, "show"], timeout=timeout, cwd=scanDir)
+			if poetry
+			else (1, "")
+		)
+		pipreqsCommand = [pipreqs or "pipreqs", "--savepath", reqsFile, "--encoding", "utf-8"]
+		if not pShow[0]:
+			with open(reqsFile, "w", encoding="utf-8", errors="ignore") as reqs:
+				reqs.write(_poetryShowToRequirements(pShow[1]))
+			results = loads((await _doSysExecAsync(reqsCommand, timeout=timeout, cwd=scanDir))[1])
+		elif pipreqs and not (
+			await _doSysExecAsync(pipreqsCommand, timeout=timeout, cwd=scanDir)
+		)[0]:
+			results = loads((await _doSysExecAsync(reqsCommand, timeout=timeout, cwd=scanDir))[1])
+		else:
+			# Use plain old safety (this will miss optional dependencies)
+			results = await _doPureSafetyAsync(executable, timeout, scanDir)
+	return _doSafetyProcessing(results, scanDir)
+
+
+def _dodgyCommand(executable: str, scanDir: str) -> list[str]:
+	return [executable, scanDir, "-i", *EXCLUDED]
+
+
+def _dodgyFinding(_key: str, result: dict[str, Any]) -> Finding:
+	file = reportPath(result.get("path"))
+	message = result.get("message")
+	rule = RULES.add(result.get("code"), message, message)
+	return compactFinding(
+		{
+			"id": rule.id,
+			"title": rule.title,
+			"description": message,
+			"file": file,
+			"evidence": [],
+			"severity": Level.MED,
+			"confidence": Level.MED,
+			"line": result.get("line"),
+			"_other": {},
+		}
+	)
+
+
+def iterDodgy(scanDir=".", files: list[str] | None = None) -> Iterator[Finding]:
+	"""Generate findings using dodgy as they are found. requires dodgy on the
+	system path.
+
+	Params:
+		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+
+	Raises:
+		RuntimeError: if dodgy is not on the system path, then throw this
+		error
+
+	Yields:
+		Finding: findings as they are parsed from the tool output
+	"""
+	executable = requireTool("dodgy")
+	if files is not None and len(files) == 0:
+		return
+	command = _dodgyCommand(executable, scanDir)
+	yield from _onlyFiles(_iterFindings(command, JsonStream({"warnings"}), _dodgyFinding), files)
+
+
+def dodgy(scanDir=".", files: list[str] | None = None) -> list[Finding]:
 	"""Generate list of findings using _tool_. requires _tool_ on the system path.
 
 	Params:
 		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
 
 	Raises:
 		RuntimeError: if dodgy is not on the system path, then throw this
@@ -247,35 +919,192 @@ def dodgy(scanDir=".") -> list[Finding]:
 	Returns:
 		list[Finding]: our findings dictionary
 	"""
-	if _doSysExec("dodgy -h")[0] != 0:
-		raise RuntimeError("dodgy is not on the system path")
-	findings = []
-	rawResults = _doSysExec(f"dodgy {scanDir} -i {' '.join(EXCLUDED)}")[1]
-	results = loads(rawResults)["warnings"]
-	for result in results:
-		file = "./" + result.get("path").replace("\\", "/")
-		message = result.get("message")
-		findings.append(
-			{
-				"id": result.get("code"),
-				"title": message,
-				"description": message,
-				"file": file,
-				"evidence": extractEvidence(result.get("line"), file),
-				"severity": Level.MED,
-				"confidence": Level.MED,
-				"line": result.get("line"),
-				"_other": {},
-			}
+	return list(iterDodgy(scanDir, files))
+
+
+async def dodgyAsync(
+	scanDir=".", files: list[str] | None = None, timeout: float | None = None
+) -> list[Finding]:
+	"""Async variant of dodgy. Generate list of findings using dodgy.
+
+	Params:
+		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+		timeout(float): seconds to allow each dodgy process. Defaults to None
+
+	Raises:
+		RuntimeError: if dodgy is not on the system path, then throw this
+		error
+
+	Returns:
+		list[Finding]: our findings dictionary
+	"""
+	command = _dodgyCommand(requireTool("dodgy"), scanDir)
+	if files is not None and len(files) == 0:
+		return []
+	stream = JsonStream({"warnings"})
+	return list(
+		_onlyFiles(await _streamFindingsAsync(command, stream, _dodgyFinding, timeout), files)
+	)
+
+
+def iterSecrets(scanDir=".", files: list[str] | None = None) -> Iterator[Finding]:
+	"""Generate findings for secrets and other dodgy looking values as they are
+	found. This runs dodgy's checks in process so needs no executable.
+
+	Params:
+		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+
+	Yields:
+		Finding: findings for each file, with evidence
+	"""
+	for file, results in scanFiles(scanDir, files):
+		yield from addEvidence(
+			[
+				compactFinding(
+					{
+						"id": code,
+						"title": RULES.add(code, message, message).title,
+						"description": message,
+						"file": reportPath(file),
+						"evidence": [],
+						"severity": severity,
+						"confidence": Level.MED,
+						"line": line,
+						"_other": {},
+					}
+				)
+				for line, code, message, severity in results
+			]
 		)
-	return findings
 
 
-def dlint(scanDir=".") -> list[Finding]:
+def secrets(scanDir=".", files: list[str] | None = None) -> list[Finding]:
+	"""Generate list of findings for secrets and other dodgy looking values.
+
+	Params:
+		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+
+	Returns:
+		list[Finding]: our findings dictionary
+	"""
+	return list(iterSecrets(scanDir, files))
+
+
+async def secretsAsync(
+	scanDir=".", files: list[str] | None = None, timeout: float | None = None
+) -> list[Finding]:
+	"""Async variant of secrets, run in a worker thread.
+
+	Params:
+		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+		timeout(float): seconds to allow the scan. Defaults to None
+
+	Raises:
+		RuntimeError: if the scan does not finish within the timeout
+
+	Returns:
+		list[Finding]: our findings dictionary
+	"""
+	loop = asyncio.get_running_loop()
+	try:
+		return await asyncio.wait_for(loop.run_in_executor(None, secrets, scanDir, files), timeout)
+	except asyncio.TimeoutError:
+		raise RuntimeError(f"secrets did not finish within {timeout}s") from None
+
+
+def _dlintCommand(executable: str, targets: list[str]) -> list[str]:
+	return [
+		executable,
+		"--select=DUO",
+		"--exclude",
+		",".join(EXCLUDED),
+		"--format=codeclimate",
+		*targets,
+	]
+
+
+DLINT_LEVELS = {
+	"info": Level.LOW,
+	"minor": Level.MED,
+	"major": Level.MED,
+	"critical": Level.CRIT,
+	"blocker": Level.CRIT,
+}
+
+
+def _dlintFinding(filePath: str, result: dict[str, Any]) -> Finding:
+	message = f"{result.get('check_name')}: " f"{result.get('description')}"
+	positions = result.get("location", {}).get("positions", {})
+	line = positions.get("begin", {}).get("line", 0)
+	rule = RULES.add(result.get("check_name"), message, message)
+	return compactFinding(
+		{
+			"id": rule.id,
+			"title": rule.title,
+			"description": message,
+			"file": reportPath(filePath),
+			"evidence": [],
+			"severity": DLINT_LEVELS[result.get("severity")],
+			"confidence": Level.MED,
+			"line": line,
+			"_other": {
+				"start": line,
+				"end": positions.get("end", {}).get("line", 0),
+				"fingerprint": result.get("fingerprint"),
+			},
+		}
+	)
+
+
+def iterDlint(
+	scanDir=".", files: list[str] | None = None, shards: int | None = None
+) -> Iterator[Finding]:
+	"""Generate findings using flake8 and dlint as they are found. requires flake8
+	on the system path.
+
+	Params:
+		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+		shards(int): maximum number of tool processes to split the files between.
+		Defaults to None (the number of cpus)
+
+	Raises:
+		RuntimeError: if flake8 is not on the system path, then throw this
+		error
+
+	Yields:
+		Finding: findings as they are parsed from the tool output
+	"""
+	executable = requireTool("flake8")
+
+	def run(shardFiles: list[str] | None) -> Iterator[Finding]:
+		for targets in _targetChunks(scanDir, shardFiles):
+			command = _dlintCommand(executable, targets)
+			yield from _iterFindings(command, JsonStream(allowEmpty=True), _dlintFinding)
+
+	yield from _iterSharded(_shardFiles(scanDir, files, shards), run)
+
+
+def dlint(
+	scanDir=".", files: list[str] | None = None, shards: int | None = None
+) -> list[Finding]:
 	"""Generate list of findings using _tool_. requires _tool_ on the system path.
 
 	Params:
 		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+		shards(int): maximum number of tool processes to split the files between.
+		Defaults to None (the number of cpus)
 
 	Raises:
 		RuntimeError: if flake8 is not on the system path, then throw this
@@ -284,54 +1113,157 @@ def dlint(scanDir=".") -> list[Finding]:
 	Returns:
 		list[Finding]: our findings dictionary
 	"""
-	if _doSysExec("flake8 -h")[0] != 0:
-		raise RuntimeError("flake8 is not on the system path")
-	findings = []
-	results = _doSysExec(
-		f"flake8 --select=DUO --exclude {','.join(EXCLUDED)} --format=codeclimate {scanDir}"
-	)[1].splitlines(False)
-
-	jsonResults = loads("".join(results)) if len(results) > 0 else {}
-	levelMap = {
-		"info": Level.LOW,
-		"minor": Level.MED,
-		"major": Level.MED,
-		"critical": Level.CRIT,
-		"blocker": Level.CRIT,
-	}
-	for filePath, scanResults in jsonResults.items():
-		for result in scanResults:
-			message = f"{result.get('check_name')}: " f"{result.get('description')}"
-			positions = result.get("location", {}).get("positions", {})
-			line = positions.get("begin", {}).get("line", 0)
-			findings.append(
-				{
-					"id": result.get("check_name"),
-					"title": message,
-					"description": message,
-					"file": filePath,
-					"evidence": extractEvidence(
-						line,
-						filePath,
-					),
-					"severity": levelMap[result.get("severity")],
-					"confidence": Level.MED,
-					"line": line,
-					"_other": {
-						"start": line,
-						"end": positions.get("end", {}).get("line", 0),
-						"fingerprint": result.get("fingerprint"),
-					},
-				}
-			)
+	return list(iterDlint(scanDir, files, shards))
 
-	return findings
+
+async def dlintAsync(
+	scanDir=".",
+	files: list[str] | None = None,
+	timeout: float | None = None,
+	shards: int | None = None,
+) -> list[Finding]:
+	"""Async variant of dlint. Generate list of findings using flake8 and dlint.
+
+	Params:
+		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+		timeout(float): seconds to allow each flake8 process. Defaults to None
+		shards(int): maximum number of tool processes to split the files between.
+		Defaults to None (the number of cpus)
+
+	Raises:
+		RuntimeError: if flake8 is not on the system path, then throw this
+		error
+
+	Returns:
+		list[Finding]: our findings dictionary
+	"""
+	executable = requireTool("flake8")
+
+	async def run(shardFiles: list[str] | None) -> list[Finding]:
+		findings = []
+		for targets in _targetChunks(scanDir, shardFiles):
+			command = _dlintCommand(executable, targets)
+			stream = JsonStream(allowEmpty=True)
+			findings.extend(await _streamFindingsAsync(command, stream, _dlintFinding, timeout))
+		return findings
+
+	results = await asyncio.gather(*(run(x) for x in _shardFiles(scanDir, files, shards)))
+	return [finding for findings in results for finding in findings]
+
+
+def _semgrepCommand(executable: str, targets: list[str]) -> list[str]:
+	sgExclude = []
+	for x in EXCLUDED:
+		sgExclude.extend(["--exclude", x])
+	return [
+		executable,
+		"-f",
+		SEMGREP_RULES,
+		*targets,
+		*sgExclude,
+		"-q",
+		"--json",
+		"--no-rewrite-rule-ids",
+		# Skip the network requests semgrep makes on every run
+		"--metrics=off",
+		"--disable-version-check",
+	]
 
 
-def semgrep(scanDir=".") -> list[Finding]:
+SEMGREP_LEVELS = {"INFO": Level.LOW, "WARNING": Level.MED, "ERROR": Level.HIGH}
+
+
+def _semgrepFinding(_key: str, result: dict[str, Any]) -> Finding:
+	file = reportPath(result.get("path"))
+	resultId = result.get("check_id", "")
+	extras = result.get("extra", {})
+	line = result.get("start", {}).get("line", 0)
+	metadata = extras.get("metadata", {})
+	references = metadata.get("references")
+	# The message can quote the matched code, so describe the rule by its name
+	rule = RULES.add(
+		resultId,
+		resultId.split(".")[-1],
+		resultId.split(".")[-1].replace("-", " ").capitalize(),
+		references[0] if isinstance(references, list) and references else references,
+		metadata,
+	)
+	extras["metadata"] = rule.metadata
+	return compactFinding(
+		{
+			"id": resultId,
+			"title": rule.title,
+			"description": extras.get("message").strip(),
+			"file": file,
+			"evidence": [],
+			"severity": SEMGREP_LEVELS[extras.get("severity")],
+			"confidence": Level.HIGH,
+			"line": line,
+			"_other": {
+				"end": result.get("end"),
+				"extra": extras,
+			},
+		}
+	)
+
+
+def iterSemgrep(scanDir=".", files: list[str] | None = None) -> Iterator[Finding]:
+	"""Generate findings using semgrep as they are found. Requires semgrep on the
+	system path (wsl in windows).
+
+	Params:
+		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+
+	Raises:
+		RuntimeError: if semgrep is not on the system path, then throw this
+		error
+
+	Yields:
+		Finding: findings as they are parsed from the tool output
+	"""
+	if platform.system() == "Windows":
+		raise RuntimeError("semgrep is not supported on windows")
+	executable = requireTool("semgrep")
+	for targets in _targetChunks(scanDir, files):
+		command = _semgrepCommand(executable, targets)
+		yield from _iterFindings(command, JsonStream({"results"}), _semgrepFinding)
+
+
+def semgrep(scanDir=".", files: list[str] | None = None) -> list[Finding]:
 	"""Generate list of findings using for semgrep. Requires semgrep on the
 	system path (wsl in windows).
 
+	Params:
+		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+
+	Raises:
+		RuntimeError: if semgrep is not on the system path, then throw this
+		error
+
+	Returns:
+		list[Finding]: our findings dictionary
+	"""
+	return list(iterSemgrep(scanDir, files))
+
+
+async def semgrepAsync(
+	scanDir=".", files: list[str] | None = None, timeout: float | None = None
+) -> list[Finding]:
+	"""Async variant of semgrep. Generate list of findings using semgrep.
+	Requires semgrep on the system path (wsl in windows).
+
+	Params:
+		scanDir(str): select a scan directory (useful for cicd etc)
+		files(list[str]): only scan these files (within scanDir). Defaults to None
+		(scan everything in scanDir)
+		timeout(float): seconds to allow each semgrep process. Defaults to None
+
 	Raises:
 		RuntimeError: if semgrep is not on the system path, then throw this
 		error
@@ -339,39 +1271,178 @@ def semgrep(scanDir=".") -> list[Finding]:
 	Returns:
 		list[Finding]: our findings dictionary
 	"""
-	findings = []
 	if platform.system() == "Windows":
 		raise RuntimeError("semgrep is not supported on windows")
-	if _doSysExec("semgrep --help")[0] != 0:
-		raise RuntimeError("semgrep is not on the system path")
-	sgExclude = ["--exclude {x}" for x in EXCLUDED]
-	results = loads(
-		_doSysExec(
-			f"semgrep -f {THISDIR}/semgrep_sec.yaml {scanDir} {' '.join(sgExclude)} "
-			"-q --json --no-rewrite-rule-ids"
-		)[1].strip()
-	)["results"]
-	levelMap = {"INFO": Level.LOW, "WARNING": Level.MED, "ERROR": Level.HIGH}
-	for result in results:
-		filePath = result.get("Target").replace("\\", "/")
-		file = f"{scanDir}/{filePath}"
-		resultId = result.get("check_id", "")
-		extras = result.get("extra", {})
-		line = result.get("start", {}).get("line", 0)
-		findings.append(
-			{
-				"id": resultId,
-				"title": resultId.split(".")[-1],
-				"description": extras("message").strip(),
-				"file": file,
-				"evidence": extractEvidence(line, file),
-				"severity": levelMap[extras("severity")],
-				"confidence": Level.HIGH,
-				"line": line,
-				"_other": {
-					"end": result.get("end"),
-					"extra": extras,
-				},
-			}
-		)
+	executable = requireTool("semgrep")
+	findings = []
+	for targets in _targetChunks(scanDir, files):
+		command = _semgrepCommand(executable, targets)
+		stream = JsonStream({"results"})
+		findings.extend(await _streamFindingsAsync(command, stream, _semgrepFinding, timeout))
 	return findings
+
+
+async def runAsync(
+	asyncPlugins: list[Callable[..., Awaitable[list[Finding]]]],
+	scanDir: str = ".",
+	jobs: int | None = None,
+	timeout: float | None = None,
+) -> list[Finding]:
+	"""Run async plugins concurrently and merge their findings.
+
+	Cancelling the task running this coroutine kills any tool processes
+	that are still running.
+
+	Args:
+		asyncPlugins (list[Callable[..., Awaitable[list[Finding]]]]): async plugins
+		to run. e.g. [banditAsync, dlintAsync]
+		scanDir (str, optional): select a scan directory. Defaults to ".".
+		jobs (int, optional): maximum number of plugins to run at once. Defaults
+		to None (all of them)
+		timeout (float, optional): seconds to allow each tool process. Defaults
+		to None (no limit)
+
+	Returns:
+		list[Finding]: findings from each plugin, in the same order as asyncPlugins
+	"""
+	semaphore = asyncio.Semaphore(max(1, jobs or len(asyncPlugins) or 1))
+
+	async def runOne(plugin: Callable[..., Awaitable[list[Finding]]]) -> list[Finding]:
+		async with semaphore:
+			try:
+				return await plugin(scanDir=scanDir, timeout=timeout)
+			except asyncio.CancelledError:
+				raise
+			except Exception as e:  # pylint: disable=broad-exception-caught
+				print(f"! SimpleSecurity encountered an error: {e}")
+				return []
+
+	findings = []
+	for finding in await asyncio.gather(*[runOne(plugin) for plugin in asyncPlugins]):
+		findings.extend(finding)
+	return findings
+
+
+def _cacheVersion(toolName: str) -> str:
+	"""Get the version of a tool for the cache key, without needing the bandit
+	executable when bandit runs from this python.
+	"""
+	version = _banditVersion() if toolName == "bandit" else None
+	return toolVersion(toolName) if version is None else version
+
+
+def _configHash(scanDir: str, config: tuple[str, ...]) -> str:
+	"""Hash the config files a tool reads, from the scan directory and the working
+	directory (where the tools run).
+	"""
+	hashes = []
+	for directory in dict.fromkeys([abspath(scanDir), getcwd()]):
+		for name in config:
+			path = join(directory, name)
+			if isfile(path):
+				hashes.append(f"{normalisePath(path)}:{fileHash(path)}")
+	return ";".join(hashes)
+
+
+def _countCache(pluginName: str, findingsCache: FindingsCache):
+	profiling.count(f"cache.{pluginName}.hits", findingsCache.hits)
+	profiling.count(f"cache.{pluginName}.misses", findingsCache.misses)
+
+
+def cachedPlugin(
+	plugin: Callable[..., list[Finding]],
+	pluginName: str,
+	toolName: str,
+	patterns: tuple[str, ...] | None = None,
+	rules: str = "",
+	config: tuple[str, ...] = (),
+) -> Callable[..., list[Finding]]:
+	"""Wrap a plugin so it only scans files that changed since the last run, and
+	reuses cached findings for everything else.
+
+	Args:
+		plugin (Callable[..., list[Finding]]): plugin to wrap. eg. plugins.bandit
+		pluginName (str): name of the plugin. eg. bandit
+		toolName (str): name of the executable the plugin runs (for its version)
+		patterns (tuple[str, ...], optional): glob patterns for the names of files
+		the plugin scans. eg. ("*.py",). Defaults to None (all files)
+		rules (str, optional): hash of the rule set used by the plugin. Defaults to "".
+		config (tuple[str, ...], optional): names of config files that change what
+		the tool finds. eg. (".bandit",). Defaults to () (none)
+
+	Returns:
+		Callable[..., list[Finding]]: plugin with the same signature
+	"""
+
+	def cached(scanDir: str = ".", files: list[str] | None = None) -> list[Finding]:
+		with profiling.phase(f"cache.{pluginName}"):
+			findingsCache = FindingsCache(
+				pluginName, _cacheVersion(toolName), rules, scanDir, _configHash(scanDir, config)
+			)
+			allFiles = listFiles(scanDir, patterns) if files is None else files
+			changed = findingsCache.changed(allFiles)
+			_countCache(pluginName, findingsCache)
+		findings = plugin(scanDir=scanDir, files=changed) if len(changed) > 0 else []
+		with profiling.phase(f"cache.{pluginName}"):
+			if not findingsCache.update(findings):
+				changedSet = set(changed)
+				unchanged = [file for file in allFiles if file not in changedSet]
+				return findingsCache.findings(unchanged) + findings
+			findingsCache.prune(allFiles if files is None else None)
+			findingsCache.save()
+			return findingsCache.findings(allFiles)
+
+	return cached
+
+
+def iterCachedPlugin(
+	plugin: Callable[..., Iterable[Finding]],
+	pluginName: str,
+	toolName: str,
+	patterns: tuple[str, ...] | None = None,
+	rules: str = "",
+	config: tuple[str, ...] = (),
+) -> Callable[..., Iterator[Finding]]:
+	"""Streaming variant of cachedPlugin. Cached findings for unchanged files are
+	yielded first, followed by findings from the changed files as the plugin
+	finds them. Those findings are held by the cache until the plugin finishes,
+	so memory still grows with them (use the plugin without the cache to stream
+	in bounded memory).
+
+	Args:
+		plugin (Callable[..., Iterable[Finding]]): plugin to wrap. eg. plugins.iterBandit
+		pluginName (str): name of the plugin. eg. bandit
+		toolName (str): name of the executable the plugin runs (for its version)
+		patterns (tuple[str, ...], optional): glob patterns for the names of files
+		the plugin scans. eg. ("*.py",). Defaults to None (all files)
+		rules (str, optional): hash of the rule set used by the plugin. Defaults to "".
+		config (tuple[str, ...], optional): names of config files that change what
+		the tool finds. eg. (".bandit",). Defaults to () (none)
+
+	Returns:
+		Callable[..., Iterator[Finding]]: plugin with the same signature
+	"""
+
+	def cached(scanDir: str = ".", files: list[str] | None = None) -> Iterator[Finding]:
+		with profiling.phase(f"cache.{pluginName}"):
+			findingsCache = FindingsCache(
+				pluginName, _cacheVersion(toolName), rules, scanDir, _configHash(scanDir, config)
+			)
+			allFiles = listFiles(scanDir, patterns) if files is None else files
+			changed = findingsCache.changed(allFiles)
+			_countCache(pluginName, findingsCache)
+			changedSet = set(changed)
+			unchanged = findingsCache.findings([file for file in allFiles if file not in changedSet])
+		yield from unchanged
+		del unchanged
+		matched = True
+		for finding in plugin(scanDir=scanDir, files=changed) if len(changed) > 0 else []:
+			# Cache each finding as it passes, the cache holds it until the scan ends
+			matched = matched and findingsCache.add(finding)
+			yield finding
+		with profiling.phase(f"cache.{pluginName}"):
+			if findingsCache.commit():
+				findingsCache.prune(allFiles if files is None else None)
+				findingsCache.save()
+
+	return cached
@@ -0,0 +1,261 @@
+"""Time the phases of a scan (simplesecurity --profile).
+
+Code that does a measurable piece of work wraps it in phase(name). This does
+nothing unless a Profile has been enabled, in which case the wall and cpu time
+of each phase is added up (cpu time is per thread, so plugins running at the
+same time do not count each other's time). count(name, n) adds to a counter (eg.
+findings from a plugin or cache hits).
+
+Phases
+
+- tools: finding tools and their versions
+- walk: listing the files to scan
+- plugin.<name>: running a plugin, from start to its last finding (includes the
+  phases below)
+- tool.<executable>: waiting for a tool's output (its startup and scan time)
+- parse.<executable>: parsing a tool's json output into findings
+- evidence: reading source lines for the findings
+- cache.<name>: checking for and loading cached findings
+- deduplicate, filter: not separate with --stream (they run as findings are
+  written)
+- format: writing the report (with --stream this includes waiting for plugins)
+"""
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from json import dumps
+from typing import Any, Callable, ContextManager, Iterable, Iterator
+
+from simplesecurity.types import Finding
+
+try:
+	import resource
+except ImportError:  # Windows
+	resource = None  # type: ignore
+
+
+# Cache stats that count up for the life of the process (the rest are sizes)
+CACHE_COUNTERS = ("hits", "misses")
+
+
+class Profile:
+	"""Wall and cpu time of each phase, and counters, for one scan."""
+
+	def __init__(self, caches: dict[str, dict[str, Any]] | None = None):
+		"""Start timing the scan.
+
+		Args:
+			caches (dict[str, dict[str, Any]] | None, optional): stats of in memory
+			caches at the start of the scan, so metrics only counts the hits and
+			misses of this scan (the daemon keeps its caches between scans).
+			Defaults to None.
+		"""
+		self.lock = threading.Lock()
+		self.phases: dict[str, dict[str, float]] = {}
+		self.counters: dict[str, int] = {}
+		self.start = (time.perf_counter(), time.process_time())
+		self.startCaches = caches or {}
+
+	@contextmanager
+	def phase(self, name: str) -> Iterator[None]:
+		"""Time a phase. Phases with the same name are added together.
+
+		Args:
+			name (str): name of the phase
+
+		Yields:
+			None: while the phase runs
+		"""
+		wall, cpu = time.perf_counter(), time.thread_time()
+		try:
+			yield
+		finally:
+			wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+			with self.lock:
+				totals = self.phases.setdefault(name, {"calls": 0, "wall": 0.0, "cpu": 0.0})
+				totals["calls"] += 1
+				totals["wall"] += wall
+				totals["cpu"] += cpu
+
+	def count(self, name: str, value: int = 1):
+		"""Add to a counter.
+
+		Args:
+			name (str): name of the counter
+			value (int, optional): amount to add. Defaults to 1.
+		"""
+		with self.lock:
+			self.counters[name] = self.counters.get(name, 0) + value
+
+	def metrics(self, caches: dict[str, dict[str, Any]] | None = None) -> dict[str, Any]:
+		"""Get the metrics collected so far.
+
+		Args:
+			caches (dict[str, dict[str, Any]] | None, optional): stats of in memory
+			caches to include (eg. LINE_CACHE.stats()). Hits and misses are counted
+			from the start of the scan. Defaults to None.
+
+		Returns:
+			dict[str, Any]: json serialisable metrics
+		"""
+		caches = {
+			name: {
+				key: value - self.startCaches.get(name, {}).get(key, 0)
+				if key in CACHE_COUNTERS
+				else value
+				for key, value in stats.items()
+			}
+			for name, stats in (caches or {}).items()
+		}
+		with self.lock:
+			return {
+				"wall": time.perf_counter() - self.start[0],
+				"cpu": time.process_time() - self.start[1],
+				"max_rss_bytes": maxRss(False),
+				"tool_max_rss_bytes": maxRss(True),
+				"phases": {name: dict(totals) for name, totals in self.phases.items()},
+				"counters": dict(self.counters),
+				"caches": caches,
+			}
+
+
+PROFILE: Profile | None = None
+
+
+def maxRss(children: bool) -> int | None:
+	"""Get the peak resident memory of this process or of its largest tool.
+
+	Args:
+		children (bool): True for the largest finished child process (eg. bandit)
+
+	Returns:
+		int | None: bytes, or None if this platform cannot tell
+	"""
+	if resource is None:
+		return None
+	usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+	# kilobytes on linux, bytes on macos
+	return usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+
+def enable(caches: dict[str, dict[str, Any]] | None = None) -> Profile:
+	"""Start collecting metrics.
+
+	Args:
+		caches (dict[str, dict[str, Any]] | None, optional): stats of in memory
+		caches now (see Profile). Defaults to None.
+
+	Returns:
+		Profile: the profile that phase and count add to
+	"""
+	global PROFILE  # pylint: disable=global-statement
+	PROFILE = Profile(caches)
+	return PROFILE
+
+
+def disable():
+	"""Stop collecting metrics."""
+	global PROFILE  # pylint: disable=global-statement
+	PROFILE = None
+
+
+def phase(name: str) -> ContextManager[None]:
+	"""Time a phase if profiling is enabled.
+
+	Args:
+		name (str): name of the phase
+
+	Returns:
+		ContextManager[None]: context to run the phase in
+	"""
+	profile = PROFILE
+	return nullcontext() if profile is None else profile.phase(name)
+
+
+def count(name: str, value: int = 1):
+	"""Add to a counter if profiling is enabled.
+
+	Args:
+		name (str): name of the counter
+		value (int, optional): amount to add. Defaults to 1.
+	"""
+	profile = PROFILE
+	if profile is not None:
+		profile.count(name, value)
+
+
+def timedPlugin(name: str, plugin: Callable, iterate: bool) -> Callable:
+	"""Wrap a plugin to time it as the phase plugin.<name> and count its findings
+	as findings.<name>.
+
+	Args:
+		name (str): name of the plugin
+		plugin (Callable): plugin to wrap
+		iterate (bool): the plugin is a generator (eg. plugins.iterBandit)
+
+	Returns:
+		Callable: plugin with the same signature
+	"""
+
+	def timed(*args, **kwargs) -> list[Finding]:
+		with phase(f"plugin.{name}"):
+			findings = plugin(*args, **kwargs)
+		count(f"findings.{name}", len(findings))
+		return findings
+
+	def iterTimed(*args, **kwargs) -> Iterator[Finding]:
+		with phase(f"plugin.{name}"):
+			for finding in plugin(*args, **kwargs):
+				count(f"findings.{name}")
+				yield finding
+
+	return iterTimed if iterate else timed
+
+
+def countAs(name: str, findings: Iterable[Finding]) -> Iterator[Finding]:
+	"""Count findings as they pass.
+
+	Args:
+		name (str): name of the counter
+		findings (Iterable[Finding]): findings
+
+	Yields:
+		Finding: the same findings
+	"""
+	for finding in findings:
+		count(name)
+		yield finding
+
+
+def _size(value: int | None) -> str:
+	return "-" if value is None else f"{value / (1 << 20):.1f} MiB"
+
+
+def table(metrics: dict[str, Any]) -> str:
+	"""Format metrics as a plain text summary.
+
+	Args:
+		metrics (dict[str, Any]): metrics from Profile.metrics
+
+	Returns:
+		str: summary table
+	"""
+	lines = [f"{'phase':<32}{'calls':>8}{'wall (s)':>12}{'cpu (s)':>12}"]
+	for name, totals in sorted(metrics["phases"].items(), key=lambda x: -x[1]["wall"]):
+		lines.append(
+			f"{name:<32}{totals['calls']:>8}{totals['wall']:>12.3f}{totals['cpu']:>12.3f}"
+		)
+	lines.append(f"{'total':<32}{'':>8}{metrics['wall']:>12.3f}{metrics['cpu']:>12.3f}")
+	lines.append("")
+	for name, value in sorted(metrics["counters"].items()):
+		lines.append(f"{name:<32}{value:>8}")
+	for name, stats in metrics["caches"].items():
+		lines.append(f"{name:<32}{dumps(stats)}")
+	lines.append(
+		f"{'max rss':<32}{_size(metrics['max_rss_bytes'])} "
+		f"(largest tool {_size(metrics['tool_max_rss_bytes'])})"
+	)
+	return "\n".join(lines)
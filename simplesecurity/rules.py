@@ -0,0 +1,119 @@
+"""A table of the rules (checks) that findings are reported for.
+
+Plugins add each rule to RULES once, the first time it is reported, and take
+the rule's title, more info and metadata from the table so every finding for the
+rule shares one copy. Formatters look rules up here (eg. to write the rules
+section of a sarif report). The cli clears RULES at the start of each scan so a
+long running process (the daemon) only reports the rules of the current scan.
+
+Rule descriptions must not come from a finding's description, which can quote
+the code (eg. a hardcoded password).
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from simplesecurity.types import Finding
+
+# pylint: disable=too-few-public-methods
+
+
+class Rule:
+	"""A rule (check) that a tool reports findings for."""
+
+	__slots__ = ("id", "title", "description", "moreInfo", "metadata")
+
+	def __init__(
+		self,
+		ruleId: str,
+		title: str,
+		description: str,
+		moreInfo: str | None = None,
+		metadata: dict[str, Any] | None = None,
+	):
+		"""Make a rule.
+
+		Args:
+			ruleId (str): id of the rule (the finding id)
+			title (str): short title
+			description (str): generic description of the rule
+			moreInfo (str | None, optional): url with more info. Defaults to None.
+			metadata (dict[str, Any] | None, optional): other data from the tool
+			(eg. cwe). Defaults to None.
+		"""
+		self.id = ruleId
+		self.title = title
+		self.description = description
+		self.moreInfo = moreInfo
+		self.metadata = metadata if metadata is not None else {}
+
+
+class RuleTable:
+	"""Rules by id."""
+
+	def __init__(self):
+		"""Start with no rules."""
+		self.rules: dict[str, Rule] = {}
+
+	def add(
+		self,
+		ruleId: str,
+		title: str,
+		description: str,
+		moreInfo: str | None = None,
+		metadata: dict[str, Any] | None = None,
+	) -> Rule:
+		"""Get the rule with an id, adding it if this is the first time it was
+		reported.
+
+		Args:
+			ruleId (str): id of the rule (the finding id)
+			title (str): short title
+			description (str): description
+			moreInfo (str | None, optional): url with more info. Defaults to None.
+			metadata (dict[str, Any] | None, optional): other data from the tool.
+			Defaults to None.
+
+		Returns:
+			Rule: the rule in the table (the arguments are ignored if the rule was
+			already added)
+		"""
+		rule = self.rules.get(ruleId)
+		if rule is None:
+			rule = self.rules.setdefault(
+				ruleId, Rule(ruleId, title, description, moreInfo, metadata)
+			)
+		return rule
+
+	def clear(self):
+		"""Forget every rule (eg. before the next scan)."""
+		self.rules.clear()
+
+	def get(self, ruleId: str) -> Rule | None:
+		"""Get a rule.
+
+		Args:
+			ruleId (str): id of the rule
+
+		Returns:
+			Rule | None: the rule, or None if no plugin has reported it
+		"""
+		return self.rules.get(ruleId)
+
+	def forFinding(self, finding: Finding) -> Rule:
+		"""Get the rule a finding was reported for.
+
+		Args:
+			finding (Finding): finding
+
+		Returns:
+			Rule: the rule in the table, or one made from the finding's title if it
+			is not in the table (eg. findings loaded from the cache)
+		"""
+		rule = self.rules.get(finding["id"])
+		if rule is None:
+			return Rule(finding["id"], finding["title"], finding["title"])
+		return rule
+
+
+RULES = RuleTable()
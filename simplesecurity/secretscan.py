@@ -0,0 +1,194 @@
+"""Look for secrets and other dodgy looking values in files, without running an
+external tool. The checks are the same as dodgy's
+(https://github.com/landscapeio/dodgy).
+
+Every file is searched once with a single precompiled regex of the literal
+anchors the checks need (eg. PASSWORD or ssh-rsa). Only the (rare) lines this
+finds are decoded and run through the full checks. Large files are memory
+mapped rather than read.
+"""
+from __future__ import annotations
+
+import gzip
+import mmap
+import os
+import re
+from mimetypes import guess_type
+from typing import Any, Callable, Iterator, Pattern
+
+from simplesecurity.level import Level
+from simplesecurity.walker import listFiles
+
+# Memory map files at least this big rather than reading them
+MMAP_MIN_BYTES = 1 << 20
+# Bytes to count newlines in at a time
+COUNT_CHUNK = 1 << 20
+
+# (code, message, severity, regexes, condition), checked in this order
+CHECKS: list[tuple[str, str, Level, tuple[Pattern[str], ...], Callable[..., bool]]] = [
+	(
+		"aws_secret_key",
+		"Amazon Web Services secret key",
+		Level.HIGH,
+		(
+			re.compile(r'(\'|")[A-Za-z0-9\\\+]{40}(\'|")'),
+			re.compile(r"(\b|_)AWS(\b|_)", re.IGNORECASE),
+		),
+		all,
+	),
+	(
+		"diff",
+		"Possible SCM diff in code",
+		Level.LOW,
+		(re.compile(r"^<<<<<<< .*$"), re.compile(r"^>>>>>>> .*$")),
+		any,
+	),
+	(
+		"ssh_rsa_private_key",
+		"Possible SSH private key",
+		Level.HIGH,
+		(re.compile(r"^-{5}(BEGIN|END)\s+RSA\s+PRIVATE\s+KEY-{5}$"),),
+		any,
+	),
+	(
+		"ssh_rsa_public_key",
+		"Possible SSH public key",
+		Level.LOW,
+		(re.compile(r"^ssh-rsa\s+AAAA[0-9A-Za-z+/]+[=]{0,3}\s*([^@]+@[^@]+)?$"),),
+		any,
+	),
+	(
+		"password",
+		"Possible hardcoded password",
+		Level.MED,
+		(re.compile(r'(\b|[A-Z0-9_]*_)PASSWORD(_[A-Z0-9_]*|\b)\s*=\s(\'|")[^\'"]+(\'|")'),),
+		any,
+	),
+	(
+		"secret",
+		"Possible hardcoded secret key",
+		Level.MED,
+		(re.compile(r'(\b|[A-Z0-9_]*_)SECRET(_[A-Z0-9_]*|\b)\s*=\s(\'|")[^\'"]+(\'|")'),),
+		any,
+	),
+]
+
+# A line can only fail a check if it contains one of these
+ANCHORS = re.compile(
+	rb"(?i:aws)|PASSWORD|SECRET|^(?:<<<<<<< |>>>>>>> |-----(?:BEGIN|END)|ssh-rsa)", re.MULTILINE
+)
+
+# Paths dodgy skips: dot files and directories, and tests
+IGNORED = re.compile(r"(^|/)\.[^\.]|^tests?(/|$)|/tests?(/|$)|_tests?(/|$)")
+
+
+def checkLine(line: str) -> list[tuple[str, str, Level]]:
+	"""Run every check against a line.
+
+	Args:
+		line (str): line of text (without the newline)
+
+	Returns:
+		list[tuple[str, str, Level]]: (code, message, severity) for each failed check
+	"""
+	return [
+		(code, message, severity)
+		for code, message, severity, regexes, condition in CHECKS
+		if condition([regex.search(line) for regex in regexes])
+	]
+
+
+def _countLines(buffer: Any, start: int, end: int) -> int:
+	count = 0
+	while start < end:
+		stop = min(end, start + COUNT_CHUNK)
+		count += buffer[start:stop].count(b"\n")
+		start = stop
+	return count
+
+
+def scanBuffer(buffer: Any) -> Iterator[tuple[int, str, str, Level]]:
+	"""Run the checks against the contents of a file.
+
+	Args:
+		buffer (Any): file contents as bytes or a mmap
+
+	Yields:
+		tuple[int, str, str, Level]: (line, code, message, severity) for each
+		failed check, lines start at 1
+	"""
+	lineNo, counted, pos = 1, 0, 0
+	while match := ANCHORS.search(buffer, pos):
+		lineStart = buffer.rfind(b"\n", 0, match.start()) + 1
+		lineEnd = buffer.find(b"\n", match.start())
+		lineEnd = len(buffer) if lineEnd < 0 else lineEnd
+		lineNo += _countLines(buffer, counted, lineStart)
+		counted = lineStart
+		line = bytes(buffer[lineStart:lineEnd]).decode("utf-8", errors="ignore")
+		for code, message, severity in checkLine(line):
+			yield lineNo, code, message, severity
+		pos = lineEnd + 1
+
+
+def scanFile(file: str) -> list[tuple[int, str, str, Level]]:
+	"""Run the checks against a file.
+
+	Args:
+		file (str): path to the file
+
+	Returns:
+		list[tuple[int, str, str, Level]]: (line, code, message, severity) for
+		each failed check. Empty if the file cannot be read
+	"""
+	try:
+		if file.endswith(".gz"):
+			with gzip.open(file, "rb") as gzFile:
+				return list(scanBuffer(gzFile.read()))
+		with open(file, "rb") as openFile:
+			size = os.fstat(openFile.fileno()).st_size
+			if size < MMAP_MIN_BYTES:
+				return list(scanBuffer(openFile.read()))
+			with mmap.mmap(openFile.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+				return list(scanBuffer(buffer))
+	except (OSError, ValueError, EOFError):
+		return []
+
+
+def isScanned(file: str, scanDir: str = ".") -> bool:
+	"""Check if a file should be scanned. Like dodgy, only text files (by mimetype)
+	outside of dot and test directories are.
+
+	Args:
+		file (str): path to the file
+		scanDir (str, optional): directory being scanned. Defaults to ".".
+
+	Returns:
+		bool: True if the file should be scanned
+	"""
+	relPath = os.path.relpath(file, scanDir).replace("\\", "/")
+	if IGNORED.search(relPath):
+		return False
+	mimetype = guess_type(file)[0]
+	return mimetype is not None and mimetype.startswith("text/")
+
+
+def scanFiles(
+	scanDir: str = ".", files: list[str] | None = None
+) -> Iterator[tuple[str, list[tuple[int, str, str, Level]]]]:
+	"""Run the checks against each file to scan.
+
+	Args:
+		scanDir (str, optional): directory to scan. Defaults to ".".
+		files (list[str] | None, optional): only scan these files (within scanDir).
+		Defaults to None (scan everything in scanDir)
+
+	Yields:
+		tuple[str, list[tuple[int, str, str, Level]]]: (file, failed checks) for
+		each file with a failed check
+	"""
+	for file in listFiles(scanDir) if files is None else files:
+		if not isScanned(file, scanDir):
+			continue
+		results = scanFile(file)
+		if len(results) > 0:
+			yield file, results
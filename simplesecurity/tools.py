@@ -0,0 +1,124 @@
+"""Find the tools used by the plugins without launching them.
+
+Tools are resolved with a PATH lookup. The resolved path and the tool version
+are cached on disk (see simplesecurity.cache) and reused while PATH and the
+modification time of the executable are unchanged
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+
+from simplesecurity import cache, profiling
+
+CACHE_NAME = "tools.json"
+
+_tools: dict[str, dict] = {}
+
+
+def _mtime(path: str) -> float | None:
+	try:
+		return os.stat(path).st_mtime
+	except OSError:
+		return None
+
+
+def _lookup(name: str) -> dict | None:
+	"""Get the cache entry for a tool, refreshing it if PATH or the executable
+	changed.
+	"""
+	envPath = os.environ.get("PATH", "")
+	with cache.LOCK:
+		if not _tools:
+			stored = cache.loadJson(CACHE_NAME, {})
+			if isinstance(stored, dict) and stored.get("PATH") == envPath:
+				_tools.update(stored.get("tools", {}))
+		entry = _tools.get(name)
+		if (
+			entry is not None
+			and entry.get("PATH") == envPath
+			and _mtime(entry["path"]) == entry["mtime"]
+		):
+			return entry
+		path = shutil.which(name)
+		if path is None:
+			_tools.pop(name, None)
+			return None
+		entry = {"PATH": envPath, "path": path, "mtime": _mtime(path), "version": None}
+		_tools[name] = entry
+	_save()
+	return entry
+
+
+def _save():
+	envPath = os.environ.get("PATH", "")
+	with cache.LOCK:
+		tools = {k: v for k, v in _tools.items() if v.get("PATH") == envPath}
+		cache.saveJson(CACHE_NAME, {"PATH": envPath, "tools": tools})
+
+
+def findTool(name: str) -> str | None:
+	"""Find a tool on the system path.
+
+	Args:
+		name (str): name of the executable. eg. bandit
+
+	Returns:
+		str | None: full path to the executable or None if it is not on the path
+	"""
+	with profiling.phase("tools"):
+		entry = _lookup(name)
+	return None if entry is None else entry["path"]
+
+
+def requireTool(name: str) -> str:
+	"""Find a tool on the system path.
+
+	Args:
+		name (str): name of the executable. eg. bandit
+
+	Raises:
+		RuntimeError: if the tool is not on the system path
+
+	Returns:
+		str: full path to the executable
+	"""
+	path = findTool(name)
+	if path is None:
+		raise RuntimeError(f"{name} is not on the system path")
+	return path
+
+
+def toolVersion(name: str) -> str:
+	"""Get the version of a tool, running `<tool> --version` only if this is
+	not already cached.
+
+	Args:
+		name (str): name of the executable. eg. bandit
+
+	Raises:
+		RuntimeError: if the tool is not on the system path
+
+	Returns:
+		str: version string reported by the tool ("" if it could not be found)
+	"""
+	with profiling.phase("tools"):
+		entry = _lookup(name)
+		if entry is None:
+			raise RuntimeError(f"{name} is not on the system path")
+		if entry["version"] is None:
+			try:
+				out = subprocess.run(
+					[entry["path"], "--version"],
+					stdout=subprocess.PIPE,
+					stderr=subprocess.STDOUT,
+					encoding="utf-8",
+					errors="ignore",
+					check=False,
+				)
+				entry["version"] = out.stdout.strip() if out.returncode == 0 else ""
+			except OSError:
+				entry["version"] = ""
+			_save()
+		return entry["version"]
@@ -1,8 +1,15 @@
 """Types used by simplesecurity.
+
+Plugins make findings with compactFinding, which stores each finding (and the
+lines of its evidence) in slots with the repeated strings interned. These still
+read like the Finding and Line dicts below. Use toDict to serialise a finding
 """
 from __future__ import annotations
 
+import sys
 import typing
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Iterator
 
 from simplesecurity.level import Level
 
@@ -48,3 +55,139 @@ class Line(typing.TypedDict):
 	line: int
 	content: str
 	selected: bool
+
+
+class CompactLine(Mapping):
+	"""A Line stored in slots rather than a dict. This reads like a Line (line["content"])
+	and compares equal to the dict it was made from.
+	"""
+
+	__slots__ = ("selected", "line", "content")
+
+	def __init__(self, selected: bool, line: int, content: str):
+		"""Make a line.
+
+		Args:
+			selected (bool): is this the line the finding is on
+			line (int): line number
+			content (str): code on the line
+		"""
+		self.selected = selected
+		self.line = line
+		self.content = content
+
+	def __getitem__(self, key: str) -> Any:
+		if key not in self.__slots__:
+			raise KeyError(key)
+		return getattr(self, key)
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self.__slots__)
+
+	def __len__(self) -> int:
+		return len(self.__slots__)
+
+	def __repr__(self) -> str:
+		return repr(dict(self))
+
+
+class CompactFinding(MutableMapping):
+	"""A Finding stored in slots rather than a dict, with its id, title,
+	description and file interned so findings for the same rule share one copy
+	of each. This reads and updates like a Finding (finding["evidence"] = ...) so
+	existing code keeps working. Keys cannot be added or removed.
+	"""
+
+	__slots__ = (
+		"id",
+		"title",
+		"description",
+		"file",
+		"evidence",
+		"severity",
+		"confidence",
+		"line",
+		"_other",
+	)
+
+	def __init__(self, finding: Finding):
+		"""Make a compact copy of a finding.
+
+		Args:
+			finding (Finding): finding to copy
+		"""
+		for key in ("id", "title", "description", "file"):
+			value = finding[key]
+			setattr(self, key, sys.intern(value) if type(value) is str else value)
+		self.evidence = [compactLine(line) for line in finding["evidence"]]
+		self.severity = finding["severity"]
+		self.confidence = finding["confidence"]
+		self.line = finding["line"]
+		self._other = finding["_other"]
+
+	def __getitem__(self, key: str) -> Any:
+		if key not in self.__slots__:
+			raise KeyError(key)
+		return getattr(self, key)
+
+	def __setitem__(self, key: str, value: Any):
+		if key not in self.__slots__:
+			raise KeyError(key)
+		setattr(self, key, value)
+
+	def __delitem__(self, key: str):
+		raise TypeError("keys cannot be removed from a CompactFinding")
+
+	def __iter__(self) -> Iterator[str]:
+		return iter(self.__slots__)
+
+	def __len__(self) -> int:
+		return len(self.__slots__)
+
+	def __repr__(self) -> str:
+		return repr(toDict(self))  # type: ignore
+
+
+def compactLine(line: Line) -> Line:
+	"""Get a compact copy of a line (lines that are already compact are returned
+	as they are).
+
+	Args:
+		line (Line): line to copy
+
+	Returns:
+		Line: CompactLine
+	"""
+	if isinstance(line, CompactLine):
+		return line  # type: ignore
+	return CompactLine(line["selected"], line["line"], line["content"])  # type: ignore
+
+
+def compactFinding(finding: Finding) -> Finding:
+	"""Get a compact copy of a finding (findings that are already compact are
+	returned as they are).
+
+	Args:
+		finding (Finding): finding to copy
+
+	Returns:
+		Finding: CompactFinding
+	"""
+	if isinstance(finding, CompactFinding):
+		return finding  # type: ignore
+	return CompactFinding(finding)  # type: ignore
+
+
+def toDict(finding: Finding) -> Finding:
+	"""Get a plain dict copy of a finding (eg. to serialise as json).
+
+	Args:
+		finding (Finding): finding, compact or not
+
+	Returns:
+		Finding: dict with evidence as a list of dicts
+	"""
+	return {
+		**finding,  # type: ignore
+		"evidence": [dict(line) for line in finding["evidence"]],
+	}
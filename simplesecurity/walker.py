@@ -0,0 +1,257 @@
+"""List the files in a scan directory, skipping anything in EXCLUDED or in the
+project's ignore files (eg. .gitignore).
+
+EXCLUDED and each ignore file are compiled to a single regex, and excluded
+directories are pruned without being read, so the tree is walked once and every
+plugin is fed the same list.
+"""
+from __future__ import annotations
+
+import os
+import re
+from fnmatch import translate
+
+from simplesecurity.excluded import EXCLUDED
+
+# Ignore files read from the scan directory and its subdirectories
+IGNORE_FILES = (".gitignore",)
+
+
+def normalisePath(file: str) -> str:
+	"""Normalise a file path so paths reported by different tools compare equal.
+
+	Args:
+		file (str): path to a file
+
+	Returns:
+		str: normalised path using forward slashes
+	"""
+	return os.path.normpath(file).replace("\\", "/")
+
+
+def reportPath(file: str) -> str:
+	"""Get the path to report for a file, so a finding for a file has the same
+	path whichever tool found it and however the file was passed to the tool
+	(eg. bandit reports ./a.py when scanning . but a.py when passed a.py).
+
+	Args:
+		file (str): path to a file, as reported by a tool
+
+	Returns:
+		str: normalised path, starting with ./ if it is relative to the current
+		directory
+	"""
+	path = normalisePath(file)
+	if os.path.isabs(path) or path == ".." or path.startswith("../"):
+		return path
+	return f"./{path}"
+
+
+def _translate(pattern: str) -> str:
+	"""Translate a gitignore style pattern (without a trailing slash or leading
+	!) to a regex matching paths relative to the pattern's directory.
+	"""
+	anchored = "/" in pattern
+	pattern = pattern.lstrip("/")
+	regex = []
+	i = 0
+	while i < len(pattern):
+		char = pattern[i]
+		if pattern.startswith("**/", i):
+			regex.append("(?:.*/)?")
+			i += 3
+			continue
+		if pattern.startswith("/**", i) and i + 3 == len(pattern):
+			regex.append("/.*")
+			i += 3
+			continue
+		if char == "*":
+			regex.append("[^/]*")
+		elif char == "?":
+			regex.append("[^/]")
+		elif char == "[" and "]" in pattern[i + 2 :]:
+			end = pattern.index("]", i + 2)
+			chars = pattern[i + 1 : end].replace("\\", "\\\\")
+			regex.append("[" + ("^" + chars[1:] if chars[0] in "!^" else chars) + "]")
+			i = end
+		elif char == "\\" and i + 1 < len(pattern):
+			i += 1
+			regex.append(re.escape(pattern[i]))
+		else:
+			regex.append(re.escape(char))
+		i += 1
+	return ("" if anchored else "(?:.*/)?") + "".join(regex)
+
+
+def _compile(regexes: list[str]) -> re.Pattern[str] | None:
+	return re.compile("|".join(f"(?:{regex})" for regex in regexes)) if regexes else None
+
+
+class Matcher:
+	"""Gitignore style patterns compiled to one regex for files and one for
+	directories. As in git, the last pattern matching a path decides if it is
+	ignored, so a negated pattern (!pattern) re-includes what earlier patterns
+	ignored.
+	"""
+
+	def __init__(self, patterns: list[str]):
+		"""Compile the patterns.
+
+		Args:
+			patterns (list[str]): lines of an ignore file (comments and blank lines
+			are skipped)
+		"""
+		regexes: dict[bool, list[str]] = {True: [], False: []}
+		negated: dict[bool, list[bool]] = {True: [], False: []}
+		for pattern in patterns:
+			pattern = pattern.rstrip("\n\r")
+			if pattern.endswith("\\ "):
+				pattern = pattern[:-2].rstrip() + " "
+			else:
+				pattern = pattern.rstrip()
+			if not pattern or pattern.startswith("#"):
+				continue
+			negate = pattern.startswith("!")
+			pattern = pattern[1:] if negate else pattern
+			dirOnly = pattern.endswith("/")
+			pattern = pattern.rstrip("/")
+			if not pattern:
+				continue
+			regex = _translate(pattern)
+			for isDir in (True,) if dirOnly else (True, False):
+				regexes[isDir].append(regex)
+				negated[isDir].append(negate)
+		# fullmatch tries the alternatives in order, so put the last pattern first
+		# and the group that matched is the pattern that decides
+		self.regex = {
+			isDir: re.compile("|".join(f"({regex})" for regex in reversed(regexes[isDir])))
+			if regexes[isDir]
+			else None
+			for isDir in (True, False)
+		}
+		self.negated = {isDir: negated[isDir][::-1] for isDir in (True, False)}
+
+	def match(self, relPath: str, isDir: bool) -> bool | None:
+		"""Check what the last pattern matching a path says about it.
+
+		Args:
+			relPath (str): path relative to the ignore file, using forward slashes
+			isDir (bool): is the path a directory
+
+		Returns:
+			bool | None: True if the path is ignored, False if it is re-included by
+			a negated pattern, None if no pattern matches
+		"""
+		regex = self.regex[isDir]
+		found = None if regex is None else regex.fullmatch(relPath)
+		if found is None:
+			return None
+		return not self.negated[isDir][found.lastindex - 1]
+
+	def excluded(self, relPath: str, isDir: bool) -> bool:
+		"""Check if a path matches.
+
+		Args:
+			relPath (str): path relative to the ignore file, using forward slashes
+			isDir (bool): is the path a directory
+
+		Returns:
+			bool: True if the path should be skipped
+		"""
+		return self.match(relPath, isDir) is True
+
+
+def _rootOnly(pattern: str) -> str:
+	"""Anchor a generic directory name from EXCLUDED (eg. lib/ or build/) to the
+	scan directory, as a project can have its own lib or build package deeper
+	in the tree. Tool directories (eg. __pycache__/ or .tox/) are skipped at any
+	depth.
+	"""
+	if pattern.endswith("/") and not pattern.startswith((".", "_", "/")):
+		return f"/{pattern}"
+	return pattern
+
+
+EXCLUDED_MATCHER = Matcher([_rootOnly(x) for x in EXCLUDED])
+
+
+def isExcluded(relPath: str) -> bool:
+	"""Check if a file (relative to the scan directory) matches EXCLUDED, or is in
+	a directory that does.
+
+	Args:
+		relPath (str): path relative to the scan directory, using forward slashes
+
+	Returns:
+		bool: True if the path should be skipped
+	"""
+	parts = relPath.strip("/").split("/")
+	for index in range(1, len(parts)):
+		if EXCLUDED_MATCHER.excluded("/".join(parts[:index]), True):
+			return True
+	return EXCLUDED_MATCHER.excluded("/".join(parts), False)
+
+
+def _readIgnoreFiles(entries: list[os.DirEntry]) -> Matcher | None:
+	patterns = []
+	for entry in entries:
+		if entry.name not in IGNORE_FILES:
+			continue
+		try:
+			with open(entry.path, encoding="utf-8", errors="ignore") as file:
+				patterns.extend(file.readlines())
+		except OSError:
+			continue
+	return Matcher(patterns) if patterns else None
+
+
+def _ignored(relPath: str, isDir: bool, matchers: list[tuple[str, Matcher]]) -> bool:
+	"""Check a path against the ignore files from the scan directory down, so (as
+	in git) a deeper ignore file overrides the ones above it.
+	"""
+	ignored = False
+	for base, matcher in matchers:
+		matched = matcher.match(relPath[len(base) :], isDir)
+		if matched is not None:
+			ignored = matched
+	return ignored
+
+
+def listFiles(scanDir: str = ".", patterns: tuple[str, ...] | None = None) -> list[str]:
+	"""List the files in a scan directory.
+
+	Args:
+		scanDir (str, optional): directory to list. Defaults to ".".
+		patterns (tuple[str, ...], optional): only list files with a name matching
+		one of these glob patterns. eg. ("*.py",). Defaults to None (list all files)
+
+	Returns:
+		list[str]: sorted list of paths (joined onto scanDir)
+	"""
+	nameRegex = None if patterns is None else _compile([translate(x) for x in patterns])
+	files: list[str] = []
+
+	def walk(directory: str, relDir: str, matchers: list[tuple[str, Matcher]]):
+		try:
+			entries = list(os.scandir(directory))
+		except OSError:
+			return
+		ignoreFiles = _readIgnoreFiles(entries)
+		if ignoreFiles is not None:
+			matchers = [*matchers, (relDir, ignoreFiles)]
+		for entry in entries:
+			relPath = relDir + entry.name
+			try:
+				isDir = entry.is_dir()
+			except OSError:
+				isDir = False
+			if EXCLUDED_MATCHER.excluded(relPath, isDir) or _ignored(relPath, isDir, matchers):
+				continue
+			if isDir:
+				if not entry.is_symlink():
+					walk(entry.path, relPath + "/", matchers)
+			elif nameRegex is None or nameRegex.fullmatch(entry.name):
+				files.append(entry.path)
+
+	walk(scanDir, "", [])
+	return sorted(files)
@@ -0,0 +1,203 @@
+"""Watch a scan directory for changes so only the changed files need to be
+rescanned (simplesecurity --watch).
+
+Changes are found by walking the tree and comparing the mtime and size of each
+file. If watchdog is installed the tree is only walked after the filesystem
+reports a change, otherwise it is polled, waiting longer between polls (up to
+MAX_BACKOFF times the interval) while nothing changes.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from typing import Any, Iterator
+
+from simplesecurity.types import Finding
+from simplesecurity.walker import listFiles, normalisePath
+
+try:
+	from watchdog.events import FileSystemEventHandler
+	from watchdog.observers import Observer
+except ImportError:  # poll instead
+	FileSystemEventHandler = object  # type: ignore
+	Observer = None  # type: ignore
+
+# Polls wait at most this many times the interval when nothing is changing
+MAX_BACKOFF = 16
+# Filesystem events that do not change a file (eg. from our own scans)
+READ_EVENTS = ("opened", "closed_no_write")
+
+
+def snapshot(scanDir: str = ".") -> dict[str, tuple[int, int]]:
+	"""Get the mtime and size of each file in the scan directory.
+
+	Args:
+		scanDir (str, optional): directory to scan. Defaults to ".".
+
+	Returns:
+		dict[str, tuple[int, int]]: file -> (mtime_ns, size)
+	"""
+	files = {}
+	for file in listFiles(scanDir):
+		try:
+			stat = os.stat(file)
+		except OSError:
+			continue
+		files[file] = (stat.st_mtime_ns, stat.st_size)
+	return files
+
+
+def changedFiles(old: dict[str, tuple[int, int]], new: dict[str, tuple[int, int]]) -> list[str]:
+	"""Compare two snapshots.
+
+	Args:
+		old (dict[str, tuple[int, int]]): earlier snapshot
+		new (dict[str, tuple[int, int]]): later snapshot
+
+	Returns:
+		list[str]: sorted files that were added, modified or deleted
+	"""
+	return sorted(
+		{file for file, stat in new.items() if old.get(file) != stat}
+		| {file for file in old if file not in new}
+	)
+
+
+def iterChanges(scanDir: str = ".", interval: float = 1.0) -> Iterator[list[str]]:
+	"""Watch the scan directory forever, yielding the files that changed.
+
+	Args:
+		scanDir (str, optional): directory to scan. Defaults to ".".
+		interval (float, optional): seconds between polls (or to wait for more
+		changes after the filesystem reports one). Defaults to 1.0.
+
+	Yields:
+		list[str]: files that were added, modified or deleted since the last poll
+	"""
+	if Observer is not None:
+		yield from _iterNotified(scanDir, interval)
+	else:
+		yield from _iterPolled(scanDir, interval)
+
+
+def _iterPolled(scanDir: str, interval: float) -> Iterator[list[str]]:
+	old = snapshot(scanDir)
+	wait = interval
+	while True:
+		time.sleep(wait)
+		new = snapshot(scanDir)
+		changed = changedFiles(old, new)
+		old = new
+		if len(changed) > 0:
+			wait = interval
+			yield changed
+		else:
+			wait = min(wait * 2, interval * MAX_BACKOFF)
+
+
+class _WakeHandler(FileSystemEventHandler):  # type: ignore
+	"""Set an event when the filesystem reports a change."""
+
+	def __init__(self, woken: threading.Event):
+		super().__init__()
+		self.woken = woken
+
+	def on_any_event(self, event: Any):
+		if event.event_type not in READ_EVENTS:
+			self.woken.set()
+
+
+def _iterNotified(scanDir: str, interval: float) -> Iterator[list[str]]:
+	woken = threading.Event()
+	observer = Observer()
+	observer.schedule(_WakeHandler(woken), scanDir, recursive=True)
+	observer.start()
+	try:
+		old = snapshot(scanDir)
+		while True:
+			woken.wait()
+			# Let a burst of writes (eg. a checkout) settle
+			time.sleep(interval)
+			woken.clear()
+			new = snapshot(scanDir)
+			changed = changedFiles(old, new)
+			old = new
+			if len(changed) > 0:
+				yield changed
+	finally:
+		observer.stop()
+		observer.join()
+
+
+class FindingsState:
+	"""The latest findings from each plugin, updated as files are rescanned."""
+
+	def __init__(self):
+		"""Start with no findings."""
+		self.plugins: dict[str, dict[str, list[Finding]]] = {}
+
+	def update(self, plugin: str, findings: list[Finding], files: list[str] | None):
+		"""Replace a plugin's findings for the files it scanned.
+
+		Args:
+			plugin (str): name of the plugin
+			findings (list[Finding]): findings from the plugin
+			files (list[str] | None): files the plugin scanned, None if it scans
+			the whole project (so all of its findings are replaced)
+		"""
+		byFile = self.plugins.setdefault(plugin, {})
+		if files is None:
+			byFile.clear()
+		else:
+			for file in files:
+				byFile.pop(normalisePath(file), None)
+		for finding in findings:
+			byFile.setdefault(normalisePath(finding["file"]), []).append(finding)
+
+	def forget(self, files: list[str]):
+		"""Drop the findings for files (eg. that were deleted).
+
+		Args:
+			files (list[str]): files to forget
+		"""
+		for byFile in self.plugins.values():
+			for file in files:
+				byFile.pop(normalisePath(file), None)
+
+	def findings(self) -> list[Finding]:
+		"""Get every finding.
+
+		Returns:
+			list[Finding]: findings, by plugin then file
+		"""
+		return [
+			finding
+			for byFile in self.plugins.values()
+			for findings in byFile.values()
+			for finding in findings
+		]
+
+
+def _key(finding: Finding) -> tuple[Any, ...]:
+	return (finding["id"], normalisePath(finding["file"]), finding["line"], finding["title"])
+
+
+def diffFindings(
+	old: list[Finding], new: list[Finding]
+) -> tuple[list[Finding], list[Finding]]:
+	"""Compare the findings before and after a rescan.
+
+	Args:
+		old (list[Finding]): findings before
+		new (list[Finding]): findings after
+
+	Returns:
+		tuple[list[Finding], list[Finding]]: (added, resolved) findings
+	"""
+	oldKeys = {_key(finding) for finding in old}
+	newKeys = {_key(finding) for finding in new}
+	return (
+		[finding for finding in new if _key(finding) not in oldKeys],
+		[finding for finding in old if _key(finding) not in newKeys],
+	)
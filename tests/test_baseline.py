@@ -0,0 +1,68 @@
+from collections import Counter
+from io import StringIO
+
+import pytest
+
+import simplesecurity
+from simplesecurity import baseline, level
+
+
+def makeFinding(line, content, file="./a.py"):
+	return {
+		"id": "B102",
+		"title": "B102: exec_used",
+		"description": "Use of exec detected.",
+		"file": file,
+		"evidence": [
+			{"selected": False, "line": line - 1, "content": "before"},
+			{"selected": True, "line": line, "content": content},
+		],
+		"severity": level.Level.MED,
+		"confidence": level.Level.HIGH,
+		"line": line,
+		"_other": {},
+	}
+
+
+def test_fingerprint():
+	finding = makeFinding(3, "exec(x)")
+	assert baseline.fingerprint(finding) == baseline.fingerprint(makeFinding(30, "  exec(x)"))
+	assert baseline.fingerprint(finding) == baseline.fingerprint(makeFinding(3, "exec(x)", "a.py"))
+	assert baseline.fingerprint(finding) != baseline.fingerprint(makeFinding(3, "exec(y)"))
+	assert baseline.fingerprint(finding) != baseline.fingerprint(makeFinding(3, "exec(x)", "b.py"))
+
+
+def test_suppress_counts():
+	fingerprints: Counter[str] = Counter()
+	list(baseline.iterRecord([makeFinding(3, "exec(x)")], fingerprints))
+	new = [makeFinding(5, "exec(x)"), makeFinding(9, "exec(x)"), makeFinding(12, "exec(y)")]
+	assert baseline.suppress(new, fingerprints) == new[1:]
+	assert fingerprints[baseline.fingerprint(new[0])] == 1
+	assert len(fingerprints) == 1
+
+
+def test_load_errors(tmp_path):
+	with pytest.raises(RuntimeError, match="could not read baseline"):
+		baseline.load(str(tmp_path / "missing.json"))
+	(tmp_path / "bad.json").write_text('{"version": 99}', encoding="utf-8")
+	with pytest.raises(RuntimeError, match="is not a version 1 baseline"):
+		baseline.load(str(tmp_path / "bad.json"))
+
+
+def test_cli_baseline(tmp_path, monkeypatch):
+	monkeypatch.chdir(tmp_path)
+	(tmp_path / "app.py").write_text('PASSWORD = "hunter2"\n', encoding="utf-8")
+
+	def scan(*extra):
+		args = simplesecurity._parser().parse_args(["-p", "secrets", "-f", "jsonl", "-0", *extra])
+		output = StringIO()
+		return simplesecurity._scan(args, output), output.getvalue()
+
+	assert scan("--write-baseline", "baseline.json")[0] == 1
+	assert scan("--baseline", "baseline.json") == (0, "")
+
+	(tmp_path / "app.py").write_text('import os\n\nPASSWORD = "hunter2"\nSECRET = "x"\n', encoding="utf-8")
+	code, output = scan("--baseline", "baseline.json")
+	assert code == 1
+	assert '"id": "secret"' in output
+	assert '"id": "password"' not in output
@@ -0,0 +1,30 @@
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+THISDIR = Path(__file__).resolve().parent
+
+pytestmark = pytest.mark.skipif(sys.platform.startswith("win"), reason="uses shebang scripts")
+
+
+def test_bench(tmp_path, capsys):
+	spec = importlib.util.spec_from_file_location(
+		"bench", THISDIR.parent / "benchmarks" / "bench.py"
+	)
+	bench = importlib.util.module_from_spec(spec)
+	spec.loader.exec_module(bench)
+	bench.main(["--sizes", "20", "--repeat", "1", "--output", str(tmp_path / "results.json")])
+	results = json.loads((tmp_path / "results.json").read_text("utf-8"))["results"]
+	names = {result["name"] for result in results}
+	assert {
+		"deduplicate",
+		"extractEvidence",
+		"parse.bandit",
+		"plugin.semgrep",
+		"format.sarif",
+	} <= names
+	assert all(result["size"] == 20 and result["seconds"] >= 0 for result in results)
+	assert "deduplicate" in capsys.readouterr().err
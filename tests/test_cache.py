@@ -0,0 +1,212 @@
+import os
+import sys
+from functools import partial
+from types import SimpleNamespace
+
+import pytest
+
+from simplesecurity import cache, level, plugins, tools, types, walker
+
+
+@pytest.fixture(autouse=True)
+def findingsCache(tmp_path, monkeypatch):
+	monkeypatch.setenv("SIMPLESECURITY_CACHE_DIR", str(tmp_path / "cache"))
+	monkeypatch.setattr(plugins, "toolVersion", lambda toolName: "1.0")
+
+
+@pytest.fixture()
+def scanDir(tmp_path):
+	scanDir = tmp_path / "project"
+	(scanDir / "pkg").mkdir(parents=True)
+	(scanDir / "pkg" / "a.py").write_text("import os\n", encoding="utf-8")
+	(scanDir / "pkg" / "b.py").write_text("import sys\n", encoding="utf-8")
+	(scanDir / "README.md").write_text("# Readme\n", encoding="utf-8")
+	(scanDir / "venv").mkdir()
+	(scanDir / "venv" / "c.py").write_text("import venv\n", encoding="utf-8")
+	return scanDir
+
+
+def makeFinding(file: str) -> types.Finding:
+	return {
+		"id": "TEST_ID",
+		"title": "TEST",
+		"description": "This is a test",
+		"file": file,
+		"evidence": [{"selected": True, "line": 1, "content": "lineContent"}],
+		"severity": level.Level.MED,
+		"confidence": level.Level.HIGH,
+		"line": 1,
+		"_other": {},
+	}
+
+
+def test_listFiles(scanDir):
+	files = walker.listFiles(str(scanDir), ("*.py",))
+	assert [walker.normalisePath(x) for x in files] == [
+		walker.normalisePath(str(scanDir / "pkg" / "a.py")),
+		walker.normalisePath(str(scanDir / "pkg" / "b.py")),
+	]
+
+
+def test_cachedPlugin(scanDir):
+	scanned = []
+
+	def fakePlugin(scanDir=".", files=None):
+		scanned.append(sorted(files))
+		return [makeFinding(file) for file in files]
+
+	cached = plugins.cachedPlugin(fakePlugin, "fake", "fake", ("*.py",))
+	first = cached(str(scanDir))
+	assert len(first) == 2
+	assert len(scanned[-1]) == 2
+
+	# Nothing changed so the plugin is not run and findings come from the cache
+	assert cached(str(scanDir)) == first
+	assert len(scanned) == 1
+	assert isinstance(first[0]["severity"], level.Level)
+
+	(scanDir / "pkg" / "b.py").write_text("import subprocess\n", encoding="utf-8")
+	assert cached(str(scanDir)) == first
+	assert scanned[-1] == [str(scanDir / "pkg" / "b.py")]
+
+
+def test_cachedPlugin_version_change(scanDir, monkeypatch):
+	scanned = []
+
+	def fakePlugin(scanDir=".", files=None):
+		scanned.append(files)
+		return []
+
+	cached = plugins.cachedPlugin(fakePlugin, "fake", "fake", ("*.py",))
+	cached(str(scanDir))
+	monkeypatch.setattr(plugins, "toolVersion", lambda toolName: "2.0")
+	cached(str(scanDir))
+	assert len(scanned) == 2
+	assert len(scanned[-1]) == 2
+
+
+def test_cachedPlugin_banditModule(scanDir, monkeypatch):
+	scanned = []
+
+	def fakePlugin(scanDir=".", files=None):
+		scanned.append(files)
+		return []
+
+	def noExecutable(toolName):
+		raise RuntimeError(f"{toolName} is not on the system path")
+
+	# bandit runs from this python, so the executable is not needed for its version
+	monkeypatch.setattr(plugins, "toolVersion", noExecutable)
+	monkeypatch.setattr(plugins, "BANDIT_IN_PROCESS", True)
+	monkeypatch.setattr(plugins, "_banditApi", lambda: ())
+	monkeypatch.setitem(sys.modules, "bandit", SimpleNamespace(__version__="1.7.5"))
+	assert plugins._cacheVersion("bandit") == "bandit 1.7.5"
+	assert plugins._banditExecutable() == [sys.executable, "-m", "bandit"]
+	cached = plugins.cachedPlugin(fakePlugin, "bandit", "bandit", ("*.py",))
+	cached(str(scanDir))
+	cached(str(scanDir))
+	monkeypatch.setitem(sys.modules, "bandit", SimpleNamespace(__version__="1.7.6"))
+	cached(str(scanDir))
+	assert [len(x) for x in scanned] == [2, 2]
+
+
+def test_cachedPlugin_config_change(scanDir, monkeypatch):
+	scanned = []
+
+	def fakePlugin(scanDir=".", files=None):
+		scanned.append(files)
+		return []
+
+	monkeypatch.chdir(scanDir)
+	cached = plugins.cachedPlugin(fakePlugin, "dlint", "flake8", ("*.py",), "", ("setup.cfg",))
+	cached()
+	cached()
+	(scanDir / "setup.cfg").write_text("[flake8]\nextend-ignore = DUO105\n", encoding="utf-8")
+	cached()
+	cached()
+	(scanDir / "setup.cfg").write_text("[flake8]\nextend-ignore = DUO106\n", encoding="utf-8")
+	cached()
+	assert [len(x) for x in scanned] == [2, 2, 2]
+
+
+def test_iterCachedPlugin(scanDir):
+	scanned = []
+
+	def fakePlugin(scanDir=".", files=None):
+		scanned.append(sorted(files))
+		yield from (makeFinding(file) for file in files)
+
+	cached = plugins.iterCachedPlugin(fakePlugin, "fake", "fake", ("*.py",))
+	first = list(cached(str(scanDir)))
+	assert len(first) == 2
+	assert list(cached(str(scanDir))) == first
+	assert len(scanned) == 1
+
+	(scanDir / "pkg" / "b.py").write_text("import subprocess\n", encoding="utf-8")
+	assert list(cached(str(scanDir))) == first
+	assert scanned[-1] == [str(scanDir / "pkg" / "b.py")]
+
+
+def test_findingsCache_add(scanDir):
+	files = [str(scanDir / "pkg" / "a.py"), str(scanDir / "pkg" / "b.py")]
+	findingsCache = cache.FindingsCache("fake", "1.0", scanDir=str(scanDir))
+	assert findingsCache.changed(files) == files
+	assert findingsCache.add(makeFinding(files[0]))
+	assert findingsCache.commit()
+	assert [x["file"] for x in findingsCache.findings(files)] == [files[0]]
+
+	# A finding for a file that was not scanned means nothing is stored
+	(scanDir / "pkg" / "b.py").write_text("import subprocess\n", encoding="utf-8")
+	assert findingsCache.changed(files) == [files[1]]
+	assert not findingsCache.add(makeFinding(str(scanDir / "other.py")))
+	assert not findingsCache.commit()
+	assert findingsCache.changed(files) == [files[1]]
+	assert findingsCache.commit()
+
+
+def test_fileHash(scanDir):
+	assert cache.fileHash(str(scanDir / "pkg" / "a.py")) != cache.fileHash(
+		str(scanDir / "pkg" / "b.py")
+	)
+
+
+STUB_BANDIT = """
+import json, os, sys
+
+def report(file):
+	return {
+		"filename": file, "test_id": "B101", "test_name": "assert_used", "issue_text": "assert",
+		"more_info": None, "issue_severity": "LOW", "issue_confidence": "HIGH",
+		"line_number": 1, "line_range": [1],
+	}
+
+excluded = sys.argv[sys.argv.index("-x") + 1].split(",")
+files = []
+for target in sys.argv[sys.argv.index("json") + 1 :]:
+	if os.path.isdir(target):
+		for root, dirs, names in os.walk(target):
+			dirs[:] = [x for x in dirs if f"./{x}/" not in excluded]
+			files.extend(os.path.join(root, name) for name in names if name.endswith(".py"))
+	else:
+		files.append(os.path.join(".", target))
+print(json.dumps({"results": [report(file) for file in sorted(files)]}))
+"""
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="uses shebang scripts")
+def test_cachedPlugin_samePaths(scanDir, tmp_path, monkeypatch):
+	binDir = tmp_path / "bin"
+	binDir.mkdir()
+	(binDir / "bandit").write_text(f"#!{sys.executable}\n{STUB_BANDIT}", encoding="utf-8")
+	(binDir / "bandit").chmod(0o755)
+	monkeypatch.setenv("PATH", f"{binDir}{os.pathsep}{os.environ['PATH']}")
+	monkeypatch.setattr(plugins, "BANDIT_IN_PROCESS", False)
+	monkeypatch.chdir(scanDir)
+	tools._tools.clear()
+
+	uncached = [x["file"] for x in plugins.bandit(shards=1)]
+	cached = plugins.cachedPlugin(partial(plugins.bandit, shards=1), "bandit", "bandit", ("*.py",))
+	assert [x["file"] for x in cached()] == uncached == ["./pkg/a.py", "./pkg/b.py"]
+	# and again from the cache
+	assert [x["file"] for x in cached()] == uncached
+	tools._tools.clear()
@@ -0,0 +1,58 @@
+import os
+import subprocess
+
+import pytest
+
+from simplesecurity import changes
+
+
+def git(repo, *args):
+	subprocess.run(
+		["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+		cwd=repo,
+		check=True,
+		capture_output=True,
+	)
+
+
+@pytest.fixture()
+def repo(tmp_path):
+	git(tmp_path, "init", "-q")
+	(tmp_path / "a.py").write_text("import os\n", encoding="utf-8")
+	(tmp_path / "b.py").write_text("import sys\n", encoding="utf-8")
+	(tmp_path / "requirements.txt").write_text("requests\n", encoding="utf-8")
+	git(tmp_path, "add", "-A")
+	git(tmp_path, "commit", "-qm", "first")
+	git(tmp_path, "tag", "first")
+	return tmp_path
+
+
+def names(files):
+	return [os.path.basename(file) for file in files]
+
+
+def test_changedFiles_uncommitted(repo):
+	assert changes.changedFiles(str(repo)) == []
+	(repo / "a.py").write_text("import subprocess\n", encoding="utf-8")
+	(repo / "c.py").write_text("import venv\n", encoding="utf-8")
+	(repo / "b.py").unlink()
+	assert names(changes.changedFiles(str(repo))) == ["a.py", "c.py"]
+
+
+def test_changedFiles_since(repo):
+	(repo / "requirements.txt").write_text("requests\nflask\n", encoding="utf-8")
+	git(repo, "commit", "-qam", "second")
+	assert changes.changedFiles(str(repo)) == []
+	assert names(changes.changedFiles(str(repo), "first")) == ["requirements.txt"]
+
+
+def test_changedFiles_notrepo(tmp_path):
+	with pytest.raises(RuntimeError):
+		changes.changedFiles(str(tmp_path), "HEAD")
+
+
+def test_matchFiles():
+	files = ["./a.py", "./requirements-dev.txt", "./README.md"]
+	assert changes.matchFiles(files, ("*.py",)) == ["./a.py"]
+	assert changes.matchFiles(files, changes.DEPENDENCY_FILES) == ["./requirements-dev.txt"]
+	assert changes.matchFiles(files, None) == files
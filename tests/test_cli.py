@@ -0,0 +1,200 @@
+import time
+from io import StringIO
+from json import loads
+
+import simplesecurity
+from simplesecurity import level, types
+
+finding: types.Finding = {
+	"id": "TEST_ID",
+	"title": "TEST",
+	"description": "This is a test",
+	"file": "this_file_does_not_exist",
+	"evidence": [{"selected": True, "line": 0, "content": "lineContent"}],
+	"severity": level.Level.MED,
+	"confidence": level.Level.MED,
+	"line": 0,
+	"_other": {},
+}
+
+
+def slowPlugin(scanDir="."):
+	time.sleep(0.05)
+	return [{**finding, "id": "SLOW", "file": scanDir}]
+
+
+def fastPlugin(scanDir="."):
+	return [{**finding, "id": "FAST", "file": scanDir}]
+
+
+def brokenPlugin(scanDir="."):
+	raise RuntimeError("broken is not on the system path")
+
+
+def test_runPlugins_order():
+	findings = simplesecurity._runPlugins([slowPlugin, fastPlugin], "scan", None)
+	assert [x["id"] for x in findings] == ["SLOW", "FAST"]
+	assert all(x["file"] == "scan" for x in findings)
+
+
+def test_runPlugins_jobs_1():
+	findings = simplesecurity._runPlugins([slowPlugin, fastPlugin], ".", 1)
+	assert [x["id"] for x in findings] == ["SLOW", "FAST"]
+
+
+def test_runPlugins_error(capsys):
+	findings = simplesecurity._runPlugins([brokenPlugin, fastPlugin], ".", 2)
+	assert [x["id"] for x in findings] == ["FAST"]
+	assert "broken is not on the system path" in capsys.readouterr().out
+
+
+def test_runPlugins_none():
+	assert simplesecurity._runPlugins([], ".", None) == []
+
+
+def test_limitToFiles():
+	filteredPlugins = {"bandit": fastPlugin, "safety": fastPlugin, "dodgy": fastPlugin}
+	limited = simplesecurity._limitToFiles(filteredPlugins, ["./a.md"])
+	assert len(limited) == 1
+	assert limited[0].keywords == {"files": ["./a.md"]}
+
+	limited = simplesecurity._limitToFiles(filteredPlugins, ["./a.py", "./poetry.lock"])
+	assert [getattr(x, "keywords", None) for x in limited] == [
+		{"files": ["./a.py"]},
+		None,
+		{"files": ["./a.py", "./poetry.lock"]},
+	]
+
+
+def iterSlowPlugin(scanDir="."):
+	yield {**finding, "id": "SLOW_1", "file": scanDir}
+	time.sleep(0.1)
+	yield {**finding, "id": "SLOW_2", "file": scanDir}
+
+
+def iterBrokenPlugin(scanDir="."):
+	yield {**finding, "id": "BROKEN", "file": scanDir}
+	raise RuntimeError("broken is not on the system path")
+
+
+def test_iterPlugins_streams():
+	ids = [x["id"] for x in simplesecurity._iterPlugins([iterSlowPlugin, fastPlugin], ".", None)]
+	assert sorted(ids) == ["FAST", "SLOW_1", "SLOW_2"]
+	assert ids[-1] == "SLOW_2"
+
+
+def test_iterPlugins_error(capsys):
+	findings = list(simplesecurity._iterPlugins([iterBrokenPlugin, fastPlugin], ".", 1))
+	assert [x["id"] for x in findings] == ["BROKEN", "FAST"]
+	assert "broken is not on the system path" in capsys.readouterr().out
+
+
+def test_runEach_generators(capsys):
+	results = simplesecurity._runEach([iterBrokenPlugin, iterSlowPlugin], ".", None)
+	assert results[0] is None
+	assert [x["id"] for x in results[1]] == ["SLOW_1", "SLOW_2"]
+	assert "broken is not on the system path" in capsys.readouterr().out
+
+
+def test_iterPlugins_bounded(monkeypatch):
+	monkeypatch.setattr(simplesecurity, "STREAM_QUEUE_SIZE", 4)
+	produced = []
+
+	def iterManyPlugin(scanDir="."):
+		for index in range(100):
+			produced.append(index)
+			yield {**finding, "line": index}
+
+	findings = simplesecurity._iterPlugins([iterManyPlugin], ".", None)
+	next(findings)
+	time.sleep(0.1)
+	# The plugin waits for the consumer once the queue is full
+	assert len(produced) <= 4 + 2
+	findings.close()
+
+
+def test_limitToFiles_full_scan():
+	filteredPlugins = {"bandit": fastPlugin, "safety": fastPlugin}
+	limited = simplesecurity._limitToFiles(filteredPlugins, ["./a.md"], changedOnly=False)
+	assert [getattr(x, "keywords", None) for x in limited] == [None]
+
+
+def scanProjects(tmp_path, monkeypatch, *extra):
+	monkeypatch.chdir(tmp_path)
+	monkeypatch.setenv("SIMPLESECURITY_CACHE_DIR", str(tmp_path / "cache"))
+	for project, line in (("a", 'PASSWORD = "hunter2"\n'), ("b", 'SECRET_KEY = "abc"\n')):
+		(tmp_path / project).mkdir()
+		(tmp_path / project / "app.py").write_text(line, encoding="utf-8")
+	args = simplesecurity._parser().parse_args(["-p", "secrets", "-f", "jsonl", "-0", *extra])
+	output = StringIO()
+	return simplesecurity._scan(args, output), output.getvalue()
+
+
+def test_scanProjects(tmp_path, monkeypatch):
+	code, output = scanProjects(tmp_path, monkeypatch, "-s", "a", "-s", "b", "--report-dir", "out")
+	assert code == 1
+	assert [loads(line)["file"] for line in output.splitlines()] == ["./a/app.py", "./b/app.py"]
+	assert sorted(x.name for x in (tmp_path / "out").iterdir()) == ["a.jsonl", "b.jsonl"]
+	assert loads((tmp_path / "out" / "b.jsonl").read_text("utf-8"))["id"] == "secret"
+
+
+def test_scanProjects_manifest(tmp_path, monkeypatch):
+	(tmp_path / "projects.txt").write_text("# projects\na\n\nb  # second\n", encoding="utf-8")
+	code, output = scanProjects(tmp_path, monkeypatch, "--manifest", "projects.txt", "-s", "a")
+	assert code == 1
+	assert len(output.splitlines()) == 2
+
+
+def test_scanProjects_missing(tmp_path, monkeypatch, capsys):
+	code, output = scanProjects(tmp_path, monkeypatch, "--manifest", "missing.txt")
+	assert (code, output) == (2, "")
+	assert "could not read manifest" in capsys.readouterr().out
+
+
+def test_scanProjects_rewriteBaseline(tmp_path, monkeypatch):
+	code, _ = scanProjects(tmp_path, monkeypatch, "-s", "a", "-s", "b", "--write-baseline", "bl.json")
+	assert code == 1
+	written = (tmp_path / "bl.json").read_text("utf-8")
+	# Updating the baseline in place keeps the findings it suppresses
+	args = simplesecurity._parser().parse_args(
+		["-p", "secrets", "-f", "jsonl", "-0", "-s", "a", "-s", "b"]
+		+ ["--baseline", "bl.json", "--write-baseline", "bl.json"]
+	)
+	output = StringIO()
+	assert simplesecurity._scan(args, output) == 0
+	assert output.getvalue() == ""
+	assert (tmp_path / "bl.json").read_text("utf-8") == written
+
+
+def test_reportNames():
+	names = simplesecurity._reportNames(["./a", "../b/", "c/a", "c:a", "."], "markdown")
+	assert names == ["a.md", "b.md", "c_a.md", "c_a-2.md", "root.md"]
+
+
+def test_scanProjects_combine(tmp_path, monkeypatch):
+	calls = []
+
+	def combinedPlugin(scanDir=".", files=None):
+		calls.append((scanDir, files))
+		return [{**finding, "id": "COMBINED", "file": file} for file in files]
+
+	plugin = {**simplesecurity.PLUGIN_MAP["semgrep"], "func": combinedPlugin}
+	monkeypatch.setitem(simplesecurity.PLUGIN_MAP, "semgrep", plugin)
+	code, output = scanProjects(
+		tmp_path, monkeypatch, "-p", "semgrep", "--no-cache", "-s", "a", "-s", "b", "--report-dir", "out"
+	)
+	assert code == 1
+	assert calls == [(".", ["a/app.py", "b/app.py"])]
+	assert len(output.splitlines()) == 2
+	assert loads((tmp_path / "out" / "a.jsonl").read_text("utf-8"))["file"] == "a/app.py"
+
+
+def test_shareCpus(monkeypatch):
+	monkeypatch.setattr(simplesecurity.os, "cpu_count", lambda: 8)
+	args = simplesecurity._parser().parse_args([])
+	shared = simplesecurity._shareCpus(args, 4)
+	assert (shared.jobs, shared.shards) == (2, 1)
+	assert (args.jobs, args.shards) == (None, None)
+	assert simplesecurity._shareCpus(args, 1) is args
+	given = simplesecurity._shareCpus(simplesecurity._parser().parse_args(["-j", "3"]), 16)
+	assert (given.jobs, given.shards) == (3, 1)
@@ -0,0 +1,63 @@
+import threading
+from io import StringIO
+from json import loads
+
+import pytest
+
+import simplesecurity
+from simplesecurity import daemon
+
+pytestmark = pytest.mark.skipif(not daemon.isSupported(), reason="needs unix sockets")
+
+
+@pytest.fixture()
+def socketPath(tmp_path_factory):
+	# Keep the path short, unix socket paths are limited to ~100 characters
+	path = str(tmp_path_factory.mktemp("d") / "s.sock")
+	thread = threading.Thread(target=daemon.serve, args=(path, simplesecurity._daemonScan))
+	thread.start()
+	for _ in range(100):
+		if daemon._connect(path) is not None:
+			break
+		threading.Event().wait(0.05)
+	yield path
+	daemon.request(path, {"stop": True}, StringIO())
+	thread.join(5)
+
+
+def test_request_scan(socketPath, tmp_path, monkeypatch):
+	(tmp_path / "app.py").write_text('PASSWORD = "hunter2"\n', encoding="utf-8")
+	monkeypatch.chdir(tmp_path)
+	output = StringIO()
+	code = daemon.request(
+		socketPath, daemon.scanRequest(["-p", "secrets", "-f", "jsonl", "-0"]), output
+	)
+	assert code == 1
+	assert '"id": "password"' in output.getvalue()
+	assert "app.py" in output.getvalue()
+
+
+def test_request_profile_to_stderr(socketPath, tmp_path, monkeypatch):
+	(tmp_path / "app.py").write_text('PASSWORD = "hunter2"\n', encoding="utf-8")
+	monkeypatch.chdir(tmp_path)
+	output, errors = StringIO(), StringIO()
+	request = daemon.scanRequest(["-p", "secrets", "-f", "jsonl", "--profile"])
+	assert daemon.request(socketPath, request, output, errors) == 0
+	# stdout is only the report, so it stays valid json
+	assert [loads(line)["id"] for line in output.getvalue().splitlines()] == ["password"]
+	assert "plugin.secrets" in errors.getvalue()
+
+
+def test_request_bad_args(socketPath):
+	output = StringIO()
+	assert daemon.request(socketPath, daemon.scanRequest(["-p", "nope"]), output) == 2
+	assert "Plugin to use" in output.getvalue()
+
+
+def test_request_no_daemon(tmp_path):
+	assert daemon.request(str(tmp_path / "none.sock"), {}, StringIO()) is None
+
+
+def test_serve_twice(socketPath):
+	with pytest.raises(RuntimeError, match="already listening"):
+		daemon.serve(socketPath, simplesecurity._daemonScan)
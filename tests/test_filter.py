@@ -102,3 +102,33 @@ def test_filterSeverity_4():
 		)
 		== 1
 	)
+
+
+def test_deduplicate_idmap():
+	dlint = {**finding, "id": "DUO105", "file": "./a.py"}
+	bandit = {**finding, "id": "B102", "file": "a.py"}
+	other = {**finding, "id": "B102", "file": "a.py", "line": 1}
+	assert filter.deduplicate([dlint, other, bandit]) == [other, bandit]
+	assert filter.deduplicate([bandit, other, dlint]) == [bandit, other]
+
+
+def test_deduplicate_chain():
+	dlint = {**finding, "id": "DUO116"}
+	bandit = {**finding, "id": "B602"}
+	semgrep = {**finding, "id": "subprocess-shell-true"}
+	assert filter.deduplicate([dlint, bandit, semgrep]) == [semgrep]
+	assert filter.deduplicate([dlint, bandit]) == [bandit]
+
+
+def test_deduplicate_repeated():
+	findings = [finding.copy() for _ in range(3)]
+	assert filter.deduplicate(findings) == simpleFindings
+
+
+def test_iterDeduplicate():
+	dlint = {**finding, "id": "DUO105", "file": "./a.py"}
+	bandit = {**finding, "id": "B102", "file": "a.py"}
+	other = {**finding, "id": "B102", "file": "a.py", "line": 1}
+	assert list(filter.iterDeduplicate([bandit, other, dlint, bandit])) == [bandit, other]
+	# dlint is yielded before the preferred bandit finding arrives
+	assert list(filter.iterDeduplicate([dlint, other, bandit])) == [dlint, other, bandit]
@@ -1,4 +1,5 @@
 import json
+from io import StringIO
 from pathlib import Path
 
 from jsonschema import validate
@@ -113,3 +114,56 @@ def test_advancedSarif():
 	# Path(f"{THISDIR}/data/advanced.sarif").write_text(fmt, "utf-8")
 	assert fmt == Path(f"{THISDIR}/data/advanced.sarif").read_text("utf-8")
 	assert validate(json.loads(fmt), sarifSchema) is None
+
+
+def test_advancedJsonl():
+	lines = formatter.jsonl(advancedFindings).splitlines()
+	assert [json.loads(line)["id"] for line in lines] == ["TEST_ID", "TEST_ID2"]
+
+
+def test_writeJson_matches_json():
+	output = StringIO()
+	assert formatter.writeJson(output, iter(advancedFindings)) == 2
+	assert output.getvalue() == formatter.json(advancedFindings)
+
+
+def test_writeSarif_unordered():
+	output = StringIO()
+	assert formatter.writeSarif(output, iter(advancedFindings), ordered=False) == 2
+	assert output.getvalue() == formatter.sarif(advancedFindings)
+
+
+def test_writeAnsi_unordered():
+	output = StringIO()
+	assert formatter.writeAnsi(output, iter(advancedFindings[::-1]), ordered=False) == 2
+	fmt = output.getvalue()
+	assert [line for line in fmt.splitlines() if line in ("TEST", "TEST2")] == ["TEST2", "TEST"]
+	assert fmt.index("This is a test2") < fmt.rindex("│Severity  │")
+
+
+def test_writeMarkdown_empty():
+	output = StringIO()
+	assert formatter.writeMarkdown(output, iter([]), ordered=False) == 0
+	assert output.getvalue() == "No findings"
+
+
+def test_sarifCompact():
+	fmt = formatter.sarifCompact(advancedFindings + simpleFindings)
+	assert "\n" not in fmt
+	assert validate(json.loads(fmt), sarifSchema) is None
+	run = json.loads(fmt)["runs"][0]
+	assert run["artifacts"] == [
+		{"location": {"uri": "this_file_does_not_exist"}},
+		{"location": {"uri": "this_file_does_not_exist2"}},
+	]
+	locations = [x["locations"][0]["physicalLocation"] for x in run["results"]]
+	assert [x["artifactLocation"]["index"] for x in locations] == [0, 1, 0]
+	assert run["results"][0]["message"]["text"] == "This is a test"
+	assert locations[1]["contextRegion"]["snippet"]["text"] == "3\n5\n9\n999999999999999999999999999999999"
+
+
+def test_sarifCompact_noSnippets():
+	fmt = formatter.sarifCompact(advancedFindings, snippets=False)
+	assert validate(json.loads(fmt), sarifSchema) is None
+	assert "snippet" not in fmt
+	assert len(fmt) < len(formatter.sarifCompact(advancedFindings))
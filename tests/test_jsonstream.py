@@ -0,0 +1,60 @@
+import json
+import random
+
+import pytest
+
+from simplesecurity.jsonstream import JsonStream
+
+document = {
+	"errors": [{"message": 'not the "results": [] you are looking for'}],
+	"generated_at": "2023-06-27T00:00:00Z",
+	"metrics": {"_totals": {"loc": 12345, "nosec": 0}},
+	"results": [{"test_id": f"B{i}", "line_number": i, "issue_text": "x" * i} for i in range(50)],
+	"version": 1.5,
+}
+
+
+def feedAll(stream, text, chunkSize):
+	items = []
+	for i in range(0, len(text), chunkSize):
+		items.extend(stream.feed(text[i : i + chunkSize]))
+	return items + stream.close()
+
+
+@pytest.mark.parametrize("chunkSize", [1, 7, 64, 100000])
+@pytest.mark.parametrize("indent", [None, "\t"])
+def test_jsonStream_keys(chunkSize, indent):
+	items = feedAll(JsonStream({"results"}), json.dumps(document, indent=indent), chunkSize)
+	assert items == [("results", x) for x in document["results"]]
+
+
+def test_jsonStream_allKeys():
+	text = json.dumps({"a.py": [{"id": 1}, {"id": 2}], "b.py": [], "c": 3})
+	assert feedAll(JsonStream(), text, 3) == [("a.py", {"id": 1}), ("a.py", {"id": 2}), ("c", 3)]
+
+
+def test_jsonStream_random_chunks():
+	text = json.dumps(document)
+	stream = JsonStream({"results"})
+	items, pos = [], 0
+	while pos < len(text):
+		size = random.randint(1, 50)
+		items.extend(stream.feed(text[pos : pos + size]))
+		pos += size
+	assert [x for _, x in items + stream.close()] == document["results"]
+
+
+def test_jsonStream_empty():
+	assert feedAll(JsonStream(allowEmpty=True), "\n", 1) == []
+	with pytest.raises(ValueError):
+		feedAll(JsonStream(), "", 1)
+
+
+def test_jsonStream_incomplete():
+	with pytest.raises(ValueError):
+		feedAll(JsonStream({"results"}), '{"results": [{"a": 1}, {"b"', 5)
+
+
+def test_jsonStream_notobject():
+	with pytest.raises(ValueError):
+		feedAll(JsonStream(), "Warning: something went wrong", 5)
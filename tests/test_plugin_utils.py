@@ -1,6 +1,10 @@
+import asyncio
 import sys
 from pathlib import Path
 
+import pytest
+
+from simplesecurity import evidence as evidenceModule
 from simplesecurity import level, plugins
 
 THISDIR = str(Path(__file__).resolve().parent)
@@ -129,3 +133,85 @@ def test__doSafetyProcessing():
 		}
 	]
 	assert plugins._doSafetyProcessing(safety) == findings
+
+
+def test_doSysExec_list():
+	assert plugins._doSysExec([sys.executable, "-c", "print('hello')"]) == (0, "hello\n")
+
+
+def test_doSysExec_list_commandnotexists():
+	assert plugins._doSysExec(["commandnotexists"])[0] != 0
+
+
+def test_doSysExecAsync():
+	command = [sys.executable, "-c", "print('hello')"]
+	assert asyncio.run(plugins._doSysExecAsync(command)) == (0, "hello\n")
+
+
+def test_doSysExecAsync_commandnotexists():
+	assert asyncio.run(plugins._doSysExecAsync(["commandnotexists"]))[0] != 0
+
+
+def test_doSysExecAsync_timeout():
+	command = [sys.executable, "-c", "import time; time.sleep(10)"]
+	with pytest.raises(RuntimeError):
+		asyncio.run(plugins._doSysExecAsync(command, timeout=0.1))
+
+
+def test_runAsync(capsys):
+	async def fakePlugin(scanDir=".", timeout=None):
+		await asyncio.sleep(0.01)
+		return [{"id": "FAKE", "file": scanDir}]
+
+	async def brokenPlugin(scanDir=".", timeout=None):
+		raise RuntimeError("broken is not on the system path")
+
+	findings = asyncio.run(plugins.runAsync([fakePlugin, brokenPlugin, fakePlugin], "scan", 1))
+	assert findings == [{"id": "FAKE", "file": "scan"}, {"id": "FAKE", "file": "scan"}]
+	assert "broken is not on the system path" in capsys.readouterr().out
+
+
+def test_addEvidence():
+	findings = [{"file": evidence, "line": 3}, {"file": evidenceBig, "line": 1}, {"file": evidence, "line": 20}]
+	plugins.addEvidence(findings)
+	assert findings[0]["evidence"] == plugins.extractEvidence(3, evidence)
+	assert findings[1]["evidence"] == plugins.extractEvidence(1, evidenceBig)
+	assert findings[2]["evidence"] == plugins.extractEvidence(20, evidence)
+
+
+def test_extractEvidence_line_pastend():
+	assert plugins.extractEvidence(100, evidence) == []
+
+
+def test_lineCache():
+	lineCache = evidenceModule.LineCache()
+	assert lineCache.lines(evidence) == lineCache.lines(evidence)
+	assert (lineCache.hits, lineCache.misses) == (1, 1)
+
+
+def test_lineCache_evict():
+	# Room for evidence_big.txt but not both files
+	bigCost = Path(evidenceBig).stat().st_size + evidenceModule.LINE_OVERHEAD * 100
+	lineCache = evidenceModule.LineCache(maxBytes=bigCost + 10)
+	lineCache.lines(evidence)
+	lineCache.lines(evidenceBig)
+	assert lineCache.stats()["files"] == 1
+	lineCache.lines(evidenceBig)
+	assert (lineCache.hits, lineCache.misses) == (1, 2)
+	assert lineCache.size <= lineCache.maxBytes
+
+
+def test_shardFiles(tmp_path, monkeypatch):
+	monkeypatch.setattr(plugins, "SHARD_MIN_BYTES", 100)
+	files = []
+	for name, size in [("a", 400), ("b", 300), ("c", 200), ("d", 100), ("e", 100)]:
+		file = tmp_path / f"{name}.py"
+		file.write_text("x" * size, encoding="utf-8")
+		files.append(str(file))
+	shards = plugins._shardFiles(str(tmp_path), files, 2)
+	assert sorted(sum(shards, [])) == files
+	assert sorted(sum(len(Path(x).read_text()) for x in shard) for shard in shards) == [500, 600]
+	assert plugins._shardFiles(str(tmp_path), files, 1) == [files]
+	assert plugins._shardFiles(str(tmp_path), None, 1) == [None]
+	monkeypatch.setattr(plugins, "SHARD_MIN_BYTES", 1 << 20)
+	assert plugins._shardFiles(str(tmp_path), files, 8) == [files]
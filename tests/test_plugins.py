@@ -0,0 +1,163 @@
+import asyncio
+import os
+import sys
+from io import StringIO
+from json import loads
+from pathlib import Path
+
+import pytest
+
+import simplesecurity
+from simplesecurity import level, plugins, tools
+
+THISDIR = Path(__file__).resolve().parent
+
+pytestmark = pytest.mark.skipif(sys.platform.startswith("win"), reason="uses shebang scripts")
+
+
+@pytest.fixture(autouse=True)
+def fakeTools(tmp_path, monkeypatch):
+	"""Put stub executables on the path that replay recorded tool output."""
+	binDir = tmp_path / "bin"
+	binDir.mkdir()
+	for tool, recorded in [("bandit", "bandit"), ("flake8", "dlint"), ("semgrep", "semgrep")]:
+		stub = binDir / tool
+		stub.write_text(
+			f"#!{sys.executable}\n"
+			"import sys\n"
+			"sys.stderr.write('some noise on stderr\\n')\n"
+			f"sys.stdout.write(open({str(THISDIR / 'data' / f'{recorded}.json')!r}).read())\n",
+			encoding="utf-8",
+		)
+		stub.chmod(0o755)
+	broken = binDir / "dodgy"
+	broken.write_text(f"#!{sys.executable}\nimport sys\nsys.stderr.write('dodgy broke')\n", encoding="utf-8")
+	broken.chmod(0o755)
+	monkeypatch.setenv("PATH", f"{binDir}{os.pathsep}{os.environ['PATH']}")
+	monkeypatch.setenv("SIMPLESECURITY_CACHE_DIR", str(tmp_path / "cache"))
+	monkeypatch.chdir(THISDIR.parent)
+	monkeypatch.setattr(plugins, "BANDIT_IN_PROCESS", False)
+	tools._tools.clear()
+	yield
+	tools._tools.clear()
+
+
+def test_bandit():
+	findings = plugins.bandit()
+	assert [(x["id"], x["line"], x["severity"]) for x in findings] == [
+		("B101", 3, level.Level.LOW),
+		("B102", 20, level.Level.MED),
+	]
+	assert findings[0]["evidence"] == plugins.extractEvidence(3, "tests/data/evidence.txt")
+	assert list(plugins.iterBandit()) == findings
+	rule = plugins.RULES.get("B101")
+	assert findings[0]["title"] is rule.title
+	assert findings[0]["_other"]["more_info"] is rule.moreInfo
+
+
+def test_banditAsync():
+	assert asyncio.run(plugins.banditAsync()) == plugins.bandit()
+
+
+def test_bandit_notImportable(monkeypatch):
+	monkeypatch.setattr(plugins, "BANDIT_IN_PROCESS", True)
+	monkeypatch.setattr(plugins, "_banditApi", lambda: None)
+	assert len(plugins.bandit(shards=1)) > 0
+
+
+def test_bandit_inProcess(tmp_path, monkeypatch):
+	pytest.importorskip("bandit")
+	monkeypatch.setattr(plugins, "BANDIT_IN_PROCESS", True)
+	monkeypatch.chdir(tmp_path)
+	(tmp_path / "app.py").write_text("import pickle\n\nassert pickle\n", encoding="utf-8")
+	findings = plugins.bandit(files=["app.py"])
+	assert [(x["id"], x["file"], x["line"]) for x in findings] == [
+		("B403", "./app.py", 1),
+		("B101", "./app.py", 3),
+	]
+	assert [x["content"] for x in findings[1]["evidence"] if x["selected"]] == ["assert pickle"]
+	assert asyncio.run(plugins.banditAsync(files=["app.py"])) == findings
+
+
+def test_banditInProcess_fallback(tmp_path, monkeypatch):
+	api = ()
+	monkeypatch.setattr(plugins, "BANDIT_IN_PROCESS", True)
+	monkeypatch.setattr(plugins, "_banditApi", lambda: api)
+	assert plugins._banditInProcess([None], None) is api
+	# Another scan runs a process while bandit is running in process
+	assert plugins._banditInProcess([None], None) is None
+	plugins._BANDIT_RUNNING.release()
+	# bandit's cli reads .bandit files, so projects with one run a process
+	assert plugins._banditIni(str(tmp_path)) is None
+	(tmp_path / ".bandit").write_text("[bandit]\nskips: B101\n", encoding="utf-8")
+	ini = plugins._banditIni(str(tmp_path))
+	assert ini == os.path.join(str(tmp_path), ".bandit")
+	assert plugins._banditInProcess([None], ini) is None
+	assert not plugins._BANDIT_RUNNING.locked()
+	assert plugins._banditCommand(["bandit"], ["a.py"], ini)[1:3] == ["--ini", ini]
+
+
+def banditProject(tmp_path, monkeypatch):
+	pytest.importorskip("bandit")
+	monkeypatch.setattr(plugins, "BANDIT_IN_PROCESS", True)
+	monkeypatch.chdir(tmp_path)
+	(tmp_path / "pkg").mkdir()
+	(tmp_path / "pkg" / "app.py").write_text(
+		"import pickle\n\nassert pickle\nexec('1')\n", encoding="utf-8"
+	)
+	(tmp_path / ".bandit").write_text("[bandit]\nskips: B101,B102\n", encoding="utf-8")
+
+
+def test_bandit_ini(tmp_path, monkeypatch):
+	banditProject(tmp_path, monkeypatch)
+	assert [x["id"] for x in plugins.bandit()] == ["B403"]
+	# The cli passes bandit the files to scan
+	assert [x["id"] for x in plugins.bandit(files=["pkg/app.py"])] == ["B403"]
+
+
+def test_bandit_ini_cli(tmp_path, monkeypatch):
+	banditProject(tmp_path, monkeypatch)
+	args = simplesecurity._parser().parse_args(["-p", "bandit", "-f", "jsonl", "-c", "1"])
+	output = StringIO()
+	simplesecurity._scanTo(args, ".", output)
+	assert [loads(line)["id"] for line in output.getvalue().splitlines()] == ["B403"]
+
+
+def test_dlint():
+	findings = plugins.dlint()
+	assert [(x["id"], x["line"], x["severity"]) for x in findings] == [
+		("DUO105", 20, level.Level.MED)
+	]
+
+
+def test_semgrep():
+	findings = plugins.semgrep()
+	assert [(x["title"], x["line"], x["severity"]) for x in findings] == [
+		("exec-detected", 20, level.Level.MED)
+	]
+	assert asyncio.run(plugins.semgrepAsync()) == findings
+
+
+def test_semgrepCommand():
+	command = plugins._semgrepCommand("semgrep", ["."])
+	assert command[2] == plugins.SEMGREP_RULES
+	# Skip the network requests semgrep makes on every run
+	assert "--metrics=off" in command
+	assert "--disable-version-check" in command
+
+
+def test_dodgy_broken():
+	with pytest.raises(RuntimeError, match="dodgy broke"):
+		plugins.dodgy()
+	with pytest.raises(RuntimeError, match="dodgy broke"):
+		list(plugins.iterDodgy())
+	with pytest.raises(RuntimeError, match="dodgy broke"):
+		asyncio.run(plugins.dodgyAsync())
+
+
+def test_bandit_sharded(monkeypatch):
+	monkeypatch.setattr(plugins, "SHARD_MIN_BYTES", 1)
+	files = ["simplesecurity/filter.py", "simplesecurity/level.py"]
+	# The stub replays the same output for each shard
+	assert len(plugins.bandit(files=files, shards=2)) == 4
+	assert len(asyncio.run(plugins.dlintAsync(files=files, shards=2))) == 2
@@ -0,0 +1,79 @@
+import json
+import threading
+from io import StringIO
+
+import simplesecurity
+from simplesecurity import profiling
+
+
+def test_profile():
+	profile = profiling.Profile()
+	with profile.phase("work"):
+		sum(range(10000))
+
+	def work():
+		with profile.phase("work"):
+			pass
+
+	thread = threading.Thread(target=work)
+	thread.start()
+	thread.join()
+	profile.count("things", 2)
+	profile.count("things")
+	metrics = profile.metrics({"cache": {"hits": 1}})
+	assert metrics["phases"]["work"]["calls"] == 2
+	assert metrics["counters"] == {"things": 3}
+	assert "work" in profiling.table(metrics)
+
+
+def test_disabled():
+	assert profiling.PROFILE is None
+	with profiling.phase("work"):
+		profiling.count("things")
+
+
+def test_timedPlugin():
+	profile = profiling.enable()
+	try:
+		assert profiling.timedPlugin("a", lambda scanDir: [1, 2], False)(scanDir=".") == [1, 2]
+		assert list(profiling.timedPlugin("b", lambda scanDir: iter([3]), True)(scanDir=".")) == [3]
+	finally:
+		profiling.disable()
+	assert profile.counters == {"findings.a": 2, "findings.b": 1}
+	assert set(profile.phases) == {"plugin.a", "plugin.b"}
+
+
+def test_cli_profile(tmp_path, monkeypatch, capsys):
+	monkeypatch.chdir(tmp_path)
+	(tmp_path / "app.py").write_text('PASSWORD = "hunter2"\n', encoding="utf-8")
+	args = simplesecurity._parser().parse_args(
+		["-p", "secrets", "-f", "json", "--profile", "--profile-output", "metrics.json"]
+	)
+	assert simplesecurity._scan(args, StringIO()) == 0
+	assert profiling.PROFILE is None
+	metrics = json.loads((tmp_path / "metrics.json").read_text("utf-8"))
+	assert {"walk", "plugin.secrets", "evidence", "deduplicate", "filter", "format"} <= set(
+		metrics["phases"]
+	)
+	assert metrics["counters"]["findings.secrets"] == 1
+	assert metrics["counters"]["findings.reported"] == 1
+	assert metrics["caches"]["evidence"]["misses"] >= 1
+	assert "plugin.secrets" in capsys.readouterr().err
+
+
+def test_cli_profile_per_scan(tmp_path, monkeypatch):
+	monkeypatch.chdir(tmp_path)
+	(tmp_path / "app.py").write_text('PASSWORD = "hunter2"\n', encoding="utf-8")
+	args = simplesecurity._parser().parse_args(
+		["-p", "secrets", "-f", "json", "--profile-output", "metrics.json"]
+	)
+
+	def evidenceStats():
+		assert simplesecurity._scan(args, StringIO()) == 0
+		stats = json.loads((tmp_path / "metrics.json").read_text("utf-8"))["caches"]["evidence"]
+		return stats["hits"], stats["misses"]
+
+	first, second = evidenceStats(), evidenceStats()
+	# A long running process (the daemon) reports each scan's lookups, not the total
+	assert sum(second) == sum(first)
+	assert second[1] == 0
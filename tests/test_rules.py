@@ -0,0 +1,79 @@
+import json
+from io import StringIO
+
+import simplesecurity
+from simplesecurity import formatter, level, plugins, rules
+from simplesecurity.types import compactFinding
+
+
+def makeFinding(ruleId, line):
+	return compactFinding(
+		{
+			"id": ruleId,
+			"title": f"{ruleId}: title",
+			"description": "description",
+			"file": "./a.py",
+			"evidence": [{"selected": True, "line": line, "content": "code"}],
+			"severity": level.Level.MED,
+			"confidence": level.Level.HIGH,
+			"line": line,
+			"_other": {},
+		}
+	)
+
+
+def test_ruleTable():
+	table = rules.RuleTable()
+	rule = table.add("B101", "B101: assert_used", "Use of assert detected.", "https://example.com")
+	assert table.add("B101", "other", "other") is rule
+	assert table.get("B101").moreInfo == "https://example.com"
+	assert table.get("B999") is None
+	fallback = table.forFinding(makeFinding("B999", 1))
+	assert (fallback.id, fallback.title, fallback.moreInfo) == ("B999", "B999: title", None)
+	# A finding's description can quote code so the fallback does not use it
+	assert fallback.description == "B999: title"
+	table.clear()
+	assert table.get("B101") is None
+
+
+def test_bandit_description():
+	finding = plugins._banditFinding(
+		"results",
+		{
+			"filename": "./a.py",
+			"test_id": "B105_TEST",
+			"test_name": "hardcoded_password_string",
+			"issue_text": "Possible hardcoded password: 'hunter2'",
+			"more_info": None,
+			"issue_severity": "LOW",
+			"issue_confidence": "MEDIUM",
+			"line_number": 1,
+			"line_range": [1],
+		},
+	)
+	assert "hunter2" in finding["description"]
+	sarif = formatter.sarifCompact([finding], snippets=False)
+	rule = json.loads(sarif)["runs"][0]["tool"]["driver"]["rules"][0]
+	assert rule["fullDescription"]["text"] == "Hardcoded password string"
+	assert "hunter2" not in json.dumps(rule)
+
+
+def test_scan_clears_rules(tmp_path, monkeypatch):
+	monkeypatch.chdir(tmp_path)
+	rules.RULES.add("OLD_RULE", "old", "old")
+	args = simplesecurity._parser().parse_args(["-p", "secrets", "-f", "sarif"])
+	output = StringIO()
+	assert simplesecurity._scan(args, output) == 0
+	assert rules.RULES.get("OLD_RULE") is None
+	assert json.loads(output.getvalue())["runs"][0]["tool"]["driver"]["rules"] == []
+
+
+def test_sarif_rules():
+	findings = [makeFinding("RULE_A", 1), makeFinding("RULE_B", 2), makeFinding("RULE_A", 3)]
+	run = json.loads(formatter.sarif(findings))["runs"][0]
+	assert [rule["id"] for rule in run["tool"]["driver"]["rules"]] == ["RULE_A", "RULE_B"]
+	assert [(x["ruleId"], x["ruleIndex"]) for x in run["results"]] == [
+		("RULE_A", 0),
+		("RULE_B", 1),
+		("RULE_A", 0),
+	]
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+from simplesecurity import cache, tools
+
+
+@pytest.fixture(autouse=True)
+def toolCache(tmp_path, monkeypatch):
+	monkeypatch.setenv("SIMPLESECURITY_CACHE_DIR", str(tmp_path / "cache"))
+	tools._tools.clear()
+	yield
+	tools._tools.clear()
+
+
+@pytest.fixture()
+def fakeTool(tmp_path, monkeypatch):
+	binDir = tmp_path / "bin"
+	binDir.mkdir()
+	tool = binDir / "faketool"
+	tool.write_text(f"#!{sys.executable}\nprint('faketool 1.2.3')\n", encoding="utf-8")
+	tool.chmod(0o755)
+	monkeypatch.setenv("PATH", f"{binDir}{os.pathsep}{os.environ['PATH']}")
+	return tool
+
+
+def test_findTool_notexists():
+	assert tools.findTool("commandnotexists") is None
+
+
+def test_requireTool_notexists():
+	with pytest.raises(RuntimeError, match="commandnotexists is not on the system path"):
+		tools.requireTool("commandnotexists")
+
+
+@pytest.mark.skipif(sys.platform.startswith("win"), reason="uses a shebang script")
+def test_toolVersion_cached(fakeTool):
+	assert tools.requireTool("faketool") == str(fakeTool)
+	assert tools.toolVersion("faketool") == "faketool 1.2.3"
+	assert cache.loadJson(tools.CACHE_NAME)["tools"]["faketool"]["version"] == "faketool 1.2.3"
+
+	# A fresh process reads the version from disk rather than running the tool
+	tools._tools.clear()
+	fakeTool.write_text(f"#!{sys.executable}\nprint('faketool 9.9.9')\n", encoding="utf-8")
+	mtime = cache.loadJson(tools.CACHE_NAME)["tools"]["faketool"]["mtime"]
+	os.utime(fakeTool, (mtime, mtime))
+	assert tools.toolVersion("faketool") == "faketool 1.2.3"
+
+	# Changing the executable invalidates the cache
+	tools._tools.clear()
+	os.utime(fakeTool, (mtime + 10, mtime + 10))
+	assert tools.toolVersion("faketool") == "faketool 9.9.9"
@@ -0,0 +1,59 @@
+import pickle
+
+import pytest
+
+from simplesecurity import formatter
+from simplesecurity.level import Level
+from simplesecurity.types import CompactFinding, compactFinding, toDict
+
+FINDING = {
+	"id": "B101",
+	"title": "B101: assert_used",
+	"description": "Use of assert detected.",
+	"file": "./a.py",
+	"evidence": [{"selected": True, "line": 3, "content": "assert x"}],
+	"severity": Level.LOW,
+	"confidence": Level.HIGH,
+	"line": 3,
+	"_other": {},
+}
+
+
+def test_compactFinding():
+	finding = compactFinding(FINDING)
+	assert isinstance(finding, CompactFinding)
+	assert finding == FINDING
+	assert FINDING == finding
+	assert compactFinding(finding) is finding
+	assert finding["evidence"][0]["content"] == "assert x"
+	assert finding.get("missing") is None
+	assert list(finding) == list(FINDING)
+	assert pickle.loads(pickle.dumps(finding)) == FINDING
+
+
+def test_compactFinding_interned():
+	first = compactFinding({**FINDING, "description": "".join(["Use of ", "assert detected."])})
+	second = compactFinding({**FINDING, "description": "".join(["Use of assert ", "detected."])})
+	assert first["description"] is second["description"]
+
+
+def test_compactFinding_update():
+	finding = compactFinding(FINDING)
+	finding["line"] = 4
+	assert finding["line"] == 4
+	with pytest.raises(KeyError):
+		finding["extra"] = 1
+	with pytest.raises(TypeError):
+		del finding["line"]
+
+
+def test_toDict():
+	finding = toDict(compactFinding(FINDING))
+	assert type(finding) is dict
+	assert type(finding["evidence"][0]) is dict
+	assert finding == FINDING
+
+
+def test_formatters():
+	for format in (formatter.json, formatter.jsonl, formatter.csv, formatter.sarif):
+		assert format([compactFinding(FINDING)]) == format([FINDING])
@@ -0,0 +1,82 @@
+from simplesecurity import walker
+
+
+def relFiles(scanDir, patterns=None):
+	return [
+		walker.normalisePath(x)[len(walker.normalisePath(str(scanDir))) + 1 :]
+		for x in walker.listFiles(str(scanDir), patterns)
+	]
+
+
+def test_listFiles_gitignore(tmp_path):
+	for file in [
+		"a.py",
+		"b.log",
+		"keep.log",
+		"build/x.py",
+		"pkg/c.py",
+		"pkg/generated/d.py",
+		"pkg/e.py",
+		"docs/f.py",
+		"sub/docs/g.py",
+	]:
+		(tmp_path / file).parent.mkdir(parents=True, exist_ok=True)
+		(tmp_path / file).write_text("", encoding="utf-8")
+	(tmp_path / ".gitignore").write_text("# logs\n*.log\n!keep.log\n/docs/\n", encoding="utf-8")
+	(tmp_path / "pkg" / ".gitignore").write_text("generated/\ne.py\n", encoding="utf-8")
+	assert relFiles(tmp_path) == [
+		".gitignore",
+		"a.py",
+		"keep.log",
+		"pkg/.gitignore",
+		"pkg/c.py",
+		"sub/docs/g.py",
+	]
+	assert relFiles(tmp_path, ("*.py",)) == ["a.py", "pkg/c.py", "sub/docs/g.py"]
+
+
+def test_matcher():
+	matcher = walker.Matcher(["**/cache/*.json", "/top", "*.py[co]", "out/"])
+	assert matcher.excluded("a/b/cache/x.json", False)
+	assert matcher.excluded("cache/x.json", False)
+	assert not matcher.excluded("cache/sub/x.json", False)
+	assert matcher.excluded("top", False)
+	assert not matcher.excluded("a/top", False)
+	assert matcher.excluded("a/b.pyc", False)
+	assert not matcher.excluded("a/b.py", False)
+	assert matcher.excluded("a/out", True)
+	assert not matcher.excluded("a/out", False)
+
+
+def test_isExcluded():
+	assert walker.isExcluded("venv/lib/a.py")
+	assert walker.isExcluded("pkg/__pycache__/a.pyc")
+	assert walker.isExcluded(".env")
+	assert not walker.isExcluded("pkg/a.py")
+
+
+def test_listFiles_nestedLib(tmp_path):
+	for file in ("lib/a.py", "src/pkg/lib/b.py", "src/build/c.py", "src/__pycache__/d.py"):
+		(tmp_path / file).parent.mkdir(parents=True, exist_ok=True)
+		(tmp_path / file).write_text("x = 1\n", encoding="utf-8")
+	assert relFiles(tmp_path) == ["src/build/c.py", "src/pkg/lib/b.py"]
+	assert walker.isExcluded("lib/a.py")
+	assert not walker.isExcluded("src/pkg/lib/b.py")
+
+
+def test_matcher_lastPatternWins():
+	matcher = walker.Matcher(["!keep.py", "*.py", "!pkg/keep.py"])
+	assert matcher.match("keep.py", False) is True
+	assert matcher.match("pkg/keep.py", False) is False
+	assert matcher.match("a.md", False) is None
+	assert matcher.excluded("keep.py", False)
+
+
+def test_listFiles_nestedGitignore(tmp_path):
+	for file in ("keep.py", "sub/sub.py", "sub/other.py"):
+		(tmp_path / file).parent.mkdir(parents=True, exist_ok=True)
+		(tmp_path / file).write_text("x = 1\n", encoding="utf-8")
+	(tmp_path / ".gitignore").write_text("!keep.py\n*.py\n", encoding="utf-8")
+	(tmp_path / "sub" / ".gitignore").write_text("!sub.py\n", encoding="utf-8")
+	# as git: the last matching pattern wins, and sub/.gitignore overrides the root one
+	assert relFiles(tmp_path, ("*.py",)) == ["sub/sub.py"]
@@ -0,0 +1,92 @@
+import os
+from io import StringIO
+from json import loads
+
+import simplesecurity
+from simplesecurity import level, watch
+
+
+def makeFinding(file, line=1, findingId="TEST_ID"):
+	return {
+		"id": findingId,
+		"title": "TEST",
+		"description": "This is a test",
+		"file": file,
+		"evidence": [],
+		"severity": level.Level.MED,
+		"confidence": level.Level.MED,
+		"line": line,
+		"_other": {},
+	}
+
+
+def test_changedFiles(tmp_path):
+	(tmp_path / "a.py").write_text("a", encoding="utf-8")
+	(tmp_path / "b.py").write_text("b", encoding="utf-8")
+	old = watch.snapshot(str(tmp_path))
+	(tmp_path / "a.py").write_text("changed", encoding="utf-8")
+	(tmp_path / "b.py").unlink()
+	(tmp_path / "c.py").write_text("c", encoding="utf-8")
+	changed = watch.changedFiles(old, watch.snapshot(str(tmp_path)))
+	assert [os.path.basename(x) for x in changed] == ["a.py", "b.py", "c.py"]
+
+
+def test_findingsState():
+	state = watch.FindingsState()
+	state.update("bandit", [makeFinding("./a.py"), makeFinding("b.py")], ["a.py", "b.py"])
+	state.update("safety", [makeFinding("Project Requirements")], None)
+	state.update("bandit", [], ["a.py"])
+	assert [x["file"] for x in state.findings()] == ["b.py", "Project Requirements"]
+	state.update("safety", [], None)
+	state.forget(["./b.py"])
+	assert state.findings() == []
+
+
+def test_diffFindings():
+	old = [makeFinding("a.py"), makeFinding("b.py")]
+	new = [makeFinding("./b.py"), makeFinding("b.py", 2)]
+	assert watch.diffFindings(old, new) == ([new[1]], [old[0]])
+
+
+def test_cli_watch(tmp_path, monkeypatch):
+	monkeypatch.chdir(tmp_path)
+	(tmp_path / "app.py").write_text('PASSWORD = "hunter2"\n', encoding="utf-8")
+	(tmp_path / "other.py").write_text("x = 1\n", encoding="utf-8")
+
+	def fakeChanges(scanDir, interval):
+		(tmp_path / "app.py").write_text("fixed = True\n", encoding="utf-8")
+		(tmp_path / "other.py").write_text('SECRET = "shh"\n', encoding="utf-8")
+		yield [os.path.join(".", "app.py"), os.path.join(".", "other.py")]
+		raise KeyboardInterrupt
+
+	monkeypatch.setattr(watch, "iterChanges", fakeChanges)
+	args = simplesecurity._parser().parse_args(["-p", "secrets", "-f", "jsonl", "--watch"])
+	output = StringIO()
+	assert simplesecurity._scan(args, output) == 0
+	lines = [loads(line) for line in output.getvalue().splitlines()]
+	assert [x.get("heading", x.get("id")) for x in lines] == [
+		"password",
+		"Added 1 finding(s) after changes to 2 file(s)",
+		"secret",
+		"Resolved 1 finding(s)",
+		"password",
+	]
+
+
+def test_iterChanges_backoff(tmp_path, monkeypatch):
+	(tmp_path / "a.py").write_text("a", encoding="utf-8")
+	waits = []
+
+	def sleep(seconds):
+		waits.append(seconds)
+		if len(waits) in (7, 8):
+			(tmp_path / "a.py").write_text("x" * len(waits), encoding="utf-8")
+
+	monkeypatch.setattr(watch, "Observer", None)
+	monkeypatch.setattr(watch.time, "sleep", sleep)
+	changes = watch.iterChanges(str(tmp_path), 1.0)
+	assert [os.path.basename(x) for x in next(changes)] == ["a.py"]
+	# Idle polls back off to MAX_BACKOFF times the interval
+	assert waits == [1.0, 2.0, 4.0, 8.0, 16.0, 16.0, 16.0]
+	next(changes)
+	assert waits[7] == 1.0